@@ -1,20 +1,105 @@
 from PySide6.QtCore import QObject, Signal, Slot
+import json
 import logging
+import sys
 import numpy as np
-from scipy.ndimage import uniform_filter1d
-from PIL import Image
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from lazy import lazy_import
+from imagewriter import ImageWriter
+from rawrecorder import RawWriter
+from compressedfile import CompressedFile, available_codec, compressedExtensions, recover
+from frameindex import FrameIndex, frameIndexType
+from textformatter import TextFormatter
+
+ndimage = lazy_import("scipy.ndimage")
 
 log = logging.getLogger(__name__)
 
+# Every device data block starts with the device timestamp and the host monotonic timestamp of the sample.
+timestampColumns = 2
+
+class DeviceClock:
+    """Running least squares fit of host time against a device clock, giving the offset and drift of the device clock."""
+
+    def __init__(self):
+        """DeviceClock init."""
+        self.n = 0
+        self.origin = None
+        self.sums = np.zeros(4)
+        self.intercept = 0.0
+        self.rate = 1.0
+
+    def update(self, deviceTime, hostTime):
+        """Method to add samples to the fit."""
+        if self.origin == None:
+            self.origin = (deviceTime[0], hostTime[0])
+        x = deviceTime - self.origin[0]
+        y = hostTime - self.origin[1]
+        self.n += len(x)
+        self.sums += [np.sum(x), np.sum(y), np.sum(x*x), np.sum(x*y)]
+        meanX = self.sums[0]/self.n
+        meanY = self.sums[1]/self.n
+        variance = self.sums[2]/self.n - meanX**2
+        if self.n > 1 and variance > 1e-12:
+            self.rate = (self.sums[3]/self.n - meanX*meanY)/variance
+        self.intercept = meanY - self.rate*meanX
+
+    def host(self, deviceTime):
+        """Method to map device times onto the host clock."""
+        return self.origin[1] + self.intercept + self.rate*(deviceTime - self.origin[0])
+
+    def offset(self):
+        """Method to get the host minus device time at the first sample, in seconds."""
+        return self.origin[1] - self.origin[0] + self.intercept
+
+    def drift(self):
+        """Method to get the device clock drift relative to the host clock, in parts per million."""
+        return (self.rate - 1)*1e6
+
+def event_rows(times, grid, period):
+    """Function to find the row of the evenly spaced grid nearest to each event time, or the number of rows for events due after the last row."""
+    edges = np.append(grid - period/2, grid[-1] + period/2)
+    return np.maximum(np.searchsorted(edges, times, side="right") - 1, 0)
+
+def resample(times, values, grid, method="linear", period=None):
+    """Function to sample rows of values taken at times onto the grid times by nearest neighbour or linear interpolation.
+
+    The events method is for sparse columns such as image numbers, where each row with a finite first value is placed
+    once on its nearest grid row and every other row is NaN, so no event is repeated or lost between blocks."""
+    if method == "events":
+        placed = np.full((len(grid), np.shape(values)[1]), np.nan)
+        events = np.isfinite(values[:,0])
+        rows = event_rows(times[events], grid, period)
+        due = rows < len(grid)
+        placed[rows[due]] = values[events][due]
+        return placed
+    if len(times) == 1:
+        return np.repeat(values, len(grid), axis=0)
+    index = np.clip(np.searchsorted(times, grid, side="right"), 1, len(times)-1)
+    before = times[index-1]
+    after = times[index]
+    span = np.where(after > before, after - before, 1)
+    weight = np.clip((grid - before)/span, 0, 1)[:,np.newaxis]
+    if method == "nearest":
+        return np.where(weight >= 0.5, values[index], values[index-1])
+    # A sample taken exactly on a grid time is used as is, so a NaN neighbour with no weight does not spread to it.
+    blended = values[index-1]*(1-weight) + values[index]*weight
+    return np.where(weight <= 0, values[index-1], np.where(weight >= 1, values[index], blended))
+
 class Assembly(QObject):
-    plotDataChanged = Signal(np.ndarray)
+    plotDataChanged = Signal(np.ndarray, np.ndarray)
     autozeroDevices = Signal()
+    clockAlignmentChanged = Signal(dict)
     
     def __init__(self):
         """Assembly init."""
         super().__init__()
         self.allData = np.array([])
         self.plotData = np.array([])
+        self.finite = np.array([], dtype=bool)
         self.time = 0.00
         self.count = 0
         self.fileCount = 1
@@ -23,12 +108,40 @@ class Assembly(QObject):
         self.thinout_threshold = 25000
         self.thinout_factor = 100
         self.maximum_threshold = 50000
+        self.resampling = "linear"
+        self.synchronised = []
+        self.eventColumns = {}
+        self.clocks = {}
+        self.nextTime = None
+        self.startTime = None
+        self.reportInterval = 10
+        self.nextReport = self.reportInterval
+        self.imageWriter = ImageWriter()
+        self.rawWriter = RawWriter()
+        self.frameIndexes = {}
+        self.lastFrameTimes = {}
+        self.pendingFrames = {}
+        self.compression = "none"
+        self.compressionLevel = 3
+        self.file = None
+        self.header = ""
+        self.formatter = TextFormatter()
+        self.rotateSize = 0
+        self.rotateDuration = 0
+        self.rotateBoundary = 0
+        self.journalInterval = 0
+        self.stateProvider = None
+        self.resumeTime = 0.0
+        self.appendRaw = False
+        # Segments are closed on a single background thread so rotation never waits on the disk.
+        self.closer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="SegmentCloser")
 
     def define_settings(self, rate, skip, average):
         """Method to define basic global settings."""
         self.skip = int(skip)
         self.average = int(average)
-        self.DeltaT = (1/rate)*self.skip
+        self.period = 1/rate
+        self.DeltaT = self.period*self.skip
         log.info("Assembly thread settings initialised.")
 
     def set_filename(self, path, filename, date, timestart, ext):
@@ -37,20 +150,260 @@ class Assembly(QObject):
         self.filename = filename
         self.date = date
         self.timestart = timestart
-        self.filepath = path + "/" + filename + "_" + date + "_" + timestart + "_1" + ext
+        self.ext = ext
+        self.stem = path + "/" + filename + "_" + date + "_" + timestart
+        self.fileCount = 1
+        self.filepath = self.segment_path(self.fileCount)
+        self.manifestPath = self.stem + "_manifest.txt"
+        self.appendRaw = False
         log.info("Filename set.")
 
+    def segment_path(self, count):
+        """Method to get the path of a numbered output file segment."""
+        return self.stem + "_" + str(count) + self.ext
+
+    def set_rotation(self, size, duration, boundary):
+        """Method to set automatic rotation by segment size in MB, by seconds of data, or at wall clock boundaries every so many seconds from midnight. Zero disables a policy.
+
+        The size counts the uncompressed text written, so with compression a segment is rotated once it holds that much text and is smaller on disk."""
+        self.rotateSize = int(size*1e6)
+        self.rotateDuration = duration
+        self.rotateBoundary = boundary
+        log.info("Output rotation set to {size} MB, {duration} s of data and {boundary} s wall clock boundaries.".format(size=size, duration=duration, boundary=boundary))
+
+    def set_output_format(self, widths, precisions):
+        """Method to set the width and precision of each output column."""
+        self.formatter.set_formats(widths, precisions)
+        log.info("Output format set for {columns} columns.".format(columns=self.formatter.columns()))
+
+    def set_compression(self, codec, level):
+        """Method to set the output compression codec, or none for plain text."""
+        self.compression = "none" if codec in [None, "none"] else available_codec(codec)
+        self.compressionLevel = level
+        log.info("Output compression set to {codec}.".format(codec=self.compression))
+
+    def set_journal(self, interval, stateProvider=None):
+        """Method to set the interval in seconds of data between journal checkpoints, zero to disable, and a callable returning the device state to journal."""
+        self.journalInterval = interval
+        self.stateProvider = stateProvider
+        self.nextCheckpoint = self.time + interval
+
+    def journal_path(self):
+        """Method to get the path of the recording journal."""
+        return self.stem + "_journal.json"
+
+    def checkpoint(self, closed=False):
+        """Method to flush the output and journal the state needed to resume recording from this point.
+
+        Compressed output is handed to the compressor without waiting for it, and the journal is only written once the compressed blocks are on disk."""
+        file = None
+        offset = 0
+        if self.file != None:
+            file = self.file
+            if self.compression == "none":
+                file.flush()
+            else:
+                file.submit_block()
+            # Uncompressed bytes for compressed output.
+            offset = file.tell()
+        entry = {
+            "closed": closed,
+            "wallTime": time.time(),
+            "path": self.path,
+            "filename": self.filename,
+            "date": self.date,
+            "timestart": self.timestart,
+            "stem": self.stem,
+            "ext": self.ext,
+            "header": self.header,
+            "compression": self.compression,
+            "compressionLevel": self.compressionLevel,
+            "fileCount": self.fileCount,
+            "segmentPath": self.output_path(self.segment_path(self.fileCount)),
+            "offset": offset,
+            "blocks": 0,
+            "time": self.time,
+            "count": self.count,
+            "period": self.DeltaT,
+            "segmentStart": self.segmentStart,
+            "segmentRows": self.segmentRows,
+            "segmentOpened": self.segmentOpened.isoformat(),
+            "state": self.stateProvider() if self.stateProvider != None else {},
+        }
+        self.closer.submit(self.write_journal, file, entry)
+
+    def write_journal(self, file, entry):
+        """Method to force the output onto the disk and then replace the journal. Runs on the segment closing thread."""
+        try:
+            if file != None:
+                if self.compression == "none":
+                    if file.closed == False:
+                        os.fsync(file.fileno())
+                elif file.file.closed == False:
+                    file.wait()
+                    file.sync()
+                    entry["blocks"] = file.blocks
+            temporary = self.journal_path() + ".tmp"
+            with open(temporary, 'w') as journal:
+                json.dump(entry, journal)
+                journal.flush()
+                os.fsync(journal.fileno())
+            os.replace(temporary, self.journal_path())
+        except Exception:
+            e = sys.exc_info()[1]
+            log.warning(e)
+
+    def resume(self, journal):
+        """Method to continue a journaled recording, keeping complete rows written after the last checkpoint and truncating any partial row or block."""
+        self.stem = journal["stem"]
+        self.ext = journal["ext"]
+        # Images are saved under the name parts of the stem, which older journals only hold in the stem itself.
+        self.path = journal.get("path", os.path.dirname(self.stem))
+        if "filename" in journal:
+            self.filename, self.date, self.timestart = journal["filename"], journal["date"], journal["timestart"]
+        else:
+            self.filename, self.date, self.timestart = os.path.basename(self.stem).rsplit("_", 2)
+        self.appendRaw = True
+        self.header = journal["header"]
+        self.compression = journal["compression"]
+        self.compressionLevel = journal["compressionLevel"]
+        self.fileCount = journal["fileCount"]
+        self.filepath = self.segment_path(1)
+        self.manifestPath = self.stem + "_manifest.txt"
+        path = journal["segmentPath"]
+
+        # Validate the tail of the segment and find the time of the last complete row.
+        if self.compression == "none":
+            with open(path, 'r+b') as file:
+                size = file.seek(0, os.SEEK_END)
+                start = min(journal["offset"], size)
+                file.seek(start)
+                tail = file.read()
+                end = start + tail.rfind(b"\n") + 1 if b"\n" in tail else start
+                file.truncate(end)
+                file.seek(max(end-4096, 0))
+                last = file.read(end - max(end-4096, 0))
+            if end < size:
+                log.warning("Truncated {count} bytes of a partial row from {path}.".format(count=size-end, path=os.path.basename(path)))
+            self.file = open(path, 'ab')
+        else:
+            last = recover(path)
+            self.file = CompressedFile(path, self.compression, self.compressionLevel, append=True)
+        self.open_frame_indexes(append=True)
+        lastTime = journal["time"]
+        lines = last.rstrip(b"\n").split(b"\n")
+        try:
+            lastTime = max(lastTime, float(lines[-1].split(b"\t")[0]))
+        except ValueError:
+            pass
+
+        # Continue the time base across the gap so that time stays true to the test.
+        self.resumeTime = max(lastTime + journal["period"], journal["time"] + time.time() - journal["wallTime"])
+        self.time = self.resumeTime
+        self.count = journal["count"]
+        self.segmentStart = journal["segmentStart"]
+        self.segmentRows = journal["segmentRows"]
+        self.segmentOpened = datetime.fromisoformat(journal["segmentOpened"])
+        self.next_boundary()
+        self.nextReport = self.time + self.reportInterval
+        self.nextCheckpoint = self.time + self.journalInterval
+        log.info("Resumed recording in {path} at {time:.3f} s after a gap of {gap:.1f} s.".format(path=os.path.basename(path), time=self.resumeTime, gap=self.resumeTime-lastTime))
+
+    def output_path(self, filepath):
+        """Method to get the path written for an output file, including any compression extension."""
+        if self.compression == "none":
+            return filepath
+        return filepath + compressedExtensions[self.compression]
+
+    def open_file(self, filepath):
+        """Method to open an output file starting with the header, compressed in the background if required."""
+        if self.compression == "none":
+            file = open(filepath, 'w+')
+            file.write(self.header)
+            file.close()
+            return open(filepath, 'ab')
+        file = CompressedFile(self.output_path(filepath), self.compression, self.compressionLevel)
+        file.write(self.header)
+        return file
+
     def write_header(self, header):
-        """Method to write the header to the output file."""
-        self.file = open(self.filepath, 'w+')
-        self.file.write(header)
-        self.file.close()
-        self.file = open(self.filepath, 'ab')
+        """Method to write the header to the output file and start the segment manifest."""
+        self.header = header
+        self.file = self.open_file(self.filepath)
+        self.open_frame_indexes()
+        with open(self.manifestPath, 'w') as manifest:
+            manifest.write("# segment\tfile\tstart\tend\trows\tbytes\topened\n")
+        self.start_segment()
         log.info("Header written.")
 
+    def start_segment(self):
+        """Method to reset the bookkeeping for a new output file segment."""
+        self.segmentStart = self.time
+        self.segmentRows = 0
+        self.segmentOpened = datetime.now()
+        self.next_boundary()
+
+    def next_boundary(self):
+        """Method to find the next wall clock rotation boundary."""
+        if self.rotateBoundary > 0:
+            now = datetime.now()
+            midnight = now.replace(hour=0, minute=0, second=0, microsecond=0)
+            elapsed = (now - midnight).total_seconds()
+            self.nextBoundary = time.time() + (np.floor(elapsed/self.rotateBoundary) + 1)*self.rotateBoundary - elapsed
+
+    def segment_record(self):
+        """Method to describe the current segment for the manifest."""
+        return {
+            "segment": self.fileCount,
+            "path": self.output_path(self.segment_path(self.fileCount)),
+            "start": self.segmentStart,
+            "end": self.time,
+            "rows": self.segmentRows,
+            "opened": self.segmentOpened.isoformat(timespec="seconds"),
+        }
+
+    def rotation_due(self):
+        """Method to check whether any rotation policy calls for a new segment."""
+        # Compressed files report uncompressed bytes, so the size policy bounds the text in a segment rather than its size on disk.
+        if self.rotateSize > 0 and self.file.tell() >= self.rotateSize:
+            return True
+        if self.rotateDuration > 0 and self.time - self.segmentStart >= self.rotateDuration:
+            return True
+        if self.rotateBoundary > 0 and time.time() >= self.nextBoundary:
+            return True
+        return False
+
+    def rotate(self):
+        """Method to switch output to the next segment, closing the previous one in the background."""
+        previous = self.file
+        record = self.segment_record()
+        self.fileCount += 1
+        self.file = self.open_file(self.segment_path(self.fileCount))
+        self.closer.submit(self.close_segment, previous, record)
+        self.start_segment()
+        if self.journalInterval > 0:
+            self.checkpoint()
+        log.info("Output rotated to segment {count}.".format(count=self.fileCount))
+
+    def close_segment(self, file, record):
+        """Method to close a finished segment and add it to the manifest. Runs on the segment closing thread."""
+        try:
+            file.close()
+            record["bytes"] = os.path.getsize(record["path"])
+            record["file"] = os.path.basename(record["path"])
+            with open(self.manifestPath, 'a') as manifest:
+                manifest.write("{segment}\t{file}\t{start:.3f}\t{end:.3f}\t{rows}\t{bytes}\t{opened}\n".format(**record))
+        except Exception:
+            e = sys.exc_info()[1]
+            log.warning(e)
+
     @Slot(str, np.ndarray)
     def update_new_data(self, name, data):
-        """Method to add data to numpy array for the sending device."""
+        """Method to add data to numpy array for the sending device and update its clock fit."""
+        data = np.atleast_2d(data)
+        if name not in self.clocks:
+            self.clocks[name] = DeviceClock()
+        self.clocks[name].update(data[:,0], data[:,1])
         if np.shape(self.data[name])[0] > 0:
             self.data[name] = np.vstack((self.data[name], data))
         else:
@@ -59,58 +412,101 @@ class Assembly(QObject):
     @Slot()
     def update_output_data(self):
         """Method to update the output data to save to file and to generate the plots."""
-        # Compute the minumum number of rows in the data item within each device dict.
-        numTimesteps = []
+        # Align devices on the host clock, sampling each onto a common grid up to the latest time that all devices have reached.
         if len(self.enabledDevices) > 0:
+            times = {}
+            for device in self.enabledDevices:
+                name = device["name"]
+                if np.shape(self.data[name])[0] == 0:
+                    return
             for device in self.enabledDevices:
                 name = device["name"]
-                numTimesteps.append(np.shape(self.data[name])[0])
-            numTimesteps = min(numTimesteps)
+                # Synchronised devices are timed by scan index from a shared trigger, so they share the first device's clock and merge scan for scan.
+                clock = self.clocks[self.synchronised[0]] if name in self.synchronised else self.clocks[name]
+                times[name] = clock.host(self.data[name][:,0])
+            if self.nextTime == None:
+                self.nextTime = max(deviceTimes[0] for deviceTimes in times.values())
+                self.startTime = self.nextTime
+            end = min(deviceTimes[-1] for deviceTimes in times.values())
+            numTimesteps = int(np.floor((end - self.nextTime)/self.period + 1e-9)) + 1 if end >= self.nextTime else 0
             numTimesteps = numTimesteps - (numTimesteps % self.skip)
 
-            # Pop numTimesteps of data from each data object onto saveData and plotData if more than 0.
+            # Resample numTimesteps of data from each device onto saveData if more than 0.
             if numTimesteps > 0:
-                deviceData = []
+                grid = self.nextTime + np.arange(numTimesteps)*self.period
+                self.nextTime = grid[-1] + self.period
                 count = 0
+                frames = {}
                 for device in self.enabledDevices:
                     name = device["name"]
-                    deviceData = self.data[name][0:numTimesteps,:]
-                    self.data[name] = np.delete(self.data[name], range(numTimesteps), axis=0)
+                    if device["type"] == "Camera":
+                        # Image numbers are events, placed only on the rows that are written after skipping.
+                        deviceData = np.full((numTimesteps, np.shape(self.data[name])[1] - timestampColumns), np.nan)
+                        deviceData[::self.skip] = resample(times[name], self.data[name][:,timestampColumns:], grid[::self.skip], "events", self.DeltaT)
+                    else:
+                        deviceData = resample(times[name], self.data[name][:,timestampColumns:], grid, self.resampling)
+                        # Event columns, such as replayed image numbers, are placed like those of a camera.
+                        for column in self.eventColumns.get(name, []):
+                            deviceData[:,column] = np.nan
+                            deviceData[::self.skip,column] = resample(times[name], self.data[name][:,[timestampColumns+column]], grid[::self.skip], "events", self.DeltaT)[:,0]
+                    if name in self.frameIndexes:
+                        frames[name] = self.new_frames(name, times[name], self.data[name])
+
+                    if device["type"] == "Camera":
+                        # Keep the events due on the rows of later blocks.
+                        keep = np.searchsorted(times[name], grid[::self.skip][-1] + self.DeltaT/2, side="left")
+                    else:
+                        # Keep the last sample before the next grid time for interpolation.
+                        keep = max(np.searchsorted(times[name], self.nextTime, side="right") - 1, 0)
+                        if len(self.eventColumns.get(name, [])) > 0:
+                            # Keep the events due on the rows of later blocks too, clearing those already placed from the samples kept.
+                            placed = np.searchsorted(times[name], grid[::self.skip][-1] + self.DeltaT/2, side="left")
+                            keep = min(keep, placed)
+                            self.data[name][keep:placed,[timestampColumns+column for column in self.eventColumns[name]]] = np.nan
+                    self.data[name] = self.data[name][keep:]
                     
                     # Perform averaging of data if appropriate.
                     processedData = deviceData
                     if device["type"] == "Hub":
                         if self.average > 1:
-                            processedData = uniform_filter1d(processedData, size=self.average, axis=0, mode='nearest')
+                            processedData = ndimage.uniform_filter1d(processedData, size=self.average, axis=0, mode='nearest')
 
                     if count == 0:
                         if device["type"] == "Camera":
                             saveData = processedData[:,0].copy()
-                            # plotData = processedData[:,1].copy()
                         else:
                             saveData = processedData.copy()
-                            # plotData = processedData.copy()
                     else:
                         if device["type"] == "Camera":
                             saveData = np.column_stack((saveData, processedData[:,0]))
-                            # plotData = np.column_stack((plotData, processedData[:,1]))
                         else:
                             saveData = np.column_stack((saveData, processedData))
-                            # plotData = np.column_stack((plotData, processedData))
                     count += 1
 
                 # If skip value greater than 1, skip values.
                 if self.skip > 1:
                     saveData = saveData[::self.skip,:].copy()
+                    grid = grid[::self.skip]
                 
-                # Add timestamp.
+                # Add timestamp on the aligned time base.
                 n = np.shape(saveData)[0]
-                timesteps = np.arange(0, n, 1)*self.DeltaT
-                timesteps += self.time
+                timesteps = grid - self.startTime + self.resumeTime
                 saveData = np.column_stack((timesteps, saveData))
 
-                # Save data.
-                np.savetxt(self.file, saveData, fmt='%8.3f', delimiter='\t', newline='\n')
+                # Track finiteness per column incrementally so plots only check columns that have contained NaN.
+                # A new array is assigned rather than updated in place, as the previous one has been emitted to the plots.
+                blockFinite = np.isfinite(saveData).all(axis=0)
+                if np.shape(self.finite)[0] != np.shape(blockFinite)[0]:
+                    self.finite = blockFinite
+                else:
+                    self.finite = self.finite & blockFinite
+
+                # Save data, indexing the frames saved in this block against the rows written.
+                text = self.formatter.format(saveData)
+                if len(frames) > 0:
+                    self.index_frames(frames, grid, text, self.file.tell())
+                self.file.write(text)
+                self.segmentRows += n
 
                 # Thin the data.
                 if np.shape(self.allData)[0] == 0:
@@ -138,27 +534,149 @@ class Assembly(QObject):
                         self.plotData = np.delete(self.plotData, slice(delete_rows), axis=0)
 
                 # Plot data.
-                self.time += n*self.DeltaT
+                self.time = self.nextTime - self.startTime + self.resumeTime
                 self.count += numTimesteps
-                self.plotDataChanged.emit(self.plotData)
+
+                # Roll over to a new segment if a rotation policy is due.
+                if self.rotation_due() == True:
+                    self.rotate()
+
+                # Journal the recording so that it can resume after a crash.
+                if self.journalInterval > 0 and self.time >= self.nextCheckpoint:
+                    self.checkpoint()
+                    self.nextCheckpoint = self.time + self.journalInterval
+                self.plotDataChanged.emit(self.plotData, self.finite)
+
+                # Report clock offsets and drift periodically.
+                if self.time >= self.nextReport:
+                    self.report_clocks()
+                    if self.compression != "none":
+                        self.file.report()
+                    self.nextReport = self.time + self.reportInterval
+
+    def report_clocks(self):
+        """Method to log and emit the clock offset and drift for each device."""
+        report = {}
+        for name, clock in self.clocks.items():
+            report[name] = {"offset": clock.offset(), "drift": clock.drift()}
+            log.info("Clock for {name} offset by {offset:.6f} s with drift of {drift:.1f} ppm relative to host.".format(name=name, offset=clock.offset(), drift=clock.drift()))
+        # For synchronised devices, compare each clock fit with the first device to measure the skew between them.
+        if len(self.synchronised) > 1 and self.synchronised[0] in self.clocks:
+            master = self.clocks[self.synchronised[0]]
+            for name in self.synchronised[1:]:
+                if name in self.clocks:
+                    clock = self.clocks[name]
+                    skew = clock.offset() - master.offset()
+                    report[name]["skew"] = skew
+                    log.info("Synchronised device {name} skewed by {skew:.6f} s from {master}, with relative drift of {drift:.1f} ppm.".format(name=name, skew=skew, master=self.synchronised[0], drift=clock.drift()-master.drift()))
+        self.clockAlignmentChanged.emit(report)
 
     @Slot(str, np.ndarray)
     def save_image(self, image_name, image_array):
-        """Method to save image with given filename prepended with output file details."""
+        """Method to queue an image for saving with given filename prepended with output file details."""
         filepath = self.path + "/" + self.filename + "_" + self.date + "_" + self.timestart + "_" + image_name
-        img = Image.fromarray(image_array)
-        img.save(filepath, "JPEG")
+        self.imageWriter.submit(filepath, image_array)
+
+    @Slot(str, np.ndarray, dict)
+    def save_raw_image(self, name, frame, metadata):
+        """Method to queue a raw sensor frame for the memory-mapped recording of the camera."""
+        basepath = self.path + "/" + self.filename + "_" + self.date + "_" + self.timestart + "_" + name
+        self.rawWriter.submit(name, basepath, frame, metadata, self.appendRaw)
+
+    def frame_index_path(self, name):
+        """Method to get the path of the frame index for a camera."""
+        return self.stem + "_" + name + "_frames.bin"
+
+    def open_frame_indexes(self, append=False):
+        """Method to open a frame index for each enabled camera, continuing existing indexes if appending."""
+        self.close_frame_indexes()
+        for device in self.enabledDevices:
+            if device["type"] == "Camera":
+                name = device["name"]
+                self.frameIndexes[name] = FrameIndex(self.frame_index_path(name), append)
+                self.lastFrameTimes[name] = -np.inf
+                self.pendingFrames[name] = (np.empty(0), np.empty((0, timestampColumns + 1)))
+
+    def close_frame_indexes(self):
+        """Method to close the frame indexes."""
+        for frameIndex in self.frameIndexes.values():
+            frameIndex.close()
+        self.frameIndexes = {}
+
+    def new_frames(self, name, times, data):
+        """Method to pick the camera samples carrying a saved frame that this block consumes for the first time, with their host times, after any frames held back from the last block."""
+        consumed = times < self.nextTime
+        new = consumed & (times > self.lastFrameTimes[name]) & np.isfinite(data[:,timestampColumns])
+        if consumed.any() == True:
+            # Samples due on the next block's rows are kept, so they are seen again with the next block.
+            self.lastFrameTimes[name] = times[consumed][-1]
+        pendingTimes, pendingData = self.pendingFrames[name]
+        if len(pendingTimes) == 0:
+            return times[new], data[new]
+        return np.concatenate((pendingTimes, times[new])), np.vstack((pendingData, data[new]))
+
+    def index_frames(self, frames, grid, text, offset):
+        """Method to append a record for each new frame to its camera's index, pointing at the nearest output row of the formatted block starting at offset."""
+        rowStarts = None
+        for name, (times, data) in frames.items():
+            if len(data) == 0:
+                continue
+            if rowStarts is None:
+                ends = np.flatnonzero(np.frombuffer(text, dtype=np.uint8) == ord("\n"))
+                rowStarts = np.concatenate(([0], ends[:-1] + 1))
+            rows = event_rows(times, grid, self.DeltaT)
+            # Frames nearest to the first row of the next block are held back until that row is written.
+            late = rows >= len(grid)
+            self.pendingFrames[name] = (times[late], data[late])
+            times, data, rows = times[~late], data[~late], rows[~late]
+            if len(data) == 0:
+                continue
+            records = np.zeros(len(data), dtype=frameIndexType)
+            records["frame"] = data[:,timestampColumns]
+            # Every skip-th timestep is written, so the rows written so far are the count of timesteps over the skip.
+            records["sample"] = self.count//self.skip + rows
+            records["time"] = times - self.startTime + self.resumeTime
+            records["hostTime"] = data[:,1]
+            records["deviceTime"] = data[:,0]
+            records["exposure"] = data[:,timestampColumns + 2] if np.shape(data)[1] > timestampColumns + 2 else np.nan
+            records["gain"] = data[:,timestampColumns + 3] if np.shape(data)[1] > timestampColumns + 3 else np.nan
+            records["segment"] = self.fileCount
+            records["offset"] = offset + rowStarts[rows]
+            try:
+                self.frameIndexes[name].write(records)
+            except Exception:
+                e = sys.exc_info()[1]
+                log.warning(e)
+
+    def close_raw_recorders(self):
+        """Method to finish recording the queued raw frames, then close the recordings and write their sidecars."""
+        self.rawWriter.close()
+        self.rawWriter.report()
 
     def clear_all_data(self):
         """Method to clear all data."""
         self.data = {}
         self.allData = np.array([])
+        self.finite = np.array([], dtype=bool)
         self.time = 0.00
         self.count = 0
+        self.clocks = {}
+        self.nextTime = None
+        self.startTime = None
+        self.nextReport = self.reportInterval
+        self.resumeTime = 0.0
 
     def close_file(self):
-        """Method to close file."""
-        self.file.close()
+        """Method to close file and finish saving queued images."""
+        if self.file != None:
+            self.closer.submit(self.close_segment, self.file, self.segment_record()).result()
+            self.file = None
+            if self.journalInterval > 0:
+                self.checkpoint(closed=True)
+        self.imageWriter.flush()
+        self.imageWriter.report()
+        self.close_raw_recorders()
+        self.close_frame_indexes()
     
     @Slot()
     def clear_plot_data(self):
@@ -175,23 +693,31 @@ class Assembly(QObject):
     @Slot()
     def new_file(self):
         """Method to start logging in a new file."""
-        # Close current file.
-        self.file.close()
-        
-        # Modify the filename and append fileCount.
-        self.fileCount += 1
-        filepath = self.filepath[:-6] + "_" + str(self.fileCount) + ".txt"
-        
-        # Open a new file.
-        self.file = open(filepath,'ab')
+        if self.file != None:
+            self.rotate()
+
+    @Slot(list)
+    def set_synchronised_devices(self, names):
+        """Method to set the devices that acquire on a shared trigger, first device first."""
+        self.synchronised = list(names)
+        log.info("Synchronised devices set to " + ", ".join(self.synchronised) + ".")
+
+    def set_event_columns(self, name, columns):
+        """Method to set the columns of a device that hold sparse events, such as replayed image numbers, rather than samples."""
+        self.eventColumns[name] = list(columns)
 
     @Slot(list)
     def create_data_arrays(self, enabledDevices):
         """Method to create data arrays depending on enabled devices."""
         self.enabledDevices = enabledDevices
         self.data = {}
+        self.synchronised = []
+        self.eventColumns = {}
+        self.clocks = {}
+        self.nextTime = None
+        self.startTime = None
+        self.nextReport = self.reportInterval
         for device in self.enabledDevices:
-            if device["type"] == "Hub":
-                name = device["name"]
-                self.data[name] = np.array([])
+            name = device["name"]
+            self.data[name] = np.array([])
         log.info("Output arrays created.")
\ No newline at end of file
@@ -0,0 +1,104 @@
+import numpy as np
+
+class Axes:
+    """Per-axis motion state for the control channels of a device, held in numpy arrays so
+    that positions, limits and PID outputs for every axis are updated in one vectorised step."""
+
+    def __init__(self, count):
+        self.count = count
+        self.enabled = np.zeros(count, dtype=bool)
+        self.jog = np.zeros(count, dtype=bool)
+        self.PID = np.zeros(count, dtype=bool)
+        self.feedback = np.zeros(count, dtype=bool)
+        self.feedbackIndex = np.zeros(count, dtype=int)
+        self.direction = np.ones(count)
+        self.position = np.zeros(count)
+        self.pulses = np.zeros(count)
+        self.previousPulses = np.zeros(count)
+        self.pulsesPerUnit = np.full(count, 160.0)
+        self.countsPerUnit = np.full(count, 32000.0)
+        self.speed = np.full(count, 3.0)
+        self.leftLimit = np.zeros(count)
+        self.rightLimit = np.zeros(count)
+        self.feedbackProcessVariable = np.zeros(count)
+        self.feedbackLeftLimit = np.full(count, -100.0)
+        self.feedbackRightLimit = np.full(count, 100.0)
+        self.minimum = np.zeros(count, dtype=bool)
+        self.maximum = np.zeros(count, dtype=bool)
+        self.limit = np.zeros(count, dtype=bool)
+
+    def update_positions(self, pulses, mask):
+        """Method to increment the positions of the masked axes from their pulse counters."""
+        pulses = np.asarray(pulses, dtype=float)
+        # A zero count means the pulse output has been reset, so there is no movement to add.
+        increment = np.where(pulses == 0, 0.0, (pulses - self.previousPulses[mask])/self.pulsesPerUnit[mask])
+        self.position[mask] += increment*np.sign(self.direction[mask])
+        self.previousPulses[mask] = pulses
+        self.pulses[mask] = pulses
+
+    def soft_limits(self):
+        """Method to get the axes moving under jog or PID control beyond their position limits."""
+        moving = self.enabled & (self.jog | self.PID)
+        left = (self.direction == -1) & (self.position < self.leftLimit)
+        right = (self.direction == 1) & (self.position > self.rightLimit)
+        return moving & (left | right)
+
+    def hard_limits(self, minimum, maximum, output):
+        """Method to get the axes whose pulse output is driving them into a limit switch."""
+        running = np.asarray(output) == 1
+        return running & (((self.direction == -1) & minimum) | ((self.direction == 1) & maximum))
+
+    def limits(self, minimum, maximum):
+        """Method to get the axes on a limit switch, or at a position or feedback limit."""
+        position = (self.position <= self.leftLimit) | (self.position >= self.rightLimit)
+        feedback = (self.feedbackProcessVariable <= self.feedbackLeftLimit) | (self.feedbackProcessVariable >= self.feedbackRightLimit)
+        return minimum | maximum | position | feedback
+
+def clock_settings(freq, core_freq=80000000, divisor=8, max_roll=2**16, max_freq=426666):
+    """Return the clamped frequencies and roll values for one or more clock frequencies, selecting
+    the minimum possible divisor that does not result in a roll value that exceeds the bit depth of
+    the clock. The frequency is clamped to 426666, which is equivalent to 4000 RPM for a 6400 CPR
+    encoder with a 16 bit clock and divisor value of 8."""
+    min_freq = np.ceil(core_freq/(divisor*max_roll))
+    freq = np.clip(np.asarray(freq, dtype=float), min_freq, max_freq)
+    roll = np.clip(core_freq/(freq*divisor), 1, max_roll).astype(int)
+    return freq, roll
+
+def axis_property(field, axis):
+    """Return a property mapping a scalar per-channel attribute onto one element of an Axes array."""
+    def getter(self):
+        return getattr(self.axes, field)[axis].item()
+    def setter(self, value):
+        getattr(self.axes, field)[axis] = value
+    return property(getter, setter)
+
+# Per-channel attribute names used by the device classes and the Axes arrays that hold them.
+axisAttributes = {
+    "enabled": "enabled",
+    "jog": "jog",
+    "status_PID": "PID",
+    "feedback": "feedback",
+    "feedback_index": "feedbackIndex",
+    "direction": "direction",
+    "position_process_variable": "position",
+    "pulses": "pulses",
+    "previous_pulses": "previousPulses",
+    "pulses_per_unit": "pulsesPerUnit",
+    "counts_per_unit": "countsPerUnit",
+    "speed": "speed",
+    "position_left_limit": "leftLimit",
+    "position_right_limit": "rightLimit",
+    "feedback_process_variable": "feedbackProcessVariable",
+    "feedback_left_limit": "feedbackLeftLimit",
+    "feedback_right_limit": "feedbackRightLimit",
+    "minimum_limit": "minimum",
+    "maximum_limit": "maximum",
+    "limit": "limit",
+}
+
+def add_axis_properties(cls, count):
+    """Add name_C1, name_C2, ... properties to a device class for each per-axis attribute."""
+    for attribute, field in axisAttributes.items():
+        for axis in range(count):
+            setattr(cls, attribute + "_C" + str(axis+1), axis_property(field, axis))
+    return cls
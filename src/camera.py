@@ -1,47 +1,72 @@
 from PySide6.QtCore import QObject, Signal, Slot
 import logging
 import numpy as np
-import local_gxipy as gx
 import sys
-import cv2
-from PIL import Image, ImageDraw, ImageColor
-from scipy.spatial import ConvexHull
-import matplotlib.pyplot as plt
 import os
+from time import monotonic
+from lazy import lazy_import
+
+# Heavy camera stacks are imported on first use so that startup does not pay for them.
+gx = lazy_import("local_gxipy")
+cv2 = lazy_import("cv2")
+Image = lazy_import("PIL.Image")
+ImageDraw = lazy_import("PIL.ImageDraw")
+ImageColor = lazy_import("PIL.ImageColor")
+spatial = lazy_import("scipy.spatial")
+plt = lazy_import("matplotlib.pyplot")
 
 log = logging.getLogger(__name__)
 
 class Camera(QObject):
     previewImage = Signal(np.ndarray)
     saveImage = Signal(str, np.ndarray)
+    saveRawImage = Signal(str, np.ndarray, dict)
     updateExposureTime = Signal(int)
     updateImageMode = Signal(str)
     updateGain = Signal(float)
     updateAcquisitionRate = Signal(float)
+    updatePixelDepth = Signal(int)
     emitData = Signal(str, np.ndarray)
+    frameCaptured = Signal(str, int)
+    triggerArmed = Signal(str)
     
-    def __init__(self, name, id, connection):
+    def __init__(self, name, id, connection, handle=None):
         super().__init__()
         self.type = "Camera"
         self.name = name
         self.id = id 
         self.connection = connection
-        self.manager = gx.DeviceManager()
+        # Use the device manager and open camera handed over by the manager if available.
+        if handle != None:
+            self.manager, self.cam = handle
+        else:
+            self.manager = gx.DeviceManager()
+            self.cam = None
         self.open_connection()
         self.running = True
         self.save_count = 0
         self.stop_stream = False
         self.preview_count = 0
         self.previous_preview_count = 0
+        self.preview_width = 0
+        self.preview_height = 0
         self.arucoDict = cv2.aruco.Dictionary_get(cv2.aruco.DICT_4X4_50)
         self.arucoParams = cv2.aruco.DetectorParameters_create()
         self.board = cv2.aruco.CharucoBoard_create(11, 8, 15/1000, 12/1000, self.arucoDict)
         self.calibrating = False
+        self.colorFilter = "None"
+        self.armed = False
+        self.trigger_source = "Software"
+        self.preview_pending = False
+        self.frame_index = -1
+        self.exposure_time = np.nan
+        self.gain = np.nan
 
     def open_connection(self):
         """Open connection to camera."""
         try:
-            self.cam = self.manager.open_device_by_sn(self.id)
+            if self.cam == None:
+                self.cam = self.manager.open_device_by_sn(self.id)
             self.name = self.cam.DeviceUserID.get()
             log.info("Connected to {name}.".format(name=self.name))
             self.cam.stream_on()
@@ -56,6 +81,7 @@ class Camera(QObject):
             self.cam.stream_off()
             log.info("Stream turned off for {name}.".format(name=self.name))
             self.cam.close_device()
+            self.cam = None
             log.info("Closed connection to {name}.".format(name=self.name))
         except Exception:
             e = sys.exc_info()[1]
@@ -78,37 +104,129 @@ class Camera(QObject):
     def capture_image(self): 
         """Capture image."""
         try: 
-            if self.stop_stream == False:
+            # When armed, frames only arrive on a trigger, so the preview is served by the next captured frame.
+            if self.armed == True:
+                self.preview_pending = True
+            elif self.stop_stream == False:
                 self.raw_image = self.cam.data_stream[0].get_image()
                 # If NoneType, log warning, else update preview image.
                 if type(self.raw_image) == type(None):
                     log.warning("Incomplete frame on {device}.".format(device=self.name))
                 else:
-                    # If colour camera, convert to RGB image, otherwise convert directly to numpy array.
-                    if self.cam.PixelColorFilter.is_implemented() == True:
-                        self.rgb_image = self.raw_image.convert("RGB")
-                        # Convert to monochrome if required.
-                        if self.mode == "Mono":
-                            self.rgb_image.saturation(0)
-                        self.numpy_image = self.rgb_image.get_numpy_array()
-                    else:
-                        self.numpy_image = self.raw_image.get_numpy_array()
+                    self.convert_image()
                     self.preview_count += 1
                     if self.calibrating == True:
 
                         self.charuco_calibrate()
-                self.previewImage.emit(self.numpy_image)
+                self.previewImage.emit(self.downscale_preview(self.numpy_image))
                 self.update_UI()
         except Exception:
             e = sys.exc_info()[1]
             log.warning(e)      
 
+    def convert_image(self):
+        """Convert the raw image to a numpy array for the image mode."""
+        # In raw mode keep the sensor data as is, leaving debayering until after the test.
+        if self.mode == "Raw":
+            self.numpy_image = self.raw_image.get_numpy_array()
+        # If colour camera, convert to RGB image, otherwise convert directly to numpy array.
+        elif self.cam.PixelColorFilter.is_implemented() == True:
+            self.rgb_image = self.raw_image.convert("RGB")
+            # Convert to monochrome if required.
+            if self.mode == "Mono":
+                self.rgb_image.saturation(0)
+            self.numpy_image = self.rgb_image.get_numpy_array()
+        else:
+            self.numpy_image = self.raw_image.get_numpy_array()
+
+    @Slot(str)
+    def arm_trigger(self, source):
+        """Switch the camera to triggered acquisition from the software trigger or a hardware line."""
+        try:
+            self.stop_stream = True
+            self.cam.stream_off()
+            self.cam.TriggerMode.set(gx.GxSwitchEntry.ON)
+            if source == "Software":
+                self.cam.TriggerSource.set(gx.GxTriggerSourceEntry.SOFTWARE)
+            else:
+                self.cam.TriggerSource.set(gx.GxTriggerSourceEntry.LINE0)
+                self.cam.TriggerActivation.set(gx.GxTriggerActivationEntry.RISINGEDGE)
+            self.cam.stream_on()
+            self.armed = True
+            self.trigger_source = source
+            self.frame_index = -1
+            self.stop_stream = False
+            self.triggerArmed.emit(self.name)
+            log.info("{device} armed for {source} triggered capture.".format(device=self.name, source=source.lower()))
+        except Exception:
+            e = sys.exc_info()[1]
+            log.warning(e)
+
+    @Slot()
+    def disarm_trigger(self):
+        """Return the camera to free running acquisition."""
+        try:
+            if self.armed == True:
+                self.stop_stream = True
+                self.armed = False
+                self.cam.stream_off()
+                self.cam.TriggerMode.set(gx.GxSwitchEntry.OFF)
+                self.cam.stream_on()
+                self.stop_stream = False
+                log.info("{device} returned to free running acquisition.".format(device=self.name))
+                # Restart the preview loop if it was waiting on a trigger.
+                if self.preview_pending == True:
+                    self.preview_pending = False
+                    self.capture_image()
+        except Exception:
+            e = sys.exc_info()[1]
+            log.warning(e)
+
+    @Slot(int, int)
+    def capture_frame(self, index, timeout):
+        """Collect the frame for a shared trigger and tag it with the shared frame index, sending the trigger first if it is a software trigger."""
+        try:
+            if self.armed == True and self.stop_stream == False:
+                # The trigger is sent from this thread, so the device handle is only ever used by the camera's own thread.
+                if self.trigger_source == "Software":
+                    self.cam.TriggerSoftware.send_command()
+                self.raw_image = self.cam.data_stream[0].get_image(timeout)
+                if type(self.raw_image) == type(None):
+                    log.warning("No frame {index} from {device}.".format(index=index, device=self.name))
+                    return
+                self.convert_image()
+                self.frame_index = index
+                self.preview_count += 1
+                self.frameCaptured.emit(self.name, index)
+                if self.preview_pending == True:
+                    self.preview_pending = False
+                    self.previewImage.emit(self.downscale_preview(self.numpy_image))
+                    self.update_UI()
+        except Exception:
+            e = sys.exc_info()[1]
+            log.warning(e)
+
+    @Slot(int, int)
+    def set_preview_size(self, width, height):
+        """Set the display resolution of the preview."""
+        self.preview_width = width
+        self.preview_height = height
+
+    def downscale_preview(self, image):
+        """Decimate the image to the preview display resolution."""
+        if self.preview_width > 0 and self.preview_height > 0:
+            height, width = image.shape[0], image.shape[1]
+            step = max(1, int(min(height/self.preview_height, width/self.preview_width)))
+            if step > 1:
+                return image[::step, ::step]
+        return image
+
     def update_coverage(self, corners):
         # Create blank image space.
         # background = ImageColor.getcolor(os.environ['QTMATERIAL_SECONDARYLIGHTCOLOR'], "RGB")
         img = Image.new("RGB", (self.width, self.height), 0)
         # Define polygon.
-        hull = ConvexHull(corners)
+        hull = spatial.ConvexHull(corners)
         x = corners[hull.vertices,0]
         y = corners[hull.vertices,1]
         polygon = np.vstack((x,y))
@@ -186,11 +304,13 @@ class Camera(QObject):
         _, enum = self.cam.ExposureAuto.get()
         if enum != "Off":
             value = self.cam.ExposureTime.get()
+            self.exposure_time = value
             self.updateExposureTime.emit(value)
         # If in auto gain mode, update the gain.
         _, enum = self.cam.GainAuto.get()
         if enum != "Off":
             value = self.cam.Gain.get()
+            self.gain = value
             self.updateGain.emit(value)
         # If in maximum acquisition rate mode, update the acquisition rate.
         _, enum = self.cam.AcquisitionFrameRateMode.get()
@@ -202,15 +322,24 @@ class Camera(QObject):
     def save_image(self):
         try:
             if self.preview_count > self.previous_preview_count:
-                self.image_name = self.name + "_" + str(self.save_count) + ".jpg"
-                self.saveImage.emit(self.image_name, self.numpy_image)
-                data = np.array([self.save_count, self.save_count])
+                # Triggered frames are numbered by the shared frame index so that images from every camera line up.
+                number = self.frame_index if self.armed == True else self.save_count
+                self.image_name = self.name + "_" + str(number) + ".jpg"
+                if self.mode == "Raw":
+                    metadata = {"pattern": self.colorFilter, "number": number, "frameId": self.raw_image.get_frame_id(), "timestamp": self.raw_image.get_timestamp()}
+                    self.saveRawImage.emit(self.name, self.numpy_image, metadata)
+                else:
+                    self.saveImage.emit(self.image_name, self.numpy_image)
+                # The host clock dates the sample for both timestamps, and the exposure and gain go to the frame index.
+                sampleTime = monotonic()
+                data = np.array([sampleTime, sampleTime, number, self.save_count, self.exposure_time, self.gain])
                 self.emitData.emit(self.name, data)
                 self.save_count += 1
                 self.previous_preview_count = 0
                 self.preview_count = 0
             else:
-                data = np.array([np.nan, self.save_count])
+                sampleTime = monotonic()
+                data = np.array([sampleTime, sampleTime, np.nan, self.save_count, self.exposure_time, self.gain])
                 self.emitData.emit(self.name, data)
         except Exception:
             e = sys.exc_info()[1]
@@ -225,6 +354,14 @@ class Camera(QObject):
                 self.updateImageMode.emit("Mono")
             else:
                 self.mode = mode
+            # Record the Bayer pattern so that raw frames can be debayered offline.
+            if self.cam.PixelColorFilter.is_implemented() == True:
+                self.colorFilter = self.cam.PixelColorFilter.get()[1]
+            else:
+                self.colorFilter = "None"
+            # Report the significant bits of each pixel so that high bit depth frames are previewed over their range.
+            if self.cam.PixelSize.is_implemented() == True:
+                self.updatePixelDepth.emit(int(self.cam.PixelSize.get()[0]))
             log.info("Image mode on {device} set to {mode}.".format(device=self.name, mode=mode))
         except Exception:
             e = sys.exc_info()[1]
@@ -268,6 +405,7 @@ class Camera(QObject):
             _, enum = self.cam.ExposureAuto.get()
             if enum == "Off":
                 self.cam.ExposureTime.set(value)
+                self.exposure_time = value
                 log.info("Exposure time set to {value}.".format(value=value))
         except Exception:
             e = sys.exc_info()[1]
@@ -292,6 +430,7 @@ class Camera(QObject):
             _, enum = self.cam.GainAuto.get()
             if enum == "Off":
                 self.cam.Gain.set(value)
+                self.gain = value
                 log.info("Gain set to {value}.".format(value=value))
         except Exception:
             e = sys.exc_info()[1]
@@ -0,0 +1,114 @@
+from PySide6.QtCore import QObject, Signal, Slot
+import logging
+from time import monotonic
+
+log = logging.getLogger(__name__)
+
+class CaptureCoordinator(QObject):
+    """Triggers every armed camera together on a capture schedule and collects their frames in parallel.
+
+    Each capture gets one shared frame index. Every camera is signalled at once and, on its own thread,
+    sends its software trigger, collects its frame, tags it with the index and reports back. A hardware trigger is
+    a single pulse signalled to the thread of the hub that drives the trigger line. A capture is skipped rather
+    than queued while frames from the previous one are still outstanding, so a slow camera cannot build up a backlog."""
+    armCameras = Signal(str)
+    disarmCameras = Signal()
+    captureFrame = Signal(int, int)
+    pulseTrigger = Signal()
+
+    def __init__(self):
+        """CaptureCoordinator init."""
+        super().__init__()
+        self.running = False
+        self.cameras = []
+        self.trigger = None
+        self.source = "Software"
+        self.interval = 1
+        self.timeout = 1000
+        self.reset()
+
+    def reset(self):
+        """Method to reset the capture schedule and counters."""
+        self.ticks = 0
+        self.index = -1
+        self.armed = set()
+        self.outstanding = set()
+        self.triggerTime = 0.0
+        self.captured = 0
+        self.skipped = 0
+        self.missed = 0
+
+    def start(self, cameras, source, captureRate, controlRate, trigger=None, index=0):
+        """Method to arm the cameras and start capturing on every tick that falls due at the capture rate, numbering captures from index."""
+        self.stop()
+        self.reset()
+        self.index = index - 1
+        self.cameras = cameras
+        self.source = source
+        self.trigger = trigger
+        self.interval = max(1, int(round(controlRate/captureRate)))
+        self.timeout = int(1000*self.interval/controlRate)
+        for camera in self.cameras:
+            self.armCameras.connect(camera.arm_trigger)
+            self.disarmCameras.connect(camera.disarm_trigger)
+            self.captureFrame.connect(camera.capture_frame)
+            camera.triggerArmed.connect(self.camera_armed)
+            camera.frameCaptured.connect(self.frame_captured)
+        if self.source == "Hardware" and self.trigger != None:
+            self.pulseTrigger.connect(self.trigger.pulse_camera_trigger)
+        self.running = True
+        self.armCameras.emit(self.source)
+        log.info("Coordinated capture started on {cameras} at {rate:.2f} Hz with {source} trigger.".format(cameras=", ".join(camera.name for camera in self.cameras), rate=controlRate/self.interval, source=source.lower()))
+
+    def stop(self):
+        """Method to stop capturing and return the cameras to free running acquisition."""
+        if self.running == True:
+            self.running = False
+            self.disarmCameras.emit()
+            for camera in self.cameras:
+                self.armCameras.disconnect(camera.arm_trigger)
+                self.disarmCameras.disconnect(camera.disarm_trigger)
+                self.captureFrame.disconnect(camera.capture_frame)
+                camera.triggerArmed.disconnect(self.camera_armed)
+                camera.frameCaptured.disconnect(self.frame_captured)
+            if self.source == "Hardware" and self.trigger != None:
+                self.pulseTrigger.disconnect(self.trigger.pulse_camera_trigger)
+            log.info("Coordinated capture stopped after {captured} captures with {skipped} skipped and {missed} frames missed.".format(captured=self.captured, skipped=self.skipped, missed=self.missed))
+        self.cameras = []
+
+    @Slot(str)
+    def camera_armed(self, name):
+        """Method to record that a camera is ready for triggers."""
+        self.armed.add(name)
+
+    @Slot(str, int)
+    def frame_captured(self, name, index):
+        """Method to record a frame collected by a camera."""
+        if index == self.index:
+            self.outstanding.discard(name)
+            if len(self.outstanding) == 0:
+                self.captured += 1
+
+    @Slot()
+    def tick(self):
+        """Method to trigger the cameras on each tick that falls due at the capture rate."""
+        if self.running == False:
+            return
+        self.ticks += 1
+        if self.ticks % self.interval != 0 or len(self.armed) < len(self.cameras):
+            return
+        if len(self.outstanding) > 0:
+            # Give up on frames that have not arrived within two capture periods, by which time the cameras have timed out.
+            if monotonic() - self.triggerTime < 2*self.timeout/1000:
+                self.skipped += 1
+                log.warning("Capture skipped while waiting for frame {index} from {cameras}.".format(index=self.index, cameras=", ".join(sorted(self.outstanding))))
+                return
+            self.missed += len(self.outstanding)
+            log.warning("Frame {index} missed by {cameras}.".format(index=self.index, cameras=", ".join(sorted(self.outstanding))))
+        self.index += 1
+        self.outstanding = set(camera.name for camera in self.cameras)
+        self.triggerTime = monotonic()
+        # The camera driver buffers triggered frames, so each camera collects its frame whether the edge arrives before or after it starts waiting.
+        self.captureFrame.emit(self.index, self.timeout)
+        if self.source == "Hardware" and self.trigger != None:
+            self.pulseTrigger.emit()
@@ -0,0 +1,242 @@
+import gzip
+import importlib.util
+import logging
+import os
+import queue
+import sys
+import threading
+import time
+from lazy import lazy_import
+
+zstandard = lazy_import("zstandard")
+
+log = logging.getLogger(__name__)
+
+# File extension appended to the output file for each codec.
+compressedExtensions = {"gzip": ".gz", "zstd": ".zst"}
+
+def available_codec(codec):
+    """Function to check a codec, falling back to gzip if zstandard is not installed."""
+    if codec == "zstd" and importlib.util.find_spec("zstandard") == None:
+        log.warning("zstandard is not installed, compressing output with gzip.")
+        return "gzip"
+    if codec not in compressedExtensions:
+        log.warning("Unknown compression codec " + str(codec) + ", using gzip.")
+        return "gzip"
+    return codec
+
+class CompressedFile:
+    """Write-only file that compresses text in independent blocks on a background thread.
+
+    Each block is a complete gzip member or zstd frame, so the file is a valid stream that standard
+    tools can read while it is still being written. An index beside the file records the offsets of
+    every block, so a reader can decompress any part of the file without starting from the beginning.
+    Blocks are cut by size or after flushInterval seconds, whichever comes first, to keep the tail of
+    a slow log readable. With append set, writing continues after the blocks already in the file."""
+
+    def __init__(self, filepath, codec="gzip", level=3, blockSize=1048576, flushInterval=5.0, depth=8, append=False):
+        """CompressedFile init."""
+        self.filepath = filepath
+        self.codec = codec
+        self.level = int(level)
+        self.blockSize = int(blockSize)
+        self.flushInterval = flushInterval
+        self.buffer = []
+        self.buffered = 0
+        self.position = 0
+        self.lastBlock = time.monotonic()
+        self.start = self.lastBlock
+        self.rawBytes = 0
+        self.compressedBytes = 0
+        self.blocks = 0
+        self.cpuTime = 0.0
+        self.lock = threading.Lock()
+        if append == True:
+            blocks = read_index(filepath)
+            self.blocks = len(blocks)
+            if self.blocks > 0:
+                self.rawBytes = blocks[-1][0] + blocks[-1][1]
+                self.compressedBytes = blocks[-1][2] + blocks[-1][3]
+            self.position = self.rawBytes
+            self.file = open(filepath, "ab")
+            self.index = open(filepath + ".idx", "a")
+        else:
+            self.file = open(filepath, "wb")
+            self.index = open(filepath + ".idx", "w")
+            self.index.write("# block\tuncompressedOffset\tuncompressedSize\tcompressedOffset\tcompressedSize\n")
+            self.index.flush()
+        if self.codec == "zstd":
+            self.compressor = zstandard.ZstdCompressor(level=self.level)
+        self.queue = queue.Queue(maxsize=depth)
+        self.worker = threading.Thread(target=self.work, name="CompressedFile", daemon=True)
+        self.worker.start()
+
+    def write(self, data):
+        """Method to buffer text or bytes, handing a block to the compressor once it is full or due."""
+        if isinstance(data, str):
+            data = data.encode()
+        self.buffer.append(data)
+        self.buffered += len(data)
+        self.position += len(data)
+        if self.buffered >= self.blockSize or time.monotonic() - self.lastBlock >= self.flushInterval:
+            self.submit_block()
+        return len(data)
+
+    def tell(self):
+        """Method to get the number of uncompressed bytes written."""
+        return self.position
+
+    def submit_block(self):
+        """Method to queue the buffered data for compression as one block."""
+        self.lastBlock = time.monotonic()
+        if self.buffered > 0:
+            self.queue.put(b"".join(self.buffer))
+            self.buffer = []
+            self.buffered = 0
+
+    def compress(self, block):
+        """Method to compress a block into a self-contained gzip member or zstd frame."""
+        if self.codec == "zstd":
+            return self.compressor.compress(block)
+        return gzip.compress(block, compresslevel=min(max(self.level, 1), 9))
+
+    def work(self):
+        """Worker loop that compresses and appends blocks until it receives None."""
+        while True:
+            block = self.queue.get()
+            if block == None:
+                self.queue.task_done()
+                return
+            try:
+                start = time.thread_time()
+                compressed = self.compress(block)
+                cpuTime = time.thread_time() - start
+                offset = self.file.tell()
+                self.file.write(compressed)
+                self.file.flush()
+                with self.lock:
+                    self.index.write("{block}\t{rawOffset}\t{rawSize}\t{offset}\t{size}\n".format(block=self.blocks, rawOffset=self.rawBytes, rawSize=len(block), offset=offset, size=len(compressed)))
+                    self.index.flush()
+                    self.blocks += 1
+                    self.rawBytes += len(block)
+                    self.compressedBytes += len(compressed)
+                    self.cpuTime += cpuTime
+            except Exception:
+                e = sys.exc_info()[1]
+                log.warning(e)
+            finally:
+                self.queue.task_done()
+
+    def flush(self):
+        """Method to compress everything written so far and wait until it is on disk."""
+        self.submit_block()
+        self.wait()
+
+    def wait(self):
+        """Method to wait until every block handed to the compressor is on disk."""
+        self.queue.join()
+
+    def sync(self):
+        """Method to force the blocks written so far and their index onto the disk."""
+        with self.lock:
+            os.fsync(self.file.fileno())
+            os.fsync(self.index.fileno())
+
+    def close(self):
+        """Method to flush the remaining data, stop the worker and close the file and index."""
+        if self.file.closed == True:
+            return
+        self.flush()
+        self.queue.put(None)
+        self.worker.join()
+        self.file.close()
+        self.index.close()
+        self.report()
+
+    def statistics(self):
+        """Method to get the compression ratio and the CPU time spent compressing."""
+        with self.lock:
+            elapsed = max(time.monotonic() - self.start, 1e-9)
+            return {
+                "blocks": self.blocks,
+                "rawBytes": self.rawBytes,
+                "compressedBytes": self.compressedBytes,
+                "ratio": self.rawBytes/self.compressedBytes if self.compressedBytes > 0 else 0.0,
+                "cpuTime": self.cpuTime,
+                "cpuPerMegabyte": self.cpuTime/(self.rawBytes/1e6) if self.rawBytes > 0 else 0.0,
+                "cpuLoad": 100*self.cpuTime/elapsed,
+            }
+
+    def report(self):
+        """Method to log the compression statistics."""
+        statistics = self.statistics()
+        log.info("Compressed output {path}: {blocks} blocks, ratio {ratio:.1f}, {cpuTime:.2f} s CPU ({cpuPerMegabyte:.3f} s per MB, {cpuLoad:.1f}% of one core).".format(path=os.path.basename(self.filepath), **statistics))
+        return statistics
+
+def read_index(filepath):
+    """Function to read the block index of a compressed file as a list of (uncompressedOffset, uncompressedSize, compressedOffset, compressedSize) tuples."""
+    blocks = []
+    with open(filepath + ".idx") as index:
+        for line in index:
+            # Skip comments and any line cut short by a crash.
+            fields = line.split("\t")
+            if line.startswith("#") == False and line.endswith("\n") and len(fields) == 5:
+                blocks.append(tuple(int(value) for value in fields[1:]))
+    return blocks
+
+def read_range(filepath, start=0, stop=None):
+    """Function to read bytes start to stop of the uncompressed data, decompressing only the blocks that cover them."""
+    codec = "zstd" if filepath.endswith(compressedExtensions["zstd"]) else "gzip"
+    blocks = read_index(filepath)
+    if stop == None:
+        stop = blocks[-1][0] + blocks[-1][1] if len(blocks) > 0 else 0
+    data = []
+    first = None
+    with open(filepath, "rb") as file:
+        for rawOffset, rawSize, offset, size in blocks:
+            if rawOffset + rawSize <= start or rawOffset >= stop:
+                continue
+            if first == None:
+                first = rawOffset
+            file.seek(offset)
+            compressed = file.read(size)
+            if codec == "zstd":
+                data.append(zstandard.ZstdDecompressor().decompress(compressed))
+            else:
+                data.append(gzip.decompress(compressed))
+    if first == None:
+        return b""
+    return b"".join(data)[start-first:stop-first]
+
+def recover(filepath):
+    """Function to truncate a compressed file after its last complete, indexed block, returning the uncompressed last block."""
+    codec = "zstd" if filepath.endswith(compressedExtensions["zstd"]) else "gzip"
+    size = os.path.getsize(filepath)
+    valid = []
+    last = b""
+    with open(filepath, "rb") as file:
+        for rawOffset, rawSize, offset, compressedSize in read_index(filepath):
+            if offset + compressedSize > size:
+                break
+            file.seek(offset)
+            try:
+                if codec == "zstd":
+                    block = zstandard.ZstdDecompressor().decompress(file.read(compressedSize))
+                else:
+                    block = gzip.decompress(file.read(compressedSize))
+            except Exception:
+                break
+            if len(block) != rawSize:
+                break
+            valid.append((rawOffset, rawSize, offset, compressedSize))
+            last = block
+    end = valid[-1][2] + valid[-1][3] if len(valid) > 0 else 0
+    with open(filepath, "r+b") as file:
+        file.truncate(end)
+    with open(filepath + ".idx", "w") as index:
+        index.write("# block\tuncompressedOffset\tuncompressedSize\tcompressedOffset\tcompressedSize\n")
+        for block, (rawOffset, rawSize, offset, compressedSize) in enumerate(valid):
+            index.write("{block}\t{rawOffset}\t{rawSize}\t{offset}\t{size}\n".format(block=block, rawOffset=rawOffset, rawSize=rawSize, offset=offset, size=compressedSize))
+    if end < size:
+        log.warning("Truncated {count} bytes of incomplete blocks from {path}.".format(count=size-end, path=os.path.basename(filepath)))
+    return last
@@ -0,0 +1,272 @@
+"""Read CamLab output files into numpy arrays.
+
+Usage: python datafile.py <file> [--columns NAME ...] [--start T] [--stop T] [--cache]
+       python datafile.py --benchmark <size in MB> [--directory DIR]
+"""
+import argparse
+import io
+import logging
+import os
+import time
+import numpy as np
+from compressedfile import compressedExtensions, read_index, read_range
+
+log = logging.getLogger(__name__)
+
+class DataFile:
+    """Reader for a CamLab data file, plain or block compressed.
+
+    The header is parsed into one metadata dict per column. The body is parsed in chunks with
+    np.loadtxt, so reading the whole file takes as long as np.loadtxt does, and the savings come
+    from parsing less. Time ranges are found by bisecting on file offsets, because the time column
+    increases down the file, so only the rows that are asked for are parsed. A binary .npy cache
+    can be written beside the file, and once it is up to date reads are served from it through a
+    memory map."""
+
+    def __init__(self, filepath):
+        """DataFile init."""
+        self.filepath = filepath
+        self.compressed = filepath.endswith(tuple(compressedExtensions.values()))
+        if self.compressed == True:
+            blocks = read_index(filepath)
+            self.size = blocks[-1][0] + blocks[-1][1] if len(blocks) > 0 else 0
+        else:
+            self.size = os.path.getsize(filepath)
+        self.read_header()
+
+    def read_bytes(self, start, stop):
+        """Method to read bytes start to stop of the uncompressed file."""
+        stop = min(stop, self.size)
+        if start >= stop:
+            return b""
+        if self.compressed == True:
+            return read_range(self.filepath, start, stop)
+        with open(self.filepath, "rb") as file:
+            file.seek(start)
+            return file.read(stop - start)
+
+    def read_header(self):
+        """Method to parse the header into test details and per-column channel metadata."""
+        text = self.read_bytes(0, 1048576)
+        end = text.find(b"\nTime (s)")
+        if end == -1:
+            raise ValueError("{path} is not a CamLab data file.".format(path=self.filepath))
+        end = text.find(b"\n", end + 1) + 1
+        self.dataOffset = end
+        lines = text[:end].decode().split("\n")
+        fields = {}
+        for line in lines:
+            key, _, value = line.partition(":")
+            if key in ["Test name", "Date", "Time"]:
+                fields[key] = value.strip()
+            elif key in ["Slopes", "Offsets", "Channel"]:
+                fields[key] = [item.strip() for item in value.split("\t")[1:]]
+        self.test = fields.get("Test name", "")
+        self.date = fields.get("Date", "")
+        self.time = fields.get("Time", "")
+        names = [name.strip() for name in lines[-2].split("\t")]
+        self.channels = [{"name": "Time", "unit": "s", "channel": "Time", "device": "", "slope": 1.0, "offset": 0.0}]
+        for i, label in enumerate(names[1:]):
+            name, unit = label, ""
+            if label.endswith(")") and "(" in label:
+                name, _, unit = label[:-1].rpartition("(")
+            channel = fields.get("Channel", [])[i] if i < len(fields.get("Channel", [])) else ""
+            channel, _, device = channel.partition(" [")
+            self.channels.append({
+                "name": name.strip(),
+                "unit": unit.strip(),
+                "channel": channel,
+                "device": device.rstrip("]"),
+                "slope": self.number(fields.get("Slopes", []), i),
+                "offset": self.number(fields.get("Offsets", []), i),
+            })
+        self.labels = names
+
+    @staticmethod
+    def number(values, index):
+        """Method to parse a header value as a float, or NaN for N/A or missing values."""
+        try:
+            return float(values[index])
+        except (IndexError, ValueError):
+            return np.nan
+
+    def columns(self, selection=None):
+        """Method to convert column indices, names, full labels or channel [device] labels into column indices."""
+        if selection == None:
+            return list(range(len(self.channels)))
+        indices = []
+        for item in selection:
+            if isinstance(item, (int, np.integer)):
+                indices.append(int(item))
+                continue
+            for index, channel in enumerate(self.channels):
+                if item in [channel["name"], self.labels[index], channel["channel"] + " [" + channel["device"] + "]"]:
+                    indices.append(index)
+                    break
+            else:
+                raise KeyError("No column {item} in {path}.".format(item=item, path=self.filepath))
+        return indices
+
+    def parse(self, text, indices):
+        """Method to parse the selected columns of complete rows of text into a two dimensional array with np.loadtxt."""
+        return np.loadtxt(io.BytesIO(text), usecols=indices, ndmin=2)
+
+    def row_time(self, offset):
+        """Method to get the time of the first complete row starting at or after a byte offset, or None past the end."""
+        if offset <= self.dataOffset:
+            offset = self.dataOffset
+        else:
+            # Step back one byte so that an offset at the start of a row finds that row.
+            offset -= 1
+            while True:
+                text = self.read_bytes(offset, offset + 4096)
+                if len(text) == 0:
+                    return None
+                newline = text.find(b"\n")
+                if newline != -1:
+                    offset += newline + 1
+                    break
+                offset += len(text)
+        text = self.read_bytes(offset, offset + 256)
+        end = text.find(b"\t")
+        if end == -1:
+            return None
+        return offset, float(text[:end])
+
+    def seek_time(self, target):
+        """Method to bisect for the byte offset of the first row at or after a time."""
+        low, high = self.dataOffset, self.size
+        while low < high:
+            middle = (low + high)//2
+            row = self.row_time(middle)
+            if row == None or row[1] >= target:
+                high = middle
+            else:
+                low = row[0] + 1
+        row = self.row_time(low)
+        return row[0] if row != None else self.size
+
+    def cache_path(self):
+        """Method to get the path of the binary cache."""
+        return self.filepath + ".npy"
+
+    def cached(self):
+        """Method to check whether the binary cache is up to date with the file."""
+        path = self.cache_path()
+        return os.path.exists(path) and os.path.getmtime(path) >= os.path.getmtime(self.filepath)
+
+    def cache(self, chunkSize=67108864):
+        """Method to write the whole file to a binary .npy cache that later reads memory map."""
+        np.save(self.cache_path(), self.read(chunkSize=chunkSize, useCache=False))
+        log.info("Cached {path} as binary.".format(path=self.filepath))
+
+    def read_rows(self, offset, size, columns=None):
+        """Method to read the selected columns of the complete rows in size bytes from a row offset, returning them with the offset of the next row."""
+        indices = self.columns(columns)
+        text = self.read_bytes(offset, offset + size)
+        cut = text.rfind(b"\n") + 1
+        while cut == 0 and offset + len(text) < self.size:
+            # Grow the read until it holds a complete row.
+            size *= 2
+            text = self.read_bytes(offset, offset + size)
+            cut = text.rfind(b"\n") + 1
+        if cut == 0:
+            # A partial row left at the end of the file is skipped, as read does.
+            return np.empty((0, len(indices))), offset + len(text)
+        return self.parse(text[:cut], indices), offset + cut
+
+    def read(self, columns=None, start=None, stop=None, chunkSize=67108864, useCache=True):
+        """Method to read the selected columns for rows with start <= time < stop."""
+        indices = self.columns(columns)
+        if useCache == True and self.cached() == True:
+            data = np.load(self.cache_path(), mmap_mode="r")
+            first = 0 if start == None else np.searchsorted(data[:,0], start, side="left")
+            last = len(data) if stop == None else np.searchsorted(data[:,0], stop, side="left")
+            return np.array(data[first:last][:,indices])
+        offset = self.dataOffset if start == None else self.seek_time(start)
+        end = self.size if stop == None else self.seek_time(stop)
+        blocks = []
+        remainder = b""
+        while offset < end:
+            text = remainder + self.read_bytes(offset, min(offset + chunkSize, end))
+            offset = min(offset + chunkSize, end)
+            # Parse complete rows only, carrying any partial row into the next chunk.
+            cut = text.rfind(b"\n") + 1
+            if cut > 0:
+                blocks.append(self.parse(text[:cut], indices))
+            remainder = text[cut:]
+        if len(blocks) == 0:
+            return np.empty((0, len(indices)))
+        return np.concatenate(blocks)
+
+def read_session(manifestPath, columns=None, start=None, stop=None):
+    """Function to read a time range across the segments of a rotated recording using its manifest."""
+    directory = os.path.dirname(os.path.abspath(manifestPath))
+    blocks = []
+    with open(manifestPath) as manifest:
+        for line in manifest:
+            if line.startswith("#") or line.strip() == "":
+                continue
+            fields = line.split("\t")
+            first, last = float(fields[2]), float(fields[3])
+            if (start != None and last < start) or (stop != None and first >= stop):
+                continue
+            blocks.append(DataFile(os.path.join(directory, fields[1])).read(columns, start, stop))
+    return np.concatenate(blocks) if len(blocks) > 0 else np.empty((0, 0))
+
+def benchmark(size, directory, columns=8):
+    """Function to write a synthetic data file of size MB and time np.loadtxt against whole, ranged and cached DataFile reads."""
+    filepath = os.path.join(directory, "benchmark.txt")
+    header = "CamLab data acquisition and device control system: https://github.com/sas229/CamLab\nTest name: benchmark\nDate: -\nTime: -\n\n"
+    header += "Slopes:" + "\t1"*columns + "\nOffsets:" + "\t0"*columns + "\n\n"
+    header += "Channel:" + "".join("\tAIN{i} [T7]".format(i=i) for i in range(columns)) + "\n\n"
+    header += "Time (s)" + "".join("\tChannel {i} (V)".format(i=i) for i in range(columns)) + "\n"
+    rows = int(size*1e6/(9*(columns+1)))
+    with open(filepath, "w") as file:
+        file.write(header)
+        for start in range(0, rows, 100000):
+            block = np.random.default_rng(start).normal(size=(min(100000, rows-start), columns+1))
+            block[:,0] = (start + np.arange(len(block)))*0.01
+            np.savetxt(file, block, fmt='%8.3f', delimiter='\t', newline='\n')
+    results = {}
+    reader = DataFile(filepath)
+    begin = time.perf_counter()
+    reference = np.loadtxt(filepath, skiprows=header.count("\n"))
+    results["np.loadtxt"] = time.perf_counter() - begin
+    begin = time.perf_counter()
+    data = reader.read(useCache=False)
+    results["DataFile.read"] = time.perf_counter() - begin
+    assert np.array_equal(data, reference)
+    middle = reference[len(reference)//2, 0]
+    begin = time.perf_counter()
+    reader.read(columns=[0, 1], start=middle, stop=middle + 60, useCache=False)
+    results["DataFile.read 60 s, 2 columns"] = time.perf_counter() - begin
+    reader.cache()
+    begin = time.perf_counter()
+    reader.read()
+    results["DataFile.read cached"] = time.perf_counter() - begin
+    for name, duration in results.items():
+        log.info("{name:>32}: {duration:8.3f} s ({rate:.0f} MB/s)".format(name=name, duration=duration, rate=os.path.getsize(filepath)/1e6/duration))
+    os.remove(filepath)
+    os.remove(reader.cache_path())
+    return results
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    parser = argparse.ArgumentParser(description="Read a CamLab data file or benchmark the reader.")
+    parser.add_argument("file", nargs="?", help="CamLab data file (.txt, .txt.gz or .txt.zst)")
+    parser.add_argument("--columns", nargs="+", default=None)
+    parser.add_argument("--start", type=float, default=None)
+    parser.add_argument("--stop", type=float, default=None)
+    parser.add_argument("--cache", action="store_true", help="write a binary cache for fast later reads")
+    parser.add_argument("--benchmark", type=float, default=None, help="benchmark on a synthetic file of this many MB")
+    parser.add_argument("--directory", default=".")
+    args = parser.parse_args()
+    if args.benchmark != None:
+        benchmark(args.benchmark, args.directory)
+    elif args.file != None:
+        reader = DataFile(args.file)
+        if args.cache == True:
+            reader.cache()
+        data = reader.read(args.columns, args.start, args.stop)
+        log.info("Read {rows} rows of {columns} columns from {path}.".format(rows=data.shape[0], columns=data.shape[1], path=args.file))
@@ -0,0 +1,65 @@
+"""Convert a raw Bayer recording into RGB or monochrome images after a test.
+
+Usage: python debayer.py <recording>_raw.json [--mode RGB|Mono] [--format jpeg|png|tiff|npy] [--workers N]
+"""
+import argparse
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from lazy import lazy_import
+from imagewriter import imageExtensions, write_image
+from rawrecorder import read_raw
+
+cv2 = lazy_import("cv2")
+
+log = logging.getLogger(__name__)
+
+# OpenCV names its Bayer codes after the second row of the pattern rather than the first, so a sensor pattern such as
+# RGGB is converted with the code of the mirrored pattern, BG, whatever the output.
+openCVPatterns = {"RG": "BG", "GB": "GR", "GR": "GB", "BG": "RG"}
+
+def conversion_code(pattern, mode):
+    """Function to get the OpenCV conversion code for a sensor colour filter pattern, or None for a mono sensor."""
+    pattern = str(pattern)[-2:].upper()
+    if pattern not in openCVPatterns:
+        return None
+    if mode == "RGB":
+        return getattr(cv2, "COLOR_Bayer" + openCVPatterns[pattern] + "2RGB")
+    return getattr(cv2, "COLOR_Bayer" + openCVPatterns[pattern] + "2GRAY")
+
+def convert_chunk(sidecarPath, start, stop, mode, encoder, quality):
+    """Function to debayer and save frames start to stop of a recording under their image numbers, returning the number saved."""
+    sidecar, frames = read_raw(sidecarPath)
+    code = conversion_code(sidecar["pattern"], mode)
+    directory = os.path.dirname(os.path.abspath(sidecarPath))
+    prefix = os.path.basename(sidecarPath)[:-len("_raw.json")]
+    for index in range(start, stop):
+        number, frame = frames[index]
+        image = frame if code == None else cv2.cvtColor(frame, code)
+        filepath = os.path.join(directory, prefix + "_" + str(number) + imageExtensions[encoder])
+        write_image(filepath, image, encoder, quality)
+    return stop - start
+
+def debayer(sidecarPath, mode="RGB", encoder="jpeg", quality=90, workers=None, batch=50):
+    """Function to convert every frame of a raw recording in parallel across worker processes."""
+    sidecar, frames = read_raw(sidecarPath)
+    count = len(frames)
+    workers = workers or os.cpu_count()
+    saved = 0
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(convert_chunk, sidecarPath, start, min(start+batch, count), mode, encoder, quality) for start in range(0, count, batch)]
+        for future in futures:
+            saved += future.result()
+    log.info("Converted {saved} raw frames from {path}.".format(saved=saved, path=sidecarPath))
+    return saved
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    parser = argparse.ArgumentParser(description="Convert a raw Bayer recording into images.")
+    parser.add_argument("recording", help="raw recording sidecar (*_raw.json)")
+    parser.add_argument("--mode", choices=["RGB", "Mono"], default="RGB")
+    parser.add_argument("--format", choices=list(imageExtensions), default="jpeg")
+    parser.add_argument("--quality", type=int, default=90)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+    debayer(args.recording, args.mode, args.format, args.quality, args.workers)
@@ -16,4 +16,6 @@ class DeviceIconDelegate(QStyledItemDelegate):
             icon = QIcon("icon:/secondaryText/camera.svg")
         elif index.data(Qt.DisplayRole) == "Press":
             icon = QIcon("icon:/secondaryText/press.svg")
+        elif index.data(Qt.DisplayRole) == "Replay":
+            icon = QIcon("icon:/secondaryText/file_open.svg")
         icon.paint(painter, option.rect, Qt.AlignCenter)
\ No newline at end of file
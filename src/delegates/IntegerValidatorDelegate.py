@@ -0,0 +1,35 @@
+from PySide6.QtWidgets import QItemDelegate, QLineEdit
+from PySide6.QtGui import QIntValidator
+from PySide6.QtCore import Qt, QRect
+
+class IntegerValidatorDelegate(QItemDelegate):
+    """
+    A delegate that validates integer input between a minimum and maximum from a table cell.
+    """
+    def __init__(self, minimum=0, maximum=99):
+        super().__init__()
+        self.minimum = minimum
+        self.maximum = maximum
+
+    def createEditor(self, parent, option, index):
+        linedit = QLineEdit(parent)
+        linedit.setAlignment(Qt.AlignCenter)
+        validator = QIntValidator(self.minimum, self.maximum, self)
+        linedit.setValidator(validator)
+        return linedit
+
+    def setModelData (self, editor, model, index):
+        # Change the underlying data model by updating the value as an integer if it is in range.
+        text = editor.text()
+        if len(text) != 0 and self.minimum <= int(text) <= self.maximum:
+            model.setData(index, int(text), Qt.EditRole)
+
+    def paint(self, painter, option, index):
+        # Override paint method to put centered text in cell.
+        x1, y1, x2, y2 = option.rect.getCoords()
+        rect = QRect()
+        rect.setCoords(x1, y1, x2, y2)
+        model = index.model()
+        string = str(model.data(index, role=Qt.DisplayRole))
+        option.displayAlignment = Qt.AlignCenter
+        self.drawDisplay(painter, option, rect, string)
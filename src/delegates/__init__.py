@@ -3,6 +3,7 @@ from .ConnectionIconDelegate import ConnectionIconDelegate
 from .StatusIconDelegate import StatusIconDelegate
 from .DeviceIconDelegate import DeviceIconDelegate
 from .FloatValidatorDelegate import FloatValidatorDelegate
+from .IntegerValidatorDelegate import IntegerValidatorDelegate
 from .StringDelegate import StringDelegate
 from .ComboBoxDelegate import ComboBoxDelegate
 from .ColouredBackgroundDelegate import ColouredBackgroundDelegate
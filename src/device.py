@@ -3,11 +3,15 @@ import logging
 from labjack import ljm
 import numpy as np
 import sys
-from time import sleep
-from simple_pid import PID
+from time import sleep, monotonic
+from pid import PIDArray
+from axes import Axes, add_axis_properties, clock_settings
 
 log = logging.getLogger(__name__)
 
+# Fixed layout of the per-channel control panel snapshot.
+controlPanelType = np.dtype([("jog", bool), ("feedback", bool), ("PID", bool), ("positionProcessVariable", float), ("feedbackProcessVariable", float), ("speed", float)])
+
 class Device(QObject):
     emitData = Signal(str, np.ndarray)
     updateOffsets = Signal(str, list, list)
@@ -26,14 +30,38 @@ class Device(QObject):
     updateRunningIndicator = Signal(bool)
     updateSpeedC1 = Signal(float)
     updateSpeedC2 = Signal(float)
-
-    def __init__(self, name, id, connection):
+    updateControlPanel = Signal(str, np.ndarray)
+    updatePIDTerms = Signal(str, np.ndarray)
+    updateBufferLevel = Signal(str, float)
+
+    # Registers for each control axis, indexed by axis. The pulse, limit switch and output registers are read every tick.
+    axisRegisters = {
+        "pulses": ["DIO1_EF_READ_A", "DIO3_EF_READ_A"],
+        "minimum": ["CIO2", "CIO3"],
+        "maximum": ["CIO0", "CIO1"],
+        "output": ["DIO4_EF_ENABLE", "DIO5_EF_ENABLE"],
+        "direction": ["EIO1", "EIO3"],
+        "clock": [1, 2],
+    }
+    axisReads = ["pulses", "minimum", "maximum", "output"]
+
+    # Lines for synchronised acquisition. The master drives triggerOutput, which is wired to triggerInput on every T7 including itself.
+    triggerOutput = "DIO6"
+    triggerInput = "DIO7"
+    # Line pulsed to trigger cameras wired for hardware triggered capture.
+    cameraTriggerOutput = "EIO4"
+
+    def __init__(self, name, id, connection, handle=None):
         super().__init__()
         self.type = "Hub"
         self.name = name
         self.id = id 
         self.connection = connection
-        self.handle = None
+        self.handle = handle
+
+        # Per-axis state is held in arrays; the _C1 and _C2 attributes are views onto them.
+        self.axes = Axes(len(self.axisRegisters["clock"]))
+        self.configure_axis_registers()
 
         # Variables
         self.data = np.zeros(2)
@@ -99,15 +127,29 @@ class Device(QObject):
         self.current_data = np.empty(0)
         self.sequence_running = False
 
-        # Disable clock 0 and load Lua failsafe script to turn off PWM.
-        self.open_connection()
+        # Disable clock 0 and load Lua failsafe script to turn off PWM. A handle handed over by the manager is kept open.
+        if handle == None:
+            self.open_connection()
         self.disable_clock_0()
         self.load_lua_script()
-        self.close_connection()
-
-        # Instantiate PID controllers.
-        self.PID_C1 = PID()
-        self.PID_C2 = PID()
+        if handle == None:
+            self.close_connection()
+
+        # Instantiate PID controllers for all axes, timed by the device core timer.
+        self.controller = PIDArray(self.axes.count)
+        self.PIDLogInterval = 0.0
+        self.nextPIDLog = 0.0
+        self.coreTime = 0.0
+        self.lastCoreTimer = None
+        self.sampleTime = 0.0
+        self.hostTime = 0.0
+        self.streaming = False
+        self.scanIndex = 0
+        self.scanBacklog = 0
+        self.streamStartTime = 0.0
+        self.bufferLevel = 0.0
+        self.streamBufferBytes = 32768 # Largest T7 stream buffer, so networked hubs can ride out latency spikes.
+        self.scans = np.empty((0, 0))
 
     @Slot()
     def run_sequence(self):
@@ -163,7 +205,7 @@ class Device(QObject):
     def set_enable_C1(self, value):
         """Set enable state for control channel C1."""
         try:
-            self.handle = ljm.open(7, self.connection, self.id)
+            self.open_handle()
             if value ==  True:
                 self.position_setpoint_C1 = self.position_process_variable_C1
                 self.updatePositionSetPointC1.emit(self.position_process_variable_C1)
@@ -183,7 +225,7 @@ class Device(QObject):
     def set_enable_C2(self, value):
         """Set enable state for control channel C2."""
         try:
-            self.handle = ljm.open(7, self.connection, self.id)
+            self.open_handle()
             if value ==  True:
                 self.position_setpoint_C2 = self.position_process_variable_C2
                 self.updatePositionSetPointC2.emit(self.position_process_variable_C2)
@@ -202,7 +244,7 @@ class Device(QObject):
     def disable_clock_0(self):
         """Check clock 0 is disabled."""
         try:
-            self.handle = ljm.open(7, self.connection, self.id)
+            self.open_handle()
             ljm.eWriteName(self.handle,'DIO_EF_CLOCK0_ENABLE',0)
             log.info("Clock 0 disabled on {device}.".format(device=self.name))
         except ljm.LJMError:
@@ -215,7 +257,7 @@ class Device(QObject):
     def turn_on_PWM_C1(self):
         """PWM output on control channel C1."""
         try:
-            self.handle = ljm.open(7, self.connection, self.id)
+            self.open_handle()
             aNames = ["DIO4_EF_ENABLE", "DIO4", "DIO4_EF_INDEX", "DIO4_EF_OPTIONS", "DIO4_EF_CONFIG_A", "DIO4_EF_ENABLE"]
             aValues = [0, 0, 0, 1, self.width_C1, 1]
             numFrames = len(aNames)
@@ -231,7 +273,7 @@ class Device(QObject):
     def pulse_out_C1(self, pulses):
         """Setup pulse out on control channel C1."""
         try:
-            self.handle = ljm.open(7, self.connection, self.id)
+            self.open_handle()
             aNames = ["DIO4_EF_ENABLE", "DIO4", "DIO4_EF_INDEX", "DIO4_EF_OPTIONS", "DIO4_EF_CONFIG_A", "DIO4_EF_CONFIG_C", "DIO4_EF_ENABLE"]
             aValues = [0, 0, 2, 1, self.width_C1, pulses, 1]
             numFrames = len(aNames)
@@ -247,7 +289,7 @@ class Device(QObject):
     def turn_on_PWM_C2(self):
         """Setup PWM output on control channel C2."""
         try:
-            self.handle = ljm.open(7, self.connection, self.id)
+            self.open_handle()
             aNames = ["DIO5_EF_ENABLE", "DIO5", "DIO5_EF_INDEX", "DIO5_EF_OPTIONS", "DIO5_EF_CONFIG_A", "DIO5_EF_ENABLE"]
             aValues = [0, 0, 0, 2, self.width_C2, 1]
             numFrames = len(aNames)
@@ -263,7 +305,7 @@ class Device(QObject):
     def pulse_out_C2(self, pulses):
         """Setup pulse out on control channel C2."""
         try:
-            self.handle = ljm.open(7, self.connection, self.id)
+            self.open_handle()
             aNames = ["DIO5_EF_ENABLE", "DIO5", "DIO5_EF_INDEX", "DIO5_EF_OPTIONS", "DIO5_EF_CONFIG_A", "DIO5_EF_CONFIG_C", "DIO5_EF_ENABLE"]
             aValues = [0, 0, 2, 2, self.width_C2, pulses, 1]
             numFrames = len(aNames)
@@ -279,7 +321,7 @@ class Device(QObject):
     def turn_off_PWM_C1(self):
         """Turn control channel C1 PWM off."""
         try:
-            self.handle = ljm.open(7, self.connection, self.id)
+            self.open_handle()
             ljm.eWriteName(self.handle, "DIO4_EF_ENABLE", 0)
         except ljm.LJMError:
             ljme = sys.exc_info()[1]
@@ -291,7 +333,7 @@ class Device(QObject):
     def turn_off_PWM_C2(self):
         """Turn control channel C2 PWM off."""
         try:
-            self.handle = ljm.open(7, self.connection, self.id)
+            self.open_handle()
             ljm.eWriteName(self.handle, "DIO5_EF_ENABLE", 0)
         except ljm.LJMError:
             ljme = sys.exc_info()[1]
@@ -302,43 +344,34 @@ class Device(QObject):
 
     def set_PID_tunings_C1(self):
         """Set PID tunings for control channel C1."""
-        self.PID_C1.tunings = (self.KP_C1, self.KI_C1, self.KD_C1)
+        self.controller.set_tunings(0, self.KP_C1, self.KI_C1, self.KD_C1)
         log.info("PID tunings updated for control channel C1 on {device}.".format(device=self.name))
 
     def set_PID_tunings_C2(self):
         """Set PID tunings for control channel C2."""
-        self.PID_C2.tunings = (self.KP_C2, self.KI_C2, self.KD_C2)
+        self.controller.set_tunings(1, self.KP_C2, self.KI_C2, self.KD_C2)
         log.info("PID tunings updated for control channel C2 on {device}.".format(device=self.name))
 
+    def clock_writes(self, clock, roll, divisor=8):
+        """Return the register writes that set a clock roll value."""
+        aNames = ['DIO_EF_CLOCK' + str(clock) + '_ENABLE',
+                'DIO_EF_CLOCK' + str(clock) + '_DIVISOR',
+                'DIO_EF_CLOCK' + str(clock) + '_ROLL_VALUE',
+                'DIO_EF_CLOCK' + str(clock) + '_ENABLE']
+        aValues = [0, divisor, int(roll), 1]
+        return list(zip(aNames, aValues))
+
     def set_clock(self, clock, freq):        
-        """Define appropriate clock settings, selecting the minimum possible divisor 
-        that does not result in a roll value that exceeds the bit depth of the clock.
-        Clamp frequency to 426666, which is equivalent to 4000 RPM for a 6400 CPR encoder
-        with a 16 bit clock and divisor value of 8."""
+        """Define and write the clock settings for a target frequency."""
         try:
-            core_freq = 80000000
-            max_roll = 2**16
-            divisor = 8
             width = 10  
-            max_freq = 426666
-            min_freq = (core_freq/(divisor*max_roll))
-            if freq > max_freq:
-                freq = max_freq
-            elif freq < min_freq:
-                freq = np.ceil(min_freq)
-            roll = int(min(max(1,core_freq/(freq*divisor)), max_roll))
+            freq, roll = clock_settings(freq)
 
             # Set the clock.
-            aNames = ['DIO_EF_CLOCK' + str(clock) + '_ENABLE',
-                    'DIO_EF_CLOCK' + str(clock) + '_DIVISOR',
-                    'DIO_EF_CLOCK' + str(clock) + '_ROLL_VALUE',
-                    'DIO_EF_CLOCK' + str(clock) + '_ENABLE']
-            aValues = [0, divisor, roll, 1]
-            numFrames = len(aNames)
-            self.handle = ljm.open(7, self.connection, self.id)
-            ljm.eWriteNames(self.handle, numFrames, aNames, aValues)
+            self.open_handle()
+            self.write_registers(self.clock_writes(clock, roll))
 
-            return freq, roll, width
+            return freq.item(), roll.item(), width
 
         except ljm.LJMError:
             ljme = sys.exc_info()[1]
@@ -350,7 +383,7 @@ class Device(QObject):
     def refresh_connection(self):
         """Refresh connection to LabJack T7 device."""
         try:
-            self.handle = ljm.open(7, self.connection, self.id)
+            self.open_handle()
         except ljm.LJMError:
             ljme = sys.exc_info()[1]
             log.warning(ljme) 
@@ -361,7 +394,7 @@ class Device(QObject):
     def check_connection_C1(self):
         """Check connection to control device on channel C1."""
         try:
-            self.handle = ljm.open(7, self.connection, self.id)
+            self.open_handle()
             self.connectedC1 = not bool(int(ljm.eReadName(self.handle, 'FIO0')))
             self.updateConnectionIndicatorC1.emit(self.connectedC1)
         except ljm.LJMError:
@@ -374,7 +407,7 @@ class Device(QObject):
     def check_connection_C2(self):
         """Check connection to control device on channel C2."""
         try:
-            self.handle = ljm.open(7, self.connection, self.id)
+            self.open_handle()
             self.connectedC2 = not bool(int(ljm.eReadName(self.handle, 'FIO2')))
             self.updateConnectionIndicatorC2.emit(self.connectedC2)
         except ljm.LJMError:
@@ -399,15 +432,15 @@ class Device(QObject):
         """Set PID state for control channel C1."""
         self.status_PID_C1 = value
         if value == True:
-            self.PID_C1.reset()
-            self.PID_C1.output_limits = (-self.speed_limit, self.speed_limit)
-            self.PID_C1.setpoint = self.feedback_setpoint_C1
-            self.PID_C1.set_auto_mode(True, last_output=0.001)
+            self.controller.reset(0)
+            self.controller.set_output_limits(0, -self.speed_limit, self.speed_limit)
+            self.controller.set_setpoint(0, self.feedback_setpoint_C1)
+            self.controller.set_auto_mode(0, True, last_output=0.001)
             self.turn_on_PWM_C1()
             log.info("PID control for control channel C1 on " + self.name + " turned on.")
         else:
             self.position_setpoint_C1 = self.position_process_variable_C1
-            self.PID_C1.set_auto_mode(False)
+            self.controller.set_auto_mode(0, False)
             self.updatePositionSetPointC1.emit(self.position_setpoint_C1)
             self.turn_off_PWM_C1()
             log.info("PID control for control channel C1 on " + self.name + " turned off.")
@@ -417,15 +450,15 @@ class Device(QObject):
         """Set PID state for control channel C2."""
         self.status_PID_C2 = value
         if value == True:
-            self.PID_C2.reset()
-            self.PID_C2.output_limits = (-self.speed_limit, self.speed_limit)
-            self.PID_C2.setpoint = self.feedback_setpoint_C2
-            self.PID_C2.set_auto_mode(True, last_output=0.001)
+            self.controller.reset(1)
+            self.controller.set_output_limits(1, -self.speed_limit, self.speed_limit)
+            self.controller.set_setpoint(1, self.feedback_setpoint_C2)
+            self.controller.set_auto_mode(1, True, last_output=0.001)
             self.turn_on_PWM_C2()
             log.info("PID control for control channel C2 on " + self.name + " turned on.")
         else:
             self.position_setpoint_C2 = self.position_process_variable_C2
-            self.PID_C2.set_auto_mode(False)
+            self.controller.set_auto_mode(1, False)
             self.updatePositionSetPointC1.emit(self.position_setpoint_C2)
             self.turn_off_PWM_C2()
             log.info("PID control for control channel C2 on " + self.name + " turned off.")
@@ -472,28 +505,45 @@ class Device(QObject):
         self.set_PID_tunings_C2()
         log.info("PID derivative gain for control channel C2 on {device} changed to {value:.2f}.".format(value=value, device=self.name))
 
+    def set_PID_log_interval(self, interval):
+        """Set the interval in seconds between reports of the PID terms, or zero not to report them."""
+        self.PIDLogInterval = float(interval)
+        self.nextPIDLog = 0.0
+
+    @Slot(float)
+    def set_ramp_rate_C1(self, value):
+        """Set feedback setpoint ramp rate for control channel C1."""
+        self.controller.set_ramp_rate(0, value)
+        log.info("Feedback setpoint ramp rate for control channel C1 on {device} changed to {value:.2f}.".format(value=value, device=self.name))
+
+    @Slot(float)
+    def set_ramp_rate_C2(self, value):
+        """Set feedback setpoint ramp rate for control channel C2."""
+        self.controller.set_ramp_rate(1, value)
+        log.info("Feedback setpoint ramp rate for control channel C2 on {device} changed to {value:.2f}.".format(value=value, device=self.name))
+
     @Slot(bool)
     def set_pom_C1(self, value):
-        self.PID_C1.proportional_on_measurement = value 
+        self.controller.proportionalOnMeasurement[0] = value
         log.info("Proportional on measurement toggled for control channel C1.")
 
     @Slot(bool)
     def set_pom_C2(self, value):
-        self.PID_C2.proportional_on_measurement = value 
+        self.controller.proportionalOnMeasurement[1] = value
         log.info("Proportional on measurement toggled for control channel C2.")
 
     @Slot(float)
     def set_feedback_setpoint_C1(self, setpoint):
         """Set feedback setpoint for channel C1."""
         self.feedback_setpoint_C1 = setpoint
-        self.PID_C1.setpoint = setpoint
+        self.controller.set_setpoint(0, setpoint, ramp=True)
         log.info("Feedback setpoint on control channel C1 on {device} set to {setpoint}.".format(device=self.name, setpoint=setpoint))
 
     @Slot(float)
     def set_feedback_setpoint_C2(self, setpoint):
         """Set feedback setpoint for channel C2."""
         self.feedback_setpoint_C2 = setpoint
-        self.PID_C2.setpoint = setpoint
+        self.controller.set_setpoint(1, setpoint, ramp=True)
         log.info("Feedback setpoint on control channel C2 on {device} set to {setpoint}.".format(device=self.name, setpoint=setpoint))
 
     def set_feedback_channel_C1(self, feedback):
@@ -509,69 +559,15 @@ class Device(QObject):
         log.info("Feedback channel index set on control channel C2 on {device}.".format(device=self.name))
 
     def check_limits(self):
+        """Method to read the axis registers and stop any axis at a limit."""
         try:
             # Refresh connection.
-            self.handle = ljm.open(7, self.connection, self.id)
-            self.limit_C1 = False
-            self.limit_C2 = False
-
-            # Check position limits.
-            self.minimum_limit_C1 = bool(ljm.eReadName(self.handle, "CIO2"))
-            self.maximum_limit_C1 = bool(ljm.eReadName(self.handle, "CIO0"))
-            self.minimum_limit_C2 = bool(ljm.eReadName(self.handle, "CIO3"))
-            self.maximum_limit_C2 = bool(ljm.eReadName(self.handle, "CIO1"))
-            
-            #  Check if motor moving and stop if moving in the direction of the hard limit for C1.
-            moving = ljm.eReadName(self.handle, "DIO4_EF_ENABLE")
-            if moving == 1 and self.direction_C1 == -1 and self.minimum_limit_C1 == True:
-                self.stop_command_C1()
-            elif moving == 1 and self.direction_C1 == 1 and self.maximum_limit_C1 == True:
-                self.stop_command_C1()
-
-            #  Check if motor moving and stop if moving in the direction of the hard limit for C2.
-            moving = ljm.eReadName(self.handle, "DIO5_EF_ENABLE")
-            if moving == 1 and self.direction_C2 == -1 and self.minimum_limit_C2 == True:
-                self.stop_command_C2()
-            elif moving == 1 and self.direction_C2 == 1 and self.maximum_limit_C2 == True:
-                self.stop_command_C2()
-
-            # Turn on indicator if on limits.
-            if self.minimum_limit_C1 == True or self.maximum_limit_C1 == True:
-                self.limit_C1 = True
-            if self.minimum_limit_C2 == True or self.maximum_limit_C2 == True:
-                self.limit_C2 = True
-
-            # Check position limits.
-            if self.position_process_variable_C1 <= self.position_left_limit_C1:
-                self.limit_C1 = True
-            if self.position_process_variable_C1 >= self.position_right_limit_C1:
-                self.limit_C1 = True
-            if self.position_process_variable_C2 <= self.position_left_limit_C2:
-                self.limit_C2 = True
-            if self.position_process_variable_C2 >= self.position_right_limit_C2:
-                self.limit_C2 = True
-
-            # Check feedback limits.
-            if self.feedback_process_variable_C1 <= self.feedback_left_limit_C1:
-                self.limit_C1 = True
-            if self.feedback_process_variable_C1 >= self.feedback_right_limit_C1:
-                self.limit_C1 = True
-            if self.feedback_process_variable_C2 <= self.feedback_left_limit_C2:
-                self.limit_C2 = True
-            if self.feedback_process_variable_C2 >= self.feedback_right_limit_C2:
-                self.limit_C2 = True
-
-            # Set indicator.
-            if self.limit_C1 == True:
-                self.updateLimitIndicatorC1.emit(True)
-                self.stop_command_C1() # Added to try and stop actuator if soft limit is reached in PID control.
-            else:
-                self.updateLimitIndicatorC1.emit(False)
-            if self.limit_C2 == True:
-                self.updateLimitIndicatorC2.emit(True)
-                self.stop_command_C2() # Added to try and stop actuator if soft limit is reached in PID control.
-            else:
-                self.updateLimitIndicatorC2.emit(False)
+            self.open_handle()
+            values = np.asarray(ljm.eReadAddresses(self.handle, len(self.axisAddresses), self.axisAddresses, self.axisDataTypes))
+            pulses, minimum, maximum, output = values.reshape(len(self.axisReads), self.axes.count)
+            writes = []
+            self.limit_axes(minimum.astype(bool), maximum.astype(bool), output, self.axes.enabled.copy(), writes)
+            self.write_registers(writes)
         except ljm.LJMError:
             ljme = sys.exc_info()[1]
             log.warning(ljme) 
@@ -579,6 +575,37 @@ class Device(QObject):
             e = sys.exc_info()[1]
             log.warning(e)
 
+    def limit_axes(self, minimum, maximum, output, enabled, writes):
+        """Method to update the limit indicators and stop the enabled axes at a hard or soft limit."""
+        self.axes.minimum[:] = minimum
+        self.axes.maximum[:] = maximum
+
+        # Emit the limit indicators that have changed.
+        limit = self.axes.limits(minimum, maximum)
+        for axis in np.flatnonzero(limit != self.axes.limit):
+            getattr(self, "updateLimitIndicatorC" + str(axis+1)).emit(bool(limit[axis]))
+        self.axes.limit[:] = limit
+
+        # Stop axes driving into a limit switch, moving beyond a position limit, or running while on a limit.
+        running = (np.asarray(output) == 1) | self.axes.jog | self.axes.PID
+        stop = enabled & (self.axes.hard_limits(minimum, maximum, output) | self.axes.soft_limits() | (limit & running))
+        if stop.any():
+            self.stop_axes(stop, writes)
+        return stop
+
+    def stop_axes(self, mask, writes):
+        """Method to stop the masked axes, turning off their pulse output and PID control."""
+        for axis in np.flatnonzero(mask):
+            channel = "C" + str(axis+1)
+            writes.append((self.axisRegisters["output"][axis], 0))
+            self.axes.jog[axis] = False
+            if self.axes.PID[axis] == True:
+                self.axes.PID[axis] = False
+                self.controller.set_auto_mode(axis, False)
+            setattr(self, "position_setpoint_" + channel, self.axes.position[axis].item())
+            getattr(self, "updatePositionSetPoint" + channel).emit(self.axes.position[axis].item())
+            log.info("Control stopped on device {device} control channel {channel}.".format(device=self.name, channel=channel))
+
     def set_position_C1(self, value):
         """Set position for control C1."""
         self.position_process_variable_C1 = value
@@ -601,7 +628,7 @@ class Device(QObject):
         if not self.enabled_C1:  # Only process if channel is enabled
             return
         try:
-            self.handle = ljm.open(7, self.connection, self.id)
+            self.open_handle()
             self.turn_off_PWM_C1()
             self.set_PID_control_C1(False)
             sleep(0.1)
@@ -621,7 +648,7 @@ class Device(QObject):
         if not self.enabled_C2:  # Only process if channel is enabled
             return
         try:
-            self.handle = ljm.open(7, self.connection, self.id)
+            self.open_handle()
             self.turn_off_PWM_C2()
             self.set_PID_control_C2(False)
             sleep(0.1)
@@ -715,7 +742,7 @@ class Device(QObject):
     def update_position_left_limit_status_C1(self, status):
         """Update position left limit status on control channel C1."""
         try:
-            self.handle = ljm.open(7, self.connection, self.id)
+            self.open_handle()
             self.position_left_limit_status_C1 = status
             if status == True:
                 ljm.eWriteName(self.handle, "DIO4_EF_ENABLE", 0)
@@ -730,7 +757,7 @@ class Device(QObject):
     def update_position_left_limit_status_C2(self, status):
         """Update position left limit status on control channel C2."""
         try:           
-            self.handle = ljm.open(7, self.connection, self.id)
+            self.open_handle()
             self.position_left_limit_status_C2 = status
             if status == True:
                 ljm.eWriteName(self.handle, "DIO5_EF_ENABLE", 0)
@@ -745,7 +772,7 @@ class Device(QObject):
     def update_position_right_limit_status_C1(self, status):
         """Update position right limit status on control channel C1."""
         try:
-            self.handle = ljm.open(7, self.connection, self.id)
+            self.open_handle()
             self.position_right_limit_status_C1 = status
             if status == True:
                 ljm.eWriteName(self.handle, "DIO4_EF_ENABLE", 0)
@@ -760,7 +787,7 @@ class Device(QObject):
     def update_position_right_limit_status_C2(self, status):
         """Update position right limit status on control channel C2."""
         try:           
-            self.handle = ljm.open(7, self.connection, self.id)
+            self.open_handle()
             self.position_right_limit_status_C2 = status
             if status == True:
                 ljm.eWriteName(self.handle, "DIO5_EF_ENABLE", 0)
@@ -774,7 +801,7 @@ class Device(QObject):
     @Slot(float)
     def set_speed_C1(self, speed=0.0):
         """Set speed on control channel C1."""
-        self.handle = ljm.open(7, self.connection, self.id)     
+        self.open_handle()     
         target_frequency = int(speed*self.counts_per_unit_C1)
         self.freqC1, self.rollC1, self.width_C1 = self.set_clock(1, target_frequency)
         self.speed_C1 = self.freqC1/self.counts_per_unit_C1
@@ -783,7 +810,7 @@ class Device(QObject):
     @Slot(float)
     def set_speed_C2(self, speed=0.0):
         """Set speed on control channel C2."""
-        self.handle = ljm.open(7, self.connection, self.id) 
+        self.open_handle() 
         target_frequency = int(speed*self.counts_per_unit_C2)
         self.freqC2, self.rollC2, self.width_C2 = self.set_clock(2, target_frequency)
         self.speed_C2 = self.freqC2/self.counts_per_unit_C2
@@ -792,7 +819,7 @@ class Device(QObject):
     def reset_pulse_counter_C1(self):
         """Reste C1 pulse counter."""
         try:
-            self.handle = ljm.open(7, self.connection, self.id)
+            self.open_handle()
             ljm.eReadName(self.handle, "DIO1_EF_READ_A_AND_RESET")
         except ljm.LJMError:
             ljme = sys.exc_info()[1]
@@ -804,7 +831,7 @@ class Device(QObject):
     def reset_pulse_counter_C2(self):
         """Reste C1 pulse counter."""
         try:
-            self.handle = ljm.open(7, self.connection, self.id)
+            self.open_handle()
             ljm.eReadName(self.handle, "DIO3_EF_READ_A_AND_RESET")
         except ljm.LJMError:
             ljme = sys.exc_info()[1]
@@ -816,7 +843,7 @@ class Device(QObject):
     @Slot(str)
     def jog_positive_on_C1(self):
         """Turn positive jog on for control channel C1."""
-        self.handle = ljm.open(7, self.connection, self.id)
+        self.open_handle()
         if self.running == True and self.maximum_limit_C1 == False and self.motor_enabled_C1 == True:
             if self.position_process_variable_C1 <= self.position_right_limit_C1:
                 # Set direction.
@@ -836,7 +863,7 @@ class Device(QObject):
     @Slot(str)
     def jog_positive_on_C2(self):
         """Turn positive jog on for control channel C2."""
-        self.handle = ljm.open(7, self.connection, self.id)
+        self.open_handle()
         if self.running == True and self.maximum_limit_C2 == False and self.motor_enabled_C2 == True:
             if self.position_process_variable_C2 <= self.position_right_limit_C2:
                 # Set direction.
@@ -856,7 +883,7 @@ class Device(QObject):
     @Slot(str)
     def jog_negative_on_C1(self):
         """Turn negative jog on for control channel C1."""
-        self.handle = ljm.open(7, self.connection, self.id)
+        self.open_handle()
         if self.running == True and self.maximum_limit_C1 == False and self.motor_enabled_C1 == True:
             if self.position_process_variable_C1 >= self.position_left_limit_C1:
                 # Set direction.
@@ -876,7 +903,7 @@ class Device(QObject):
     @Slot(str)
     def jog_negative_on_C2(self):
         """Turn negative jog on for control channel C2."""
-        self.handle = ljm.open(7, self.connection, self.id)
+        self.open_handle()
         if self.running == True and self.maximum_limit_C2 == False and self.motor_enabled_C2 == True:
             if self.position_process_variable_C2 >= self.position_left_limit_C2:
                 # Set direction.
@@ -897,7 +924,7 @@ class Device(QObject):
     def jog_positive_off_C1(self):
         """Turn positive jog off for control channel C1."""
         if self.jog_C1 == True:
-            self.handle = ljm.open(7, self.connection, self.id)
+            self.open_handle()
             self.jog_C1 = False
             self.turn_off_PWM_C1()
             sleep(0.1)
@@ -909,7 +936,7 @@ class Device(QObject):
     def jog_positive_off_C2(self):
         """Turn positive jog off for control channel C2."""
         if self.jog_C2 == True:
-            self.handle = ljm.open(7, self.connection, self.id)
+            self.open_handle()
             self.jog_C2 = False
             self.turn_off_PWM_C2()
             sleep(0.1)
@@ -921,7 +948,7 @@ class Device(QObject):
     def jog_negative_off_C1(self):
         """Turn negative jog off for control channel C1."""
         if self.jog_C1 == True:
-            self.handle = ljm.open(7, self.connection, self.id)
+            self.open_handle()
             self.jog_C1 = False
             self.turn_off_PWM_C1()
             sleep(0.1)
@@ -933,7 +960,7 @@ class Device(QObject):
     def jog_negative_off_C2(self):
         """Turn negative jog off for control channel C2."""
         if self.jog_C2 == True:
-            self.handle = ljm.open(7, self.connection, self.id)
+            self.open_handle()
             self.jog_C2 = False
             self.turn_off_PWM_C2()
             sleep(0.1)
@@ -942,32 +969,12 @@ class Device(QObject):
             log.info("Jog negative turned off for control channel C2 on {device}.".format(device=self.name))
 
     @Slot()
-    def updateControlPanelC1(self):
-        """Update control panel for channel C1."""
-        if self.jog_C1 == True: 
-            self.updatePositionSetPointC1.emit(self.position_process_variable_C1)
-        self.updatePositionProcessVariableC1.emit(self.position_process_variable_C1)
-        if self.feedback_index_C1 != 0:
-            self.updateFeedbackProcessVariableC1.emit(self.feedback_process_variable_C1)
-            if self.status_PID_C1 == True:
-                self.updateSpeedC1.emit(self.speed_C1)
-                self.updatePositionSetPointC1.emit(self.position_process_variable_C1)
-            elif self.status_PID_C1 == False:
-                self.updateFeedbackSetPointC1.emit(self.feedback_process_variable_C1) 
-        
-    @Slot()
-    def updateControlPanelC2(self):   
-        """Update control panel for channel C2."""
-        if self.jog_C2 == True:
-            self.updatePositionSetPointC2.emit(self.position_process_variable_C2)
-        self.updatePositionProcessVariableC2.emit(self.position_process_variable_C2)
-        if self.feedback_index_C2 != 0:
-            self.updateFeedbackProcessVariableC2.emit(self.feedback_process_variable_C2)
-            if self.status_PID_C2 == True:
-                self.updateSpeedC2.emit(self.speed_C2)
-                self.updatePositionSetPointC2.emit(self.position_process_variable_C2)
-            elif self.status_PID_C2 == False:
-                self.updateFeedbackSetPointC2.emit(self.feedback_process_variable_C2) 
+    def publishControlPanel(self):
+        """Publish a snapshot of both control channels for the control panel in a single signal."""
+        snapshot = np.zeros(2, dtype=controlPanelType)
+        snapshot[0] = (self.jog_C1, self.feedback_index_C1 != 0, self.status_PID_C1, self.position_process_variable_C1, self.feedback_process_variable_C1, self.speed_C1)
+        snapshot[1] = (self.jog_C2, self.feedback_index_C2 != 0, self.status_PID_C2, self.position_process_variable_C2, self.feedback_process_variable_C2, self.speed_C2)
+        self.updateControlPanel.emit(self.name, snapshot)
     
     @Slot(str, float)
     def move_to_position_C1(self, position):
@@ -1022,7 +1029,7 @@ class Device(QObject):
     def set_direction_C1(self, direction):
         """Set motor direction on control channel C1."""
         try:
-            self.handle = ljm.open(7, self.connection, self.id)
+            self.open_handle()
             if direction == 1:
                 ljm.eWriteName(self.handle, "EIO1", 0)
             elif direction == -1:
@@ -1037,7 +1044,7 @@ class Device(QObject):
     def set_direction_C2(self, direction):
         """Set motor direction on control channel C2."""
         try:
-            self.handle = ljm.open(7, self.connection, self.id)
+            self.open_handle()
             if direction == 1:
                 ljm.eWriteName(self.handle, "EIO3", 0)
             elif direction == -1:
@@ -1049,23 +1056,12 @@ class Device(QObject):
             e = sys.exc_info()[1]
             log.warning(e)
 
-    def read_pulses_C1(self):
-        """Read pulses for control channel C1."""
+    def get_position(self, axis):
+        """Method to read the pulse counter of one axis and update its position."""
         try:
-            self.handle = ljm.open(7, self.connection, self.id)
-            self.pulses_C1 = ljm.eReadName(self.handle, "DIO1_EF_READ_A")
-        except ljm.LJMError:
-            ljme = sys.exc_info()[1]
-            log.warning(ljme) 
-        except Exception:
-            e = sys.exc_info()[1]
-            log.warning(e)
-
-    def read_pulses_C2(self):
-        """Read pulses for control channel C2."""
-        try:
-            self.handle = ljm.open(7, self.connection, self.id)
-            self.pulses_C2 = ljm.eReadName(self.handle, "DIO3_EF_READ_A")
+            self.open_handle()
+            mask = np.arange(self.axes.count) == axis
+            self.axes.update_positions([ljm.eReadName(self.handle, self.axisRegisters["pulses"][axis])], mask)
         except ljm.LJMError:
             ljme = sys.exc_info()[1]
             log.warning(ljme) 
@@ -1075,79 +1071,17 @@ class Device(QObject):
 
     def get_position_C1(self):
         """Get position of control channel C1."""
-        # Read pulses.
-        self.read_pulses_C1()    
+        self.get_position(0)
 
-        # Check motor status by comparing pulses count output with pulses returned.
-        if self.pulses_C1 == 0:
-            incrementPulses = 0
-        else:
-            incrementPulses = (self.pulses_C1-self.previous_pulses_C1)/self.pulses_per_unit_C1
-        self.previous_pulses_C1 = self.pulses_C1
-
-        # Increment position process variable.
-        if self.direction_C1 == 1:
-            self.position_process_variable_C1 += incrementPulses
-        elif self.direction_C1 == -1:
-            self.position_process_variable_C1 -= incrementPulses
-
-    def check_position_C1(self):
-        """Check position for control channel C1."""
-        # If moving under jog or PID control, stop if at limit.
-        if self.jog_C1 == True or self.status_PID_C1 == True:
-            if self.direction_C1 == -1 and self.position_process_variable_C1 < self.position_left_limit_C1:
-                self.turn_off_PWM_C1()
-                self.jog_C1 = False
-                sleep(0.1)
-                self.get_position_C1()
-                self.updatePositionSetPointC1.emit(self.position_process_variable_C1)
-            elif self.direction_C1 == 1 and self.position_process_variable_C1 > self.position_right_limit_C1:
-                self.turn_off_PWM_C1()
-                self.jog_C1 = False
-                sleep(0.1)
-                self.get_position_C1()
-                self.updatePositionSetPointC1.emit(self.position_process_variable_C1)
-        
     def get_position_C2(self):
         """Get position of control channel C2."""
-        # Read pulses.
-        self.read_pulses_C2()
-
-        # Check motor status by comparing pulses count output with pulses returned.
-        if self.pulses_C2 == 0:
-            incrementPulses = 0
-        else:
-            incrementPulses = (self.pulses_C2-self.previous_pulses_C2)/self.pulses_per_unit_C2
-        self.previous_pulses_C2 = self.pulses_C2
-
-        # Increment position process variable.
-        if self.direction_C2 == 1:
-            self.position_process_variable_C2 += incrementPulses
-        elif self.direction_C2 == -1:
-            self.position_process_variable_C2 -= incrementPulses
-    
-    def check_position_C2(self):
-        """Check position for control channel C2."""
-        # If moving under jog or PID control, stop if at limit.
-        if self.jog_C2 == True or self.status_PID_C2 == True:
-            if self.direction_C2 == -1 and self.position_process_variable_C2 < self.position_left_limit_C2:
-                self.turn_off_PWM_C2()
-                self.jog_C2 = False
-                sleep(0.1)
-                self.get_position_C2()
-                self.updatePositionSetPointC2.emit(self.position_process_variable_C2)
-            elif self.direction_C2 == 1 and self.position_process_variable_C2 > self.position_right_limit_C2:
-                self.turn_off_PWM_C2()
-                self.jog_C2 = False
-                sleep(0.1)
-                self.get_position_C2()
-                self.updatePositionSetPointC2.emit(self.position_process_variable_C2)
+        self.get_position(1)
 
     def configure_pulse_counters(self):
         """Setup pulse counters. Set to mode 2 which counts both rising and falling edges. 
         400 microsecond debounce period, which is just less than the time between rising and
         falling edges for 16 PPR at 4000 RPM."""
-        self.handle = ljm.open(7, self.connection, self.id)
+        self.open_handle()
         aNamesC1 = ["DIO1_EF_ENABLE", "DIO1_EF_INDEX", "DIO1_EF_CONFIG_A", "DIO1_EF_CONFIG_B", "DIO1_EF_ENABLE"]
         aNamesC2 = ["DIO3_EF_ENABLE", "DIO3_EF_INDEX", "DIO3_EF_CONFIG_A", "DIO3_EF_CONFIG_B", "DIO3_EF_ENABLE"]
         aValues = [0, 9, 400, 2, 1]
@@ -1159,12 +1093,33 @@ class Device(QObject):
 
     def configure_ADC(self):
         """Set the ADC settings."""
-        self.handle = ljm.open(7, self.connection, self.id)
+        self.open_handle()
         names = ["AIN_ALL_RANGE", "AIN_ALL_RESOLUTION_INDEX", "AIN_ALL_SETTLING_US"]
         aValues = [10, 2, 0] # No amplification; 16.5 effective bits; auto settling time.
         numFrames = len(names)
         ljm.eWriteNames(self.handle, numFrames, names, aValues) 
 
+    def configure_axis_registers(self):
+        """Method to look up the addresses of the axis registers and core timer read every tick."""
+        self.axisAddresses = []
+        self.axisDataTypes = []
+        for register in self.axisReads:
+            for name in self.axisRegisters[register][:self.axes.count]:
+                address, dataType = ljm.nameToAddress(name)
+                self.axisAddresses.append(address)
+                self.axisDataTypes.append(dataType)
+        address, dataType = ljm.nameToAddress("CORE_TIMER")
+        self.timerAddresses = [address]
+        self.timerDataTypes = [dataType]
+
+    def sample_time(self, ticks):
+        """Method to convert a CORE_TIMER reading to seconds, unwrapping the 32 bit 40 MHz counter."""
+        ticks = int(ticks)
+        if self.lastCoreTimer != None:
+            self.coreTime += ((ticks - self.lastCoreTimer) % 2**32)/40e6
+        self.lastCoreTimer = ticks
+        return self.coreTime
+
     def set_acquisition_variables(self, channels, addresses, dataTypes, slopes, offsets, autozero, controlRate):
         """Set the acquisition variables."""
         self.channels = channels
@@ -1179,7 +1134,7 @@ class Device(QObject):
     def open_connection(self):
         """Method to open a device connection."""
         try:
-            self.handle = ljm.open(7, self.connection, self.id)
+            self.open_handle()
             log.info("Connected to {name}.".format(name=self.name))
         except ljm.LJMError:
             ljme = sys.exc_info()[1]
@@ -1188,6 +1143,12 @@ class Device(QObject):
             e = sys.exc_info()[1]
             log.warning(e)
 
+    def open_handle(self):
+        """Method to open the device by serial number, unless a handle is already open, such as one handed over by the manager."""
+        if self.handle == None:
+            self.handle = ljm.open(7, self.connection, self.id)
+        return self.handle
+
     def close_connection(self):
         """Method to close the device connection."""
         try:
@@ -1277,25 +1238,51 @@ class Device(QObject):
             e = sys.exc_info()[1]
             log.warning(e)
 
-    def update_PID_C1(self):
-        """Update PID on control channel C1."""
-        self.feedback_process_variable_C1 = self.current_data[self.feedback_index_C1-1]
-        if self.status_PID_C1 == True:
-            self.speedSetPointC1 = self.PID_C1(self.feedback_process_variable_C1)
-            self.direction_C1 = np.sign(self.speedSetPointC1)
-            demandSpeed = np.abs(self.speedSetPointC1)
-            self.set_direction_C1(self.direction_C1)
-            self.set_speed_C1(demandSpeed)
-
-    def update_PID_C2(self):
-        """Update PID on control channel C2."""
-        self.feedback_process_variable_C2 = self.current_data[self.feedback_index_C2-1]
-        if self.status_PID_C2 == True:
-            self.speedSetPointC2 = self.PID_C2(self.feedback_process_variable_C2)
-            self.direction_C2 = np.sign(self.speedSetPointC2)
-            demandSpeed = np.abs(self.speedSetPointC2)
-            self.set_direction_C2(self.direction_C2)
-            self.set_speed_C2(demandSpeed)
+    def update_axes(self, pulses, minimum, maximum, output, enabled, timestamp, writes):
+        """Method to update positions, limits and PID outputs for all enabled axes in one step."""
+        axes = self.axes
+        axes.update_positions(pulses[enabled], enabled)
+
+        # Feedback process variables from the acquired channels.
+        feedback = enabled & axes.feedback & (axes.feedbackIndex > 0)
+        if self.current_data.size > 0:
+            axes.feedbackProcessVariable[feedback] = self.current_data[axes.feedbackIndex[feedback]-1]
+
+        # Limits.
+        stop = self.limit_axes(minimum, maximum, output, enabled, writes)
+
+        # PID control.
+        control = feedback & axes.PID & ~stop
+        if control.any():
+            self.update_PID(control, timestamp, writes)
+
+    def update_PID(self, control, timestamp, writes):
+        """Method to update the PID controlled axes and collect their direction and clock writes."""
+        axes = self.axes
+        axisIndices = np.flatnonzero(control)
+        speedSetPoints = self.controller(axes.feedbackProcessVariable, timestamp, control)
+        # The terms are only reported for debugging, at most once per interval, as every tick would flood the log.
+        if self.PIDLogInterval > 0 and log.isEnabledFor(logging.DEBUG) and monotonic() >= self.nextPIDLog:
+            self.nextPIDLog = monotonic() + self.PIDLogInterval
+            self.updatePIDTerms.emit(self.name, self.controller.terms.copy())
+        direction = np.sign(speedSetPoints)
+        freq, roll = clock_settings((np.abs(speedSetPoints)*axes.countsPerUnit[axisIndices]).astype(int))
+        axes.direction[axisIndices] = direction
+        axes.speed[axisIndices] = freq/axes.countsPerUnit[axisIndices]
+        for i, axis in enumerate(axisIndices):
+            channel = "C" + str(axis+1)
+            setattr(self, "speedSetPoint" + channel, speedSetPoints[i])
+            setattr(self, "freq" + channel, freq[i])
+            setattr(self, "roll" + channel, roll[i])
+            if direction[i] != 0:
+                writes.append((self.axisRegisters["direction"][axis], int(direction[i] == -1)))
+            writes += self.clock_writes(self.axisRegisters["clock"][axis], roll[i])
+
+    def write_registers(self, writes):
+        """Method to write a list of (name, value) register writes in a single call."""
+        if len(writes) > 0:
+            aNames, aValues = zip(*writes)
+            ljm.eWriteNames(self.handle, len(writes), list(aNames), list(aValues))
 
     def send_data(self):
         """Send output data."""
@@ -1320,38 +1307,181 @@ class Device(QObject):
             else:
                 self.current_data = np.concatenate((self.current_data, self.data_C2))
         self.data = self.current_data
-        # Emit data signal.
-        self.emitData.emit(self.name, np.atleast_2d(self.data))    
+        # Emit data signal, prefixed with the device and host timestamps of the sample.
+        if self.streaming == True:
+            block = self.stream_block()
+        else:
+            block = np.atleast_2d(np.concatenate(([self.sampleTime, self.hostTime], self.data)))
+        if block.shape[0] > 0:
+            self.emitData.emit(self.name, block)
+
+    def stream_block(self):
+        """Method to build a data block with a row per streamed scan, timed by scan index from the shared trigger."""
+        n = self.scans.shape[0]
+        index = self.scanIndex - n + np.arange(n)
+        scanTime = index/self.scanRate
+        # Scans still waiting in the buffers were taken after the latest scan read, so the scans read are dated back from the host time.
+        hostTime = self.hostTime - (n - 1 + self.scanBacklog - np.arange(n))/self.scanRate
+        analog = self.slopes*(self.scans[:,:self.numFrames] - self.offsets)
+        controls = np.tile(self.data[self.numFrames:], (n, 1))
+        return np.column_stack((scanTime, hostTime, analog, controls))
+
+    def is_networked(self):
+        """Method to check whether the device is connected over Ethernet or WiFi."""
+        return int(self.connection) in [ljm.constants.ctTCP, ljm.constants.ctETHERNET, ljm.constants.ctWIFI]
+
+    def start_stream(self, scanRate, triggered=True, master=False):
+        """Method to start a stream of the analog inputs, armed to start on the first edge of the shared trigger line if triggered, with the master also holding the trigger output low."""
+        try:
+            self.open_handle()
+            # Return whole reads only and do not block when no scans are waiting.
+            ljm.writeLibraryConfigS(ljm.constants.STREAM_SCANS_RETURN, ljm.constants.STREAM_SCANS_RETURN_ALL_OR_NONE)
+            ljm.writeLibraryConfigS(ljm.constants.STREAM_RECEIVE_TIMEOUT_MS, 0)
+            aNames = ["STREAM_BUFFER_SIZE_BYTES", "STREAM_CLOCK_SOURCE", "STREAM_SETTLING_US", "STREAM_RESOLUTION_INDEX"]
+            aValues = [self.streamBufferBytes, 0, 0, 0] # Internal clock; auto settling and resolution.
+            if triggered == True:
+                trigger = ljm.nameToAddress(self.triggerInput)[0]
+                aNames += ["STREAM_TRIGGER_INDEX", self.triggerInput + "_EF_ENABLE", self.triggerInput + "_EF_INDEX", self.triggerInput + "_EF_ENABLE"]
+                aValues += [trigger, 0, 5, 1] # Trigger on either edge.
+                if master == True:
+                    # Only the master drives the shared line; the others leave their trigger output untouched.
+                    aNames += [self.triggerOutput]
+                    aValues += [0]
+            else:
+                aNames += ["STREAM_TRIGGER_INDEX"]
+                aValues += [0]
+            ljm.eWriteNames(self.handle, len(aNames), aNames, aValues)
+            # The core timer is read once here; while streaming, the device time follows from the scan count.
+            self.streamStartTime = self.sample_time(ljm.eReadName(self.handle, "CORE_TIMER"))
+            # A stream needs at least one channel, so stream AIN0 and discard it if no channels are acquired.
+            scanList = self.addresses if self.numFrames > 0 else [0]
+            self.scansPerRead = 1
+            self.scanRate = ljm.eStreamStart(self.handle, self.scansPerRead, len(scanList), scanList, scanRate)
+            self.scanIndex = 0
+            self.scans = np.empty((0, len(scanList)))
+            self.scanBacklog = 0
+            self.streaming = True
+            if triggered == True:
+                log.info("Stream armed on {device} at {rate:.1f} Hz waiting for trigger on {trigger}.".format(device=self.name, rate=self.scanRate, trigger=self.triggerInput))
+            else:
+                log.info("Buffered stream started on {device} at {rate:.1f} Hz.".format(device=self.name, rate=self.scanRate))
+        except ljm.LJMError:
+            ljme = sys.exc_info()[1]
+            log.warning(ljme) 
+        except Exception:
+            e = sys.exc_info()[1]
+            log.warning(e)
+
+    def fire_trigger(self):
+        """Method to drive a rising edge on the trigger output to start all armed streams together."""
+        try:
+            self.open_handle()
+            ljm.eWriteNames(self.handle, 2, [self.triggerOutput, self.triggerOutput], [0, 1])
+            log.info("Synchronised acquisition triggered by {device}.".format(device=self.name))
+        except ljm.LJMError:
+            ljme = sys.exc_info()[1]
+            log.warning(ljme) 
+        except Exception:
+            e = sys.exc_info()[1]
+            log.warning(e)
+
+    @Slot()
+    def pulse_camera_trigger(self):
+        """Method to pulse the camera trigger output, giving every camera wired to it a rising edge."""
+        try:
+            # Signalled by the capture coordinator, so the pulse is written on this device's thread with its open handle.
+            if self.handle == None:
+                log.warning("Camera trigger not pulsed as {device} is not open.".format(device=self.name))
+                return
+            ljm.eWriteNames(self.handle, 2, [self.cameraTriggerOutput, self.cameraTriggerOutput], [1, 0])
+        except ljm.LJMError:
+            ljme = sys.exc_info()[1]
+            log.warning(ljme) 
+        except Exception:
+            e = sys.exc_info()[1]
+            log.warning(e)
+
+    def read_stream(self):
+        """Method to read all scans waiting in the stream buffers and report the device buffer fill level."""
+        numChannels = max(self.numFrames, 1)
+        reads = []
+        while True:
+            try:
+                aData, deviceScanBacklog, ljmScanBacklog = ljm.eStreamRead(self.handle)
+                reads.append(aData)
+                self.scanBacklog = deviceScanBacklog + ljmScanBacklog
+                bufferLevel = 100*deviceScanBacklog*numChannels*2/self.streamBufferBytes # Two bytes per sample.
+                if round(bufferLevel) != round(self.bufferLevel):
+                    self.updateBufferLevel.emit(self.name, bufferLevel)
+                self.bufferLevel = bufferLevel
+            except ljm.LJMError:
+                ljme = sys.exc_info()[1]
+                if ljme.errorCode == ljm.errorcodes.NO_SCANS_RETURNED:
+                    self.scanBacklog = 0
+                    break
+                raise
+        self.scans = np.asarray(reads, dtype=float).reshape(-1, numChannels)
+        self.scanIndex += self.scans.shape[0]
+
+    def stop_stream(self):
+        """Method to stop the stream and clear the stream trigger."""
+        try:
+            self.open_handle()
+            self.streaming = False
+            self.bufferLevel = 0.0
+            self.updateBufferLevel.emit(self.name, self.bufferLevel)
+            ljm.eStreamStop(self.handle)
+            # The core timer may have wrapped more than once while streaming, so restart its unwrapping from the stream time.
+            self.coreTime = self.sampleTime
+            self.lastCoreTimer = None
+            ljm.eWriteName(self.handle, "STREAM_TRIGGER_INDEX", 0)
+            log.info("Stream stopped on {device}.".format(device=self.name))
+        except ljm.LJMError:
+            ljme = sys.exc_info()[1]
+            log.warning(ljme) 
+        except Exception:
+            e = sys.exc_info()[1]
+            log.warning(e)
 
     def process(self):
         """Method to process timed commands."""
         try:
-            # Read from the device and apply slope and offsets.
-            self.handle = ljm.open(7, self.connection, self.id)
-            ljm.eWriteName(self.handle, "USER_RAM0_U16", 1) 
-            
-            # Only check limits if any channel is enabled
-            if self.enabled_C1 or self.enabled_C2:
-                self.check_limits()
-                
-            # Read analog inputs if configured
-            if len(self.addresses) > 0:
-                self.raw = np.asarray(ljm.eReadAddresses(self.handle, self.numFrames, self.addresses, self.dataTypes))
+            # Read the analog inputs, the core timer and, if any axis is enabled, the registers of every axis in one call.
+            # The core timer dates the samples on the device clock and the host clock is read straight after as a reference.
+            self.open_handle()
+            enabled = self.axes.enabled.copy()
+            # When streaming, the analog inputs come from the stream and the device time from the scan count instead.
+            numFrames = 0 if self.streaming == True else self.numFrames
+            numTimers = 0 if self.streaming == True else len(self.timerAddresses)
+            addresses = self.addresses[:numFrames] + self.timerAddresses[:numTimers]
+            dataTypes = self.dataTypes[:numFrames] + self.timerDataTypes[:numTimers]
+            if enabled.any():
+                addresses = addresses + self.axisAddresses
+                dataTypes = dataTypes + self.axisDataTypes
+            values = np.asarray(ljm.eReadAddresses(self.handle, len(addresses), addresses, dataTypes)) if len(addresses) > 0 else np.empty(0)
+            self.hostTime = monotonic()
+            if self.streaming == True:
+                self.read_stream()
+                self.sampleTime = self.streamStartTime + max(self.scanIndex - 1, 0)/self.scanRate
+            else:
+                self.sampleTime = self.sample_time(values[numFrames])
+
+            # Apply slope and offsets to the latest sample.
+            if self.streaming == True and self.numFrames > 0 and self.scans.shape[0] > 0:
+                self.raw = self.scans[-1,:self.numFrames]
+                self.current_data = self.slopes*(self.raw - self.offsets)
+            elif self.streaming == False and self.numFrames > 0:
+                self.raw = values[:self.numFrames]
                 self.current_data = self.slopes*(self.raw - self.offsets)
             else: 
                 self.current_data = np.empty(0)
 
-            # Only process enabled channels
-            if self.enabled_C1:
-                self.get_position_C1()
-                self.check_position_C1()
-                if self.status_PID_C1 and self.feedback_C1:
-                    self.update_PID_C1()
-            if self.enabled_C2:
-                self.get_position_C2()
-                self.check_position_C2()
-                if self.status_PID_C2 and self.feedback_C2:
-                    self.update_PID_C2()
+            # Update all enabled axes, then write the failsafe, stop, direction and clock registers together.
+            writes = [("USER_RAM0_U16", 1)]
+            if enabled.any():
+                pulses, minimum, maximum, output = values[numFrames+numTimers:].reshape(len(self.axisReads), self.axes.count)
+                self.update_axes(pulses, minimum.astype(bool), maximum.astype(bool), output, enabled, self.sampleTime, writes)
+            self.write_registers(writes)
 
             # Check sequence only if running
             if self.sequence_running:
@@ -1378,4 +1508,4 @@ class Device(QObject):
         self.updateOffsets.emit(self.name, self.channels, self.offsets.tolist())
         log.info("Autozero applied to device.")
 
-        
+add_axis_properties(Device, len(Device.axisRegisters["clock"]))
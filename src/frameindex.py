@@ -0,0 +1,112 @@
+"""Binary sidecar index mapping saved camera frames to output data rows and timestamps.
+
+Usage: python frameindex.py <index> [--frame N | --sample N | --time T]
+"""
+import argparse
+import logging
+import os
+import numpy as np
+
+log = logging.getLogger(__name__)
+
+# File signature, followed by one fixed size record per frame.
+frameIndexMagic = b"CLFRIDX1"
+
+# Record layout. The sample is the row of the frame counted across all output segments, the time is on the
+# output time base, and the offset is the uncompressed byte offset of the row in its segment.
+frameIndexType = np.dtype([
+    ("frame", "<i8"),
+    ("sample", "<i8"),
+    ("time", "<f8"),
+    ("hostTime", "<f8"),
+    ("deviceTime", "<f8"),
+    ("exposure", "<f8"),
+    ("gain", "<f8"),
+    ("segment", "<i4"),
+    ("offset", "<i8"),
+])
+
+class FrameIndex:
+    """Appends a fixed size binary record for each frame a camera saves, flushing after every block.
+
+    Records are only ever appended, so a reader can open the index while it is still being written, and a
+    record cut short by a crash is dropped when the index is reopened to continue the recording."""
+
+    def __init__(self, filepath, append=False):
+        """FrameIndex init."""
+        self.filepath = filepath
+        self.frames = 0
+        if append == True and os.path.exists(filepath):
+            size = os.path.getsize(filepath)
+            self.frames = max(size - len(frameIndexMagic), 0)//frameIndexType.itemsize
+            self.file = open(filepath, "r+b")
+            self.file.truncate(len(frameIndexMagic) + self.frames*frameIndexType.itemsize)
+            self.file.seek(0, os.SEEK_END)
+        else:
+            self.file = open(filepath, "wb")
+            self.file.write(frameIndexMagic)
+            self.file.flush()
+
+    def write(self, records):
+        """Method to append a structured array of frame records."""
+        if len(records) > 0:
+            self.file.write(np.ascontiguousarray(records, dtype=frameIndexType).tobytes())
+            self.file.flush()
+            self.frames += len(records)
+
+    def close(self):
+        """Method to close the index."""
+        if self.file.closed == False:
+            self.file.close()
+            log.info("Frame index {path} closed with {frames} frames.".format(path=os.path.basename(self.filepath), frames=self.frames))
+
+def read_frame_index(filepath):
+    """Function to memory map a frame index as a structured array, ignoring any record cut short."""
+    with open(filepath, "rb") as file:
+        if file.read(len(frameIndexMagic)) != frameIndexMagic:
+            raise ValueError("{path} is not a CamLab frame index.".format(path=filepath))
+    frames = (os.path.getsize(filepath) - len(frameIndexMagic))//frameIndexType.itemsize
+    if frames == 0:
+        return np.zeros(0, dtype=frameIndexType)
+    return np.memmap(filepath, dtype=frameIndexType, mode="r", offset=len(frameIndexMagic), shape=(frames,))
+
+def find_frame(index, frame):
+    """Function to bisect for the record of a frame number, or None if the frame is not in the index."""
+    position = np.searchsorted(index["frame"], frame, side="left")
+    if position < len(index) and index["frame"][position] == frame:
+        return index[position]
+    return None
+
+def find_sample(index, sample):
+    """Function to bisect for the record of the latest frame at or before an output row, or None if there is none."""
+    position = np.searchsorted(index["sample"], sample, side="right") - 1
+    return index[position] if position >= 0 else None
+
+def find_time(index, time):
+    """Function to bisect for the record of the latest frame at or before a time on the output time base, or None if there is none."""
+    position = np.searchsorted(index["time"], time, side="right") - 1
+    return index[position] if position >= 0 else None
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    parser = argparse.ArgumentParser(description="Look up frames in a CamLab frame index.")
+    parser.add_argument("index", help="frame index (<file>_<camera>_frames.bin)")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--frame", type=int, default=None, help="frame number")
+    group.add_argument("--sample", type=int, default=None, help="output row counted across all segments")
+    group.add_argument("--time", type=float, default=None, help="time on the output time base")
+    args = parser.parse_args()
+    index = read_frame_index(args.index)
+    if args.frame == None and args.sample == None and args.time == None:
+        log.info("{path} indexes {frames} frames.".format(path=args.index, frames=len(index)))
+    else:
+        if args.frame != None:
+            record = find_frame(index, args.frame)
+        elif args.sample != None:
+            record = find_sample(index, args.sample)
+        else:
+            record = find_time(index, args.time)
+        if record is None:
+            log.info("No frame found.")
+        else:
+            log.info(", ".join("{name}: {value}".format(name=name, value=record[name]) for name in frameIndexType.names))
@@ -0,0 +1,154 @@
+from PySide6.QtCore import QObject, Signal
+import logging
+import numpy as np
+import os
+import queue
+import sys
+import threading
+import time
+from lazy import lazy_import
+
+Image = lazy_import("PIL.Image")
+
+log = logging.getLogger(__name__)
+
+# File extension for each encoder.
+imageExtensions = {"jpeg": ".jpg", "png": ".png", "tiff": ".tiff", "npy": ".npy"}
+
+def write_image(filepath, image, encoder="jpeg", quality=90):
+    """Function to encode and save an image, returning the bytes written."""
+    if encoder == "npy":
+        np.save(filepath, image)
+    elif encoder == "jpeg":
+        Image.fromarray(image).save(filepath, "JPEG", quality=quality)
+    elif encoder == "png":
+        Image.fromarray(image).save(filepath, "PNG", compress_level=1)
+    elif encoder == "tiff":
+        Image.fromarray(image).save(filepath, "TIFF")
+    return os.path.getsize(filepath)
+
+class ImageWriter(QObject):
+    """Pool of worker threads that encode and save camera frames from a bounded queue.
+
+    Frames are dropped rather than queued once the queue is full, so a slow disk or encoder can
+    never stall the thread that submits them. PIL and numpy release the GIL while encoding and
+    writing, so threads are enough to spread the work over several cores."""
+    statisticsChanged = Signal(dict)
+
+    def __init__(self, workers=2, size=32, encoder="jpeg", quality=90, reportInterval=10):
+        """ImageWriter init."""
+        super().__init__()
+        self.workers = []
+        self.queue = None
+        self.lock = threading.Lock()
+        self.reportInterval = reportInterval
+        self.configure(workers, size, encoder, quality)
+
+    def configure(self, workers=2, size=32, encoder="jpeg", quality=90):
+        """Method to set the encoder and restart the pool with the given number of workers and queue size."""
+        if encoder not in imageExtensions:
+            log.warning("Unknown image encoder " + str(encoder) + ", using JPEG.")
+            encoder = "jpeg"
+        self.stop()
+        self.encoder = encoder
+        self.quality = int(quality)
+        self.queue = queue.Queue(maxsize=int(size))
+        self.reset_statistics()
+        self.workers = [threading.Thread(target=self.work, name="ImageWriter-" + str(i), daemon=True) for i in range(int(workers))]
+        for worker in self.workers:
+            worker.start()
+        log.info("Image writer started with {workers} workers, a queue of {size} frames and the {encoder} encoder.".format(workers=len(self.workers), size=size, encoder=encoder))
+
+    def reset_statistics(self):
+        """Method to reset the frame counters."""
+        with self.lock:
+            self.submitted = 0
+            self.written = 0
+            self.dropped = 0
+            self.failed = 0
+            self.bytes = 0
+            self.encodeTime = 0.0
+            self.start = time.monotonic()
+            self.lastReport = self.start
+
+    def submit(self, filepath, image):
+        """Method to queue a frame for saving, returning False if the queue is full and the frame is dropped."""
+        filepath = os.path.splitext(filepath)[0] + imageExtensions[self.encoder]
+        try:
+            self.queue.put_nowait((filepath, image))
+            with self.lock:
+                self.submitted += 1
+            return True
+        except queue.Full:
+            with self.lock:
+                self.dropped += 1
+            log.warning("Image writer queue full, frame dropped.")
+            return False
+
+    def encode(self, filepath, image):
+        """Method to encode and save a frame with the configured encoder, returning the bytes written."""
+        return write_image(filepath, image, self.encoder, self.quality)
+
+    def work(self):
+        """Worker loop that saves frames until it receives None."""
+        while True:
+            item = self.queue.get()
+            if item == None:
+                self.queue.task_done()
+                return
+            filepath, image = item
+            try:
+                start = time.perf_counter()
+                size = self.encode(filepath, image)
+                with self.lock:
+                    self.written += 1
+                    self.bytes += size
+                    self.encodeTime += time.perf_counter() - start
+            except Exception:
+                e = sys.exc_info()[1]
+                with self.lock:
+                    self.failed += 1
+                log.warning(e)
+            finally:
+                self.queue.task_done()
+            self.report(interval=self.reportInterval)
+
+    def statistics(self):
+        """Method to get the frame counters and measured throughput."""
+        with self.lock:
+            elapsed = max(time.monotonic() - self.start, 1e-9)
+            return {
+                "queued": self.queue.qsize(),
+                "submitted": self.submitted,
+                "written": self.written,
+                "dropped": self.dropped,
+                "failed": self.failed,
+                "framesPerSecond": self.written/elapsed,
+                "megabytesPerSecond": self.bytes/elapsed/1e6,
+                "encodeTime": self.encodeTime/self.written if self.written > 0 else 0.0,
+            }
+
+    def report(self, interval=0):
+        """Method to log and emit the statistics if at least interval seconds have passed since the last report."""
+        now = time.monotonic()
+        with self.lock:
+            if now - self.lastReport < interval:
+                return
+            self.lastReport = now
+        statistics = self.statistics()
+        log.info("Image writer: {written} written, {queued} queued, {dropped} dropped, {framesPerSecond:.1f} frames/s, {megabytesPerSecond:.1f} MB/s, {encodeTime:.3f} s per frame.".format(**statistics))
+        self.statisticsChanged.emit(statistics)
+
+    def flush(self):
+        """Method to wait until every queued frame has been saved."""
+        if self.queue != None:
+            self.queue.join()
+
+    def stop(self):
+        """Method to save the queued frames and stop the workers."""
+        if self.queue != None:
+            for worker in self.workers:
+                self.queue.put(None)
+            for worker in self.workers:
+                worker.join()
+        self.workers = []
@@ -0,0 +1,74 @@
+import builtins
+import importlib
+import logging
+import sys
+import time
+import types
+
+log = logging.getLogger(__name__)
+
+class LazyModule(types.ModuleType):
+    """Module proxy that defers the import until the first attribute access."""
+
+    def __init__(self, name):
+        super().__init__(name)
+        self.__dict__["_module"] = None
+
+    def _load(self):
+        """Method to import the module on first use."""
+        module = self.__dict__["_module"]
+        if module is None:
+            start = time.perf_counter()
+            module = importlib.import_module(self.__name__)
+            self.__dict__["_module"] = module
+            log.info("Imported {name} on first use in {time:.3f} s.".format(name=self.__name__, time=time.perf_counter()-start))
+        return module
+
+    def __getattr__(self, attribute):
+        return getattr(self._load(), attribute)
+
+    def __dir__(self):
+        return dir(self._load())
+
+def lazy_import(name):
+    """Return a proxy for a module that is imported the first time it is used."""
+    if name in sys.modules:
+        return sys.modules[name]
+    return LazyModule(name)
+
+class ImportProfiler:
+    """Records the cumulative time spent importing each module during startup."""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.times = {}
+        self._import = None
+
+    def install(self):
+        """Method to start timing imports."""
+        self._import = builtins.__import__
+        builtins.__import__ = self.profile
+
+    def uninstall(self):
+        """Method to stop timing imports."""
+        if self._import is not None:
+            builtins.__import__ = self._import
+            self._import = None
+
+    def profile(self, name, globals=None, locals=None, fromlist=(), level=0):
+        """Replacement for __import__ that times the first import of each absolute module."""
+        if level != 0 or name in sys.modules:
+            return self._import(name, globals, locals, fromlist, level)
+        start = time.perf_counter()
+        try:
+            return self._import(name, globals, locals, fromlist, level)
+        finally:
+            self.times.setdefault(name, time.perf_counter()-start)
+
+    def report(self, count=25):
+        """Method to log the slowest imports and the time since the profiler was created."""
+        self.uninstall()
+        log.info("Startup profile: {time:.3f} s to first window.".format(time=time.perf_counter()-self.start))
+        ranked = sorted(self.times.items(), key=lambda item: item[1], reverse=True)
+        for name, duration in ranked[:count]:
+            log.info("Startup profile: {time:8.3f} s cumulative import of {name}.".format(time=duration, name=name))
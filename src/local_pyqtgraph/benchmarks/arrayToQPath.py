@@ -28,3 +28,18 @@ class TimeSuiteWithNonFinite(_TimeSuite):
     def __init__(self):
         super().__init__()
         self.have_nonfinite = True
+
+class TimeSuiteKnownFinite:
+    # Curves whose finiteness is tracked by the caller, e.g. CamLab plot
+    # windows, can take the 'all' path without a finite check.
+    params = ([100_000], ['finite', 'known_finite'])
+
+    def setup(self, nelems, connect):
+        self.xdata = np.arange(nelems, dtype=np.float64)
+        self.ydata = rng.standard_normal(nelems, dtype=np.float64)
+
+    def time_test(self, nelems, connect):
+        if connect == 'known_finite':
+            pg.arrayToQPath(self.xdata, self.ydata, connect='all', finiteCheck=False)
+        else:
+            pg.arrayToQPath(self.xdata, self.ydata, connect='finite')
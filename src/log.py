@@ -1,30 +1,85 @@
 import logging
+import logging.handlers
 import colorlog
 import os
-import sys
 import platform
+import queue
+import time
+import atexit
 
-def init_log():
+class RateLimitedQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler that passes the first record for each message key per window and counts the repeats."""
+
+    def __init__(self, queue, window=5.0):
+        super().__init__(queue)
+        self.window = window
+        self.seen = {}
+        self.lastSweep = time.monotonic()
+
+    def key(self, record):
+        """Method to get the rate limiting key for a record, using the LJM error string where there is one."""
+        text = getattr(record.msg, "errorString", None)
+        if not text:
+            text = record.getMessage()
+        return (record.name, record.levelno, text)
+
+    def summary(self, key, entry):
+        """Method to build a record that reports how many repeats of a message were suppressed."""
+        summary = logging.makeLogRecord(entry["record"].__dict__)
+        summary.msg = "{text} ×{count} in {window:.0f} s".format(text=key[2], count=entry["count"], window=self.window)
+        summary.args = None
+        summary.exc_info = None
+        summary.exc_text = None
+        summary.created = time.time()
+        summary.msecs = (summary.created - int(summary.created))*1000
+        return summary
+
+    def sweep(self, now):
+        """Method to release summaries for windows that have expired."""
+        for key, entry in list(self.seen.items()):
+            if now - entry["start"] >= self.window:
+                del self.seen[key]
+                if entry["count"] > 0:
+                    super().emit(self.summary(key, entry))
+        self.lastSweep = now
+
+    def emit(self, record):
+        now = time.monotonic()
+        if now - self.lastSweep >= 1.0:
+            self.sweep(now)
+        key = self.key(record)
+        entry = self.seen.get(key)
+        if entry != None:
+            if now - entry["start"] < self.window:
+                entry["count"] += 1
+                return
+            del self.seen[key]
+            if entry["count"] > 0:
+                super().emit(self.summary(key, entry))
+        self.seen[key] = {"start": now, "count": 0, "record": record}
+        super().emit(record)
+
+    def flush(self):
+        """Method to release all outstanding summaries."""
+        self.acquire()
+        try:
+            self.sweep(float("inf"))
+        finally:
+            self.release()
+
+def init_log(maxBytes=5*1024*1024, backupCount=5):
     """Function to initialise the log file."""
     # Get platform and define destination for the logging file.
     operating_system = platform.system()
     home_dir = os.path.expanduser( '~' )
     if operating_system == "Windows":
         log_dir = os.path.abspath(os.path.join(home_dir,"AppData/CamLab"))
-        isdir = os.path.isdir(log_dir) 
-        if isdir == False:
-            os.mkdir(log_dir)
-        log_file = os.path.abspath(os.path.join(home_dir,"AppData/CamLab/CamLab.log"))
-    elif operating_system == "Linux":
+    else:
         log_dir = os.path.abspath(os.path.join(home_dir,".camlab"))
-        isdir = os.path.isdir(log_dir) 
-        if isdir == False:
-            os.mkdir(log_dir)
-        log_file = os.path.abspath(os.path.join(home_dir,".camlab/CamLab.log"))
-
-    # Delete log file if already in existence.
-    if os.path.exists(log_file):
-        os.remove(log_file)
+    isdir = os.path.isdir(log_dir)
+    if isdir == False:
+        os.mkdir(log_dir)
+    log_file = os.path.abspath(os.path.join(log_dir,"CamLab.log"))
 
     # Log settings.
     log_format = (
@@ -40,24 +95,28 @@ def init_log():
         '%(log_color)s '
         f'{log_format}'
     )
-    colorlog.basicConfig(format=colorlog_format)
-    log = logging.getLogger(__name__)
 
-    logging.basicConfig(
-        pathname=log_file,
-        format="%(asctime)s | %(funcName)s | %(levelname)s: %(message)s",
-        level=logging.DEBUG
-    )
-
-    # Output full log.
-    fh = logging.FileHandler(log_file)
+    # Output full log, rotating by size rather than deleting the previous log on start.
+    fh = logging.handlers.RotatingFileHandler(log_file, maxBytes=maxBytes, backupCount=backupCount, encoding="utf-8")
     fh.setLevel(logging.DEBUG)
-    formatter = logging.Formatter(log_format)
-    fh.setFormatter(formatter)
-    ch = logging.StreamHandler(sys.stdout)
-    ch.setLevel(1)
+    fh.setFormatter(logging.Formatter(log_format))
+    if os.path.getsize(log_file) > 0:
+        fh.doRollover()
+    ch = colorlog.StreamHandler()
+    ch.setFormatter(colorlog.ColoredFormatter(colorlog_format))
+
+    # Records are queued by the calling thread and written by a listener thread so logging cannot stall the control loop.
+    log_queue = queue.SimpleQueue()
+    qh = RateLimitedQueueHandler(log_queue)
+    listener = logging.handlers.QueueListener(log_queue, fh, ch, respect_handler_level=True)
     root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
     root.setLevel(logging.DEBUG)
-    root.addHandler(fh)
+    root.addHandler(qh)
+    listener.start()
 
-    return
\ No newline at end of file
+    # Stop the listener on exit after releasing any outstanding summaries.
+    atexit.register(listener.stop)
+    atexit.register(qh.flush)
+    return listener
@@ -3,9 +3,18 @@ from PySide6.QtWidgets import QApplication
 from PySide6.QtGui import QIcon
 from PySide6.QtCore import QSize
 from log import init_log
-from widgets.MainWindow import MainWindow
+from lazy import ImportProfiler
 import logging
 
+# Run with --profile-startup to log the time taken by each import and to the first window.
+profiler = None
+if "--profile-startup" in sys.argv:
+    sys.argv.remove("--profile-startup")
+    profiler = ImportProfiler()
+    profiler.install()
+
+from widgets.MainWindow import MainWindow
+
 if __name__ == '__main__':
     # Create log file instance.
     init_log()
@@ -27,6 +36,9 @@ if __name__ == '__main__':
     main = MainWindow()
     main.show()
     main.set_theme()
+    if profiler != None:
+        app.processEvents()
+        profiler.report()
     log.info("Timer instantiated.")
     sys.exit(app.exec())
 
@@ -4,14 +4,26 @@ from device import Device
 from assembly import Assembly
 from timing import Timing
 from camera import Camera
-from press import Press
+from capture import CaptureCoordinator
+from press import Press, pollChannels
+from replay import Replay
+from datafile import DataFile
+from notifier import ConfigurationNotifier
+from triscan import TriScan, TriScanError
+from textformatter import defaultWidth, defaultPrecision
 from ruamel.yaml import YAML
 from labjack import ljm
-import os, sys, re, serial, time, copy, logging
+import os, sys, re, time, copy, logging, glob, json, threading
 from datetime import datetime
-import local_gxipy as gx
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED, TimeoutError as FutureTimeoutError
+from functools import partial
+from lazy import lazy_import
 from serial.tools import list_ports
 
+# The Galaxy SDK is loaded on first use rather than at startup.
+gx = lazy_import("local_gxipy")
+
 log = logging.getLogger(__name__)
 
 class Manager(QObject):
@@ -27,6 +39,7 @@ class Manager(QObject):
     existingPlotsFound = Signal()
     outputText = Signal(str)
     finishedRefreshingDevices = Signal()
+    bufferLevelChanged = Signal(str, float)
 
     def __init__(self):
         super().__init__()
@@ -39,18 +52,21 @@ class Manager(QObject):
         self.deviceThreads = {}
         self.refreshing = False
         self.deviceList = []
+        self.resumeJournal = None
+        # Seconds each discovery probe may take before it is abandoned.
+        self.discoveryTimeouts = {"USB": 5, "TCP": 10, "Galaxy": 5, "TriScan": 1, "Reconnect": 5, "Abandon": 2}
         self.j, self.k = 0, 4
         
         # Defaults.
         self.defaultAcquisitionTable = [
-            {"channel": "AIN0", "name": "Ch_1", "unit": "V", "slope": 1.0, "offset": 0.00, "connect": False, "autozero": True},
-            {"channel": "AIN1", "name": "Ch_2", "unit": "V", "slope": 1.0, "offset": 0.00, "connect": False, "autozero": True},
-            {"channel": "AIN2", "name": "Ch_3", "unit": "V", "slope": 1.0, "offset": 0.00, "connect": False, "autozero": True},
-            {"channel": "AIN3", "name": "Ch_4", "unit": "V", "slope": 1.0, "offset": 0.00, "connect": False, "autozero": True},
-            {"channel": "AIN4", "name": "Ch_5", "unit": "V", "slope": 1.0, "offset": 0.00, "connect": False, "autozero": True},
-            {"channel": "AIN5", "name": "Ch_6", "unit": "V", "slope": 1.0, "offset": 0.00, "connect": False, "autozero": True},
-            {"channel": "AIN6", "name": "Ch_7", "unit": "V", "slope": 1.0, "offset": 0.00, "connect": False, "autozero": True},
-            {"channel": "AIN7", "name": "Ch_8", "unit": "V", "slope": 1.0, "offset": 0.00, "connect": False, "autozero": True},
+            {"channel": "AIN0", "name": "Ch_1", "unit": "V", "slope": 1.0, "offset": 0.00, "connect": False, "autozero": True, "width": defaultWidth, "precision": defaultPrecision},
+            {"channel": "AIN1", "name": "Ch_2", "unit": "V", "slope": 1.0, "offset": 0.00, "connect": False, "autozero": True, "width": defaultWidth, "precision": defaultPrecision},
+            {"channel": "AIN2", "name": "Ch_3", "unit": "V", "slope": 1.0, "offset": 0.00, "connect": False, "autozero": True, "width": defaultWidth, "precision": defaultPrecision},
+            {"channel": "AIN3", "name": "Ch_4", "unit": "V", "slope": 1.0, "offset": 0.00, "connect": False, "autozero": True, "width": defaultWidth, "precision": defaultPrecision},
+            {"channel": "AIN4", "name": "Ch_5", "unit": "V", "slope": 1.0, "offset": 0.00, "connect": False, "autozero": True, "width": defaultWidth, "precision": defaultPrecision},
+            {"channel": "AIN5", "name": "Ch_6", "unit": "V", "slope": 1.0, "offset": 0.00, "connect": False, "autozero": True, "width": defaultWidth, "precision": defaultPrecision},
+            {"channel": "AIN6", "name": "Ch_7", "unit": "V", "slope": 1.0, "offset": 0.00, "connect": False, "autozero": True, "width": defaultWidth, "precision": defaultPrecision},
+            {"channel": "AIN7", "name": "Ch_8", "unit": "V", "slope": 1.0, "offset": 0.00, "connect": False, "autozero": True, "width": defaultWidth, "precision": defaultPrecision},
         ]
         self.defaultControlSettings = {
             "mode": "tab",
@@ -78,6 +94,7 @@ class Manager(QObject):
             "KP": 0.00,
             "KI": 0.00,
             "KD": 0.00,
+            "rampRate": 0.00,
             "proportionalOnMeasurement": False,
             "maxRPM": 4000,
             "CPR": 6400,
@@ -101,7 +118,14 @@ class Manager(QObject):
             "binningValue": 1,
             "exposureTime": 10000,
             "gain": 5.0,
-            "imageMode": "RGB"
+            "imageMode": "RGB",
+            "width": defaultWidth,
+            "precision": 0
+        }
+        self.defaultReplaySettings = {
+            "speed": 1.00,
+            "blockRows": 1000,
+            "camera": "N/A"
         }
         self.defaultPreviewSettings = {
             "mode": "tab",
@@ -133,6 +157,18 @@ class Manager(QObject):
         self.timingThread.start()
         log.info("Timing thread started.")   
 
+        # Create capture coordinator thread.
+        self.captureCoordinator = CaptureCoordinator()
+        log.info("Capture coordinator instance created.")
+        self.captureCoordinatorThread = QThread(parent=self)
+        self.captureCoordinator.moveToThread(self.captureCoordinatorThread)
+        self.captureCoordinatorThread.start()
+        self.timing.controlDevices.connect(self.captureCoordinator.tick)
+        log.info("Capture coordinator thread started.")
+
+        # Create the path-addressed configuration change notifier.
+        self.notifier = ConfigurationNotifier(self.configuration)
+
         # Load default configuration initially.
         self.initialiseDefaultConfiguration() 
 
@@ -148,14 +184,21 @@ class Manager(QObject):
     @Slot(str, list, list)
     def updateDeviceOffsets(self, name, channels, newOffsets):
         count = 0
-        for channel in channels:
-            index = int(re.findall(r'\d+', channel)[0])
-            offset = round(newOffsets[count], 3)
-            self.configuration["devices"][name]["acquisition"][index]["offset"] = offset
-            self.configurationChanged.emit(self.configuration)
-            count += 1
+        with self.notifier.transaction():
+            for channel in channels:
+                index = int(re.findall(r'\d+', channel)[0])
+                offset = round(newOffsets[count], 3)
+                self.notifier.set("devices/{name}/acquisition/{index}/offset".format(name=name, index=index), offset)
+                count += 1
         log.info("Updated offsets in configuration.")
 
+    @Slot(str, np.ndarray)
+    def logPIDTerms(self, name, terms):
+        """Log the per term contributions of each control channel from a PID update."""
+        if log.isEnabledFor(logging.DEBUG):
+            for axis, term in enumerate(terms):
+                log.debug("PID terms for control channel C{channel} on {device}: ".format(channel=axis+1, device=name) + ", ".join("{field} {value:.4g}".format(field=field, value=term[field]) for field in terms.dtype.names))
+
     def generateFilename(self):
         initialTime = datetime.now()
         initialDate = QDate.currentDate()
@@ -249,6 +292,22 @@ class Manager(QObject):
                 channelline += "IMG#" + " [" + str(deviceName) + "]"
                 nameline += "\t"
                 nameline += "n (-)"
+            elif deviceType == "Press":
+                # If a press, add the polled position, load and status.
+                settings = self.configuration["devices"][deviceName]["control"][0]["settings"]
+                units = {"position": settings["primaryUnit"], "load": settings["feedbackUnit"], "status": "-"}
+                for channel in pollChannels:
+                    slopeline += "\tN/A"
+                    offsetline += "\tN/A"
+                    channelline += "\t" + channel.upper() + " [" + str(deviceName) + "]"
+                    nameline += "\t" + channel.capitalize() + " (" + str(units[channel]) + ")"
+            elif deviceType == "Replay":
+                # If a replay, carry over the header of each recorded channel.
+                for channel in self.devices[deviceName].channels:
+                    slopeline += "\t" + ("N/A" if channel["slope"] != channel["slope"] else str(channel["slope"]))
+                    offsetline += "\t" + ("N/A" if channel["offset"] != channel["offset"] else str(channel["offset"]))
+                    channelline += "\t" + str(channel["channel"]) + " [" + str(channel["device"]) + "]"
+                    nameline += "\t" + str(channel["name"]) + " (" + str(channel["unit"]) + ")"
         slopeline += "\n"
         offsetline += "\n\n"
         channelline += "\n\n"
@@ -256,13 +315,54 @@ class Manager(QObject):
         header = byeline + testline + slopeline + offsetline + channelline + nameline
         return header
 
-    def initialiseDeviceSettings(self):
+    def outputFormats(self):
+        """Method to get the width and precision of each output column, in the order of the header."""
+        settings = self.configuration["global"]
+        widths = [settings.get("timeWidth", defaultWidth)]
+        precisions = [settings.get("timePrecision", defaultPrecision)]
+        for device in self.deviceTableModel.enabledDevices():
+            deviceName = device["name"]
+            if device["type"] == "Hub":
+                # Acquisition channels take their format from the acquisition table.
+                channelWidths, channelPrecisions = self.acquisitionTableModels[deviceName].outputFormats()
+                widths += channelWidths
+                precisions += channelPrecisions
+                # Control channels use the default format.
+                for control in self.controlTableModels[deviceName].enabledControls():
+                    if control["control"] == "Linear":
+                        channel = 0 if control["channel"] == "C1" else 1
+                        columns = 4 if self.configuration["devices"][deviceName]["control"][channel]["settings"]["feedbackIndex"] == 0 else 6
+                        widths += [defaultWidth]*columns
+                        precisions += [defaultPrecision]*columns
+            elif device["type"] == "Camera":
+                # The image number column, which holds whole numbers.
+                cameraSettings = self.configuration["devices"][deviceName]["settings"]
+                widths.append(cameraSettings.get("width", defaultWidth))
+                precisions.append(cameraSettings.get("precision", 0))
+            elif device["type"] == "Press":
+                widths += [defaultWidth]*len(pollChannels)
+                precisions += [defaultPrecision]*len(pollChannels)
+            elif device["type"] == "Replay":
+                columns = len(self.devices[deviceName].channels)
+                widths += [defaultWidth]*columns
+                precisions += [defaultPrecision]*columns
+        return widths, precisions
+
+    def initialiseDeviceSettings(self, journal=None):
         log.info("Initialising setup for enabled devices.")
         # Get a list of enabled devices.
         enabledDevices = self.deviceTableModel.enabledDevices()
+        self.journalHubs = [device["name"] for device in enabledDevices if device["type"] == "Hub"]
+        self.journalCameras = [device["name"] for device in enabledDevices if device["type"] == "Camera"]
+        self.firstCaptureIndex = 0
 
         # Create output arrays in assembly thread.
         self.assembly.create_data_arrays(enabledDevices)
+
+        # Image numbers in a replayed recording are events, like those of a live camera.
+        for device in enabledDevices:
+            if device["type"] == "Replay":
+                self.assembly.set_event_columns(device["name"], self.devices[device["name"]].eventColumns)
         
         # Initialise assembly thread.
         controlRate = self.configuration["global"]["controlRate"]
@@ -270,13 +370,38 @@ class Manager(QObject):
         averageSamples = self.configuration["global"]["averageSamples"]
         self.assembly.define_settings(controlRate, skipSamples, averageSamples)
 
-        # Set filename.
-        path, filename, date, time, ext = self.generateFilename()
-        self.assembly.set_filename(path, filename, date, time, ext)
-
-        # Generate the header for the output file.
-        header = self.createHeader()
-        self.assembly.write_header(header)
+        # Configure the image writer pool and the raw writer.
+        settings = self.configuration["global"]
+        self.assembly.imageWriter.configure(settings.get("imageWriters", 2), settings.get("imageQueue", 32), settings.get("imageFormat", "jpeg"), settings.get("imageQuality", 90))
+        self.assembly.rawWriter.configure(settings.get("rawQueue", 16), settings.get("rawChunkBytes", 1073741824))
+
+        # Set the output compression and filename.
+        self.assembly.set_compression(settings.get("compression", "none"), settings.get("compressionLevel", 3))
+        self.assembly.set_output_format(*self.outputFormats())
+        self.assembly.set_rotation(settings.get("rotateSize", 0), settings.get("rotateDuration", 0), settings.get("rotateBoundary", 0))
+        self.assembly.set_journal(settings.get("journalInterval", 0), self.sessionState)
+        if journal != None and self.headerColumns(self.createHeader()) != self.headerColumns(journal["header"]):
+            log.warning("The output columns have changed since the unfinished recording was journaled, so a new file is started instead.")
+            journal = None
+        if journal == None:
+            path, filename, date, time, ext = self.generateFilename()
+            self.assembly.set_filename(path, filename, date, time, ext)
+
+            # Generate the header for the output file.
+            header = self.createHeader()
+            self.assembly.write_header(header)
+        else:
+            # Restore the journaled offsets before the acquisition settings are read, then continue the journaled file.
+            for name, state in journal["state"].items():
+                if name in self.journalHubs:
+                    self.updateDeviceOffsets(name, state["channels"], state["offsets"])
+            # Continue the image numbering so that resumed images do not overwrite those already saved.
+            for name, state in journal["state"].items():
+                if name in self.journalCameras:
+                    self.devices[name].save_count = state["saveCount"]
+            self.firstCaptureIndex = journal["state"].get("capture", {}).get("index", 0)
+            self.assembly.resume(journal)
+            self.outputText.emit(journal["segmentPath"])
         
         # For each device set initialise the device and set the acquisition array.
         for device in enabledDevices:
@@ -299,6 +424,7 @@ class Manager(QObject):
                     dataTypes.append(dt)
                 controlRate = self.configuration["global"]["controlRate"]
                 self.devices[name].set_acquisition_variables(channels, addresses, dataTypes, slopes, offsets, autozero, controlRate)
+                self.devices[name].set_PID_log_interval(self.configuration["global"].get("PIDLogInterval", 0))
                 
                 # For enabled contols, set boolean in device instance in order to output appropriate control variables for plotting.
                 enabledControls = self.controlTableModels[name].enabledControls()
@@ -311,6 +437,65 @@ class Manager(QObject):
 
                 log.info("Settings initialised for device named " + name + ".")
 
+            # Open the serial connection to presses.
+            elif deviceType == "Press":
+                self.devices[name].initialise()
+
+            # Rewind replays to the start of their recordings.
+            elif deviceType == "Replay":
+                replaySettings = self.configuration["devices"][name]["replay"]
+                self.devices[name].set_replay_settings(replaySettings["speed"], replaySettings["blockRows"], replaySettings["camera"])
+                self.devices[name].initialise()
+
+        # Restore the journaled positions and feedback setpoints when resuming.
+        if journal != None:
+            for name, state in journal["state"].items():
+                if name in self.journalHubs:
+                    self.devices[name].set_position_C1(state["positions"][0])
+                    self.devices[name].set_position_C2(state["positions"][1])
+                    self.devices[name].set_feedback_setpoint_C1(state["feedbackSetpoints"][0])
+                    self.devices[name].set_feedback_setpoint_C2(state["feedbackSetpoints"][1])
+                    log.info("Restored journaled positions and setpoints on " + name + ".")
+
+    def headerColumns(self, header):
+        """Return the lines of a header that define its columns, leaving out the test name, date, time and offsets that change between runs."""
+        return [line for line in header.split("\n") if line.startswith(("Slopes:", "Channel:", "Time (s)"))]
+
+    def sessionState(self):
+        """Return the offsets, positions and feedback setpoints of the enabled hubs, the image counters of the enabled cameras and the next capture index for the recording journal."""
+        state = {"capture": {"index": self.captureCoordinator.index + 1}}
+        for name in self.journalHubs:
+            hub = self.devices[name]
+            state[name] = {
+                "channels": list(hub.channels),
+                "offsets": [float(offset) for offset in hub.offsets],
+                "positions": [hub.position_process_variable_C1, hub.position_process_variable_C2],
+                "feedbackSetpoints": [hub.feedback_setpoint_C1, hub.feedback_setpoint_C2],
+            }
+        for name in self.journalCameras:
+            state[name] = {"saveCount": self.devices[name].save_count}
+        return state
+
+    def setResumeSession(self, journal):
+        """Method to continue the recording of a journal on the next run."""
+        self.resumeJournal = journal
+        log.info("The next run will resume the recording " + journal["segmentPath"] + ".")
+
+    def findUnfinishedSession(self):
+        """Return the most recent journal for the configured output filename that was not closed cleanly, or None."""
+        pattern = os.path.join(glob.escape(str(self.configuration["global"]["path"])), glob.escape(str(self.configuration["global"]["filename"])) + "_*_journal.json")
+        for journalPath in sorted(glob.glob(pattern), key=os.path.getmtime, reverse=True):
+            try:
+                with open(journalPath) as file:
+                    journal = json.load(file)
+                if journal["closed"] == False and os.path.exists(journal["segmentPath"]):
+                    log.info("Found unfinished recording session " + journalPath + ".")
+                    return journal
+            except Exception:
+                e = sys.exc_info()[1]
+                log.warning(e)
+        return None
+
     def setDeviceFeedbackChannels(self):
         log.info("Setting feedback channels for all devices.")
         # Get a list of enabled devices.
@@ -334,15 +519,18 @@ class Manager(QObject):
                     log.info("Feedback channel set to {feedback} for control channel {channel} on {device}.".format(feedback=control["feedback"], channel=control["channel"], device=name))
 
     @Slot(str, int, int, bool)
-    def createDeviceThread(self, name, deviceType, id, connection, connect):
-        """Create device instance and move to thread if it doesn't already exist."""
+    def createDeviceThread(self, name, deviceType, id, connection, connect, handle=None):
+        """Create device instance and move to thread if it doesn't already exist. An already open handle is handed over rather than reopened."""
         if name not in self.devices:
             if deviceType == "Hub":
-                self.devices[name] = Device(name, id, connection)
+                self.devices[name] = Device(name, id, connection, handle)
+                self.devices[name].updateBufferLevel.connect(self.bufferLevelChanged)
             elif deviceType == "Camera":
-                self.devices[name] = Camera(name, id, connection)
+                self.devices[name] = Camera(name, id, connection, handle)
             elif deviceType == "Press":
-                self.devices[name] = Press(name, id, connection)
+                self.devices[name] = Press(name, id, connection, handle)
+            elif deviceType == "Replay":
+                self.devices[name] = Replay(name, id, connection, handle)
             log.info("Device instance created for device named " + name + ".")
             self.deviceThreads[name] = QThread()
             log.info("Device thread created for device named " + name + ".")
@@ -363,11 +551,24 @@ class Manager(QObject):
                 self.assembly.autozeroDevices.connect(self.devices[name].recalculate_offsets)
                 self.devices[name].emitData.connect(self.assembly.update_new_data)
                 self.devices[name].updateOffsets.connect(self.updateDeviceOffsets)
+                self.devices[name].updatePIDTerms.connect(self.logPIDTerms)
             elif self.devices[name].type == "Camera":
                 self.devices[name].emitData.connect(self.assembly.update_new_data)
                 self.timing.controlDevices.connect(self.devices[name].save_image)
                 self.devices[name].saveImage.connect(self.assembly.save_image)
+                self.devices[name].saveRawImage.connect(self.assembly.save_raw_image)
                 self.devices[name].stop_stream = False
+            elif self.devices[name].type == "Press":
+                if len(self.devices[name].pollCommands) == 0:
+                    # A press with nothing to poll would only write NaN columns, so it is not enabled.
+                    log.warning("{name} has no TriScan poll commands configured and was not enabled.".format(name=name))
+                    self.deviceTableModel.setConnect(name, False)
+                    return
+                self.timing.controlDevices.connect(self.devices[name].process)
+                self.devices[name].emitData.connect(self.assembly.update_new_data)
+            elif self.devices[name].type == "Replay":
+                self.timing.controlDevices.connect(self.devices[name].process)
+                self.devices[name].emitData.connect(self.assembly.update_new_data)
             self.deviceToggled.emit(name, connect)
             log.info("Basic signals connected to device {name}.".format(name=name))
         elif connect == False:
@@ -377,72 +578,226 @@ class Manager(QObject):
                 self.assembly.autozeroDevices.disconnect(self.devices[name].recalculate_offsets)
                 self.devices[name].emitData.disconnect(self.assembly.update_new_data)
                 self.devices[name].updateOffsets.disconnect(self.updateDeviceOffsets)
+                self.devices[name].updatePIDTerms.disconnect(self.logPIDTerms)
             elif self.devices[name].type == "Camera":
                 self.devices[name].stop_stream = True
                 self.devices[name].emitData.disconnect(self.assembly.update_new_data)
                 self.timing.controlDevices.disconnect(self.devices[name].save_image)
                 self.devices[name].saveImage.disconnect(self.assembly.save_image)
+                self.devices[name].saveRawImage.disconnect(self.assembly.save_raw_image)
+            elif self.devices[name].type == "Press":
+                self.timing.controlDevices.disconnect(self.devices[name].process)
+                self.devices[name].emitData.disconnect(self.assembly.update_new_data)
+            elif self.devices[name].type == "Replay":
+                self.timing.controlDevices.disconnect(self.devices[name].process)
+                self.devices[name].emitData.disconnect(self.assembly.update_new_data)
             self.deviceToggled.emit(name, connect)
             log.info("Basic signals disconnected from device {name}.".format(name=name))
 
     def loadDevicesFromConfiguration(self):
         # Find all devices listed in the configuration file.
         if "devices" in self.configuration:
+            # Reconnect to every configured device in parallel using the last known connection parameters.
+            inventory = self.loadInventory()
+            start = time.monotonic()
+            found, missing = self.reconnectDevices(list(self.configuration["devices"].keys()), inventory)
+
+            # Fall back to a full discovery scan for devices that were not at their cached address.
+            if len(missing) > 0:
+                log.info("Running device discovery for devices not found at their cached addresses: " + ", ".join(missing) + ".")
+                discovered = []
+                self.runProbes({"USB": (self.probeLJDevices, "USB"), "TCP": (self.probeLJDevices, "TCP"), "Galaxy": (self.probeGalaxyDevices,)}, {"TCP": "USB"}, discovered.append)
+                retry = []
+                for device in missing:
+                    for deviceInformation in discovered:
+                        if str(deviceInformation["id"]) == str(self.configuration["devices"][device]["id"]):
+                            inventory[device] = {"connection": deviceInformation["connection"], "address": deviceInformation["address"]}
+                            retry.append(device)
+                            break
+                found.update(self.reconnectDevices(retry, inventory)[0])
+
+            # Add the connected devices to the UI in configuration order and hand over their open connections.
             for device in self.configuration["devices"].keys():
-                deviceInformation = {}
-                deviceInformation["connect"] = True
-                deviceInformation["name"] = device
-                deviceInformation["model"] = self.configuration["devices"][device]["model"]
-                deviceInformation["type"] = self.configuration["devices"][device]["type"]
-                deviceInformation["id"] = self.configuration["devices"][device]["id"]
-                deviceInformation["connection"] = self.configuration["devices"][device]["connection"]
-                deviceInformation["address"] = self.configuration["devices"][device]["address"]
-                deviceInformation["status"] = False
-                # Try to connect to each device and add to configuration if present.
-                if deviceInformation["type"] == "Hub":
-                    if deviceInformation["model"] == "LabJack T7":
-                        try:
-                            # If the connection is successful, set the device status to true.
-                            handle = ljm.open(7, int(deviceInformation["connection"]), int(deviceInformation["id"]))
-                            name = ljm.eReadNameString(handle, "DEVICE_NAME_DEFAULT")
-                            if name != device:
-                                log.warning("LabJack T7 device has incorrect name set in register.")
-                            ljm.close(handle)
-                            deviceInformation["status"] = True     
-                            
-                            # Update acquisition and control table models and add to TabWidget by emitting the appropriate Signal.
-                            self.deviceTableModel.appendRow(deviceInformation)
-                            self.acquisitionTableModels[device] = AcquisitionTableModel(self.configuration["devices"][device]["acquisition"])
-                            self.controlTableModels[device] = ControlTableModel(device, self.configuration["devices"][device]["control"])
-                            self.feedbackChannelLists[device] = self.setFeedbackChannelList(device)
-                            self.createDeviceThread(name=device, deviceType=deviceInformation["type"], id=deviceInformation["id"], connection=deviceInformation["connection"], connect=True)
-                            self.toggleDeviceConnection(device, deviceInformation["connect"])       
-                        except ljm.LJMError:
-                            # Otherwise log the exception and set the device status to false.
-                            ljme = sys.exc_info()[1]
-                            log.warning(ljme) 
-                        except Exception:
-                            e = sys.exc_info()[1]
-                            log.warning(e)
-                elif deviceInformation["type"] == "Camera":
-                    try:
-                        # If the connection is successful, set the device status to true.
-                        device_manager = gx.DeviceManager()
-                        numDevices, device_list = device_manager.update_device_list()
-                        cam = device_manager.open_device_by_sn(deviceInformation["id"])
-                        cam.close_device()
-                        deviceInformation["status"] = True     
-                        
-                        # Update acquisition and control table models and add to TabWidget by emitting the appropriate Signal.
-                        self.deviceTableModel.appendRow(deviceInformation)
-                        self.createDeviceThread(name=device, deviceType=deviceInformation["type"], id=deviceInformation["id"], connection=deviceInformation["connection"], connect=True)
-                        self.toggleDeviceConnection(device, deviceInformation["connect"])          
-                    except Exception:
-                        e = sys.exc_info()[1]
-                        log.warning(e)
-                log.info("Configuration loaded.")
-                self.configurationChanged.emit(self.configuration)  
-                
+                if device in found:
+                    self.addConfiguredDevice(device, found[device])
+            self.saveInventory()
+            log.info("Configured devices reconnected in {time:.2f} s.".format(time=time.monotonic()-start))
+        log.info("Configuration loaded.")
+        self.configurationChanged.emit(self.configuration)
+
+    def reconnectDevices(self, devices, inventory):
+        """Method to open configured devices concurrently, returning the open connections and the devices not found."""
+        found, missing = {}, []
+        if len(devices) == 0:
+            return found, missing
+        cameraManager = None
+        # The Galaxy device manager updates its device list when opening a camera, so cameras are opened one at a time.
+        cameraLock = threading.Lock()
+        executor = ThreadPoolExecutor(max_workers=len(devices))
+        futures = {}
+        start = time.monotonic()
+        for device in devices:
+            deviceType = self.configuration["devices"][device]["type"]
+            if deviceType == "Camera" and cameraManager == None:
+                cameraManager = gx.DeviceManager()
+            if deviceType in ["Hub", "Camera", "Press", "Replay"]:
+                cached = inventory.get(device, {})
+                connection = cached.get("connection", self.configuration["devices"][device]["connection"])
+                address = cached.get("address", self.configuration["devices"][device]["address"])
+                futures[device] = executor.submit(self.reconnectDevice, device, connection, address, cameraManager, cameraLock)
+        for device in futures:
+            timeout = max(0, start + self.discoveryTimeouts["Reconnect"] - time.monotonic())
+            try:
+                connection, address, handle = futures[device].result(timeout=timeout)
+                self.configuration["devices"][device]["connection"] = connection
+                self.configuration["devices"][device]["address"] = address
+                found[device] = handle
+            except FutureTimeoutError:
+                # Close the device if it opens after all, rather than leaking its handle.
+                futures[device].add_done_callback(partial(self.closeLateDevice, device))
+                log.warning("Could not reconnect to {device} within {timeout} s.".format(device=device, timeout=self.discoveryTimeouts["Reconnect"]))
+                missing.append(device)
+            except ljm.LJMError:
+                ljme = sys.exc_info()[1]
+                log.warning(ljme) 
+                missing.append(device)
+            except Exception:
+                e = sys.exc_info()[1]
+                log.warning("Could not reconnect to {device}: {error}".format(device=device, error=repr(e)))
+                missing.append(device)
+        # Late devices are closed by their callbacks, so only devices not yet being opened are cancelled.
+        executor.shutdown(wait=False, cancel_futures=True)
+        return found, missing
+
+    def closeLateDevice(self, device, future):
+        """Method to close a device that was opened after its reconnection timed out. Runs in the worker thread that opened it."""
+        try:
+            connection, address, handle = future.result()
+            deviceType = self.configuration["devices"][device]["type"]
+            if deviceType == "Hub":
+                ljm.close(handle)
+            elif deviceType == "Camera":
+                handle[1].close_device()
+            elif deviceType == "Press":
+                handle.close()
+            log.info("Closed {device}, which opened after its reconnection timed out.".format(device=device))
+        except Exception:
+            # The device never opened, so there is nothing to close.
+            pass
+
+    def reconnectDevice(self, device, connection, address, cameraManager, cameraLock):
+        """Method to open a configured device with cached connection parameters. Runs in a worker thread."""
+        deviceType = self.configuration["devices"][device]["type"]
+        id = self.configuration["devices"][device]["id"]
+        if deviceType == "Hub" and self.configuration["devices"][device]["model"] == "LabJack T7":
+            # Open network devices directly by IP address to avoid a broadcast search.
+            if address != "N/A":
+                handle = ljm.open(7, int(connection), address)
+            else:
+                handle = ljm.open(7, int(connection), int(id))
+            name = ljm.eReadNameString(handle, "DEVICE_NAME_DEFAULT")
+            if name != device:
+                log.warning("LabJack T7 device has incorrect name set in register.")
+            return connection, address, handle
+        elif deviceType == "Camera":
+            with cameraLock:
+                if address != "N/A":
+                    cam = cameraManager.open_device_by_ip(address)
+                else:
+                    cam = cameraManager.open_device_by_sn(id)
+            return connection, address, (cameraManager, cam)
+        elif deviceType == "Press":
+            # Check the press still answers on its port, then hand the open driver over.
+            triscan = TriScan(self.configuration["devices"][device]["port"], address)
+            try:
+                if triscan.identify() == False:
+                    raise TriScanError("No TriScan answered on {port} at address {address}.".format(port=triscan.port, address=address))
+            except Exception:
+                triscan.close()
+                raise
+            return connection, address, triscan
+        elif deviceType == "Replay":
+            # The address of a replay is its recording, which is opened here and handed over as the handle.
+            if os.path.exists(address) == False:
+                raise FileNotFoundError("Recording {path} not found.".format(path=address))
+            return connection, address, DataFile(address)
+        raise ValueError("Reconnection not supported for {device}.".format(device=device))
+
+    def addConfiguredDevice(self, device, handle):
+        """Method to add a reconnected configured device to the UI and connect it."""
+        deviceInformation = {}
+        deviceInformation["connect"] = True
+        deviceInformation["name"] = device
+        deviceInformation["model"] = self.configuration["devices"][device]["model"]
+        deviceInformation["type"] = self.configuration["devices"][device]["type"]
+        deviceInformation["id"] = self.configuration["devices"][device]["id"]
+        deviceInformation["connection"] = self.configuration["devices"][device]["connection"]
+        deviceInformation["address"] = self.configuration["devices"][device]["address"]
+        deviceInformation["status"] = True
+        try:
+            # Update acquisition and control table models and add to TabWidget by emitting the appropriate Signal.
+            self.deviceTableModel.appendRow(deviceInformation)
+            if deviceInformation["type"] == "Hub":
+                self.acquisitionTableModels[device] = AcquisitionTableModel(self.configuration["devices"][device]["acquisition"])
+                self.controlTableModels[device] = ControlTableModel(device, self.configuration["devices"][device]["control"])
+                self.feedbackChannelLists[device] = self.setFeedbackChannelList(device)
+            self.createDeviceThread(name=device, deviceType=deviceInformation["type"], id=deviceInformation["id"], connection=deviceInformation["connection"], connect=True, handle=handle)
+            if deviceInformation["type"] == "Press":
+                self.devices[device].set_poll_commands(self.configuration["devices"][device].get("commands", {}))
+            self.toggleDeviceConnection(device, deviceInformation["connect"])
+        except Exception:
+            e = sys.exc_info()[1]
+            log.warning(e)
+
+    def inventoryPath(self):
+        """Method to get the path of the device inventory cache kept alongside the configuration file."""
+        if getattr(self, "configurationPath", None) == None:
+            return None
+        return os.path.splitext(self.configurationPath)[0] + ".inventory.yaml"
+
+    def loadInventory(self):
+        """Method to load the last known connection parameters of each device."""
+        path = self.inventoryPath()
+        inventory = {}
+        if path != None and os.path.isfile(path):
+            try:
+                with open(path, "r") as file:
+                    yaml = YAML()
+                    cached = yaml.load(file) or {}
+                # Only trust entries whose serial number still matches the configuration.
+                for device in cached.get("devices", {}):
+                    if device in self.configuration["devices"] and str(cached["devices"][device]["id"]) == str(self.configuration["devices"][device]["id"]):
+                        inventory[device] = dict(cached["devices"][device])
+                log.info("Device inventory loaded from " + path + ".")
+            except Exception:
+                e = sys.exc_info()[1]
+                log.warning(e)
+        return inventory
+
+    def saveInventory(self):
+        """Method to save the connection parameters of the devices in the device table."""
+        path = self.inventoryPath()
+        if path == None:
+            return
+        devices = {}
+        for device in self.deviceTableModel._data:
+            if device["status"] == True:
+                devices[device["name"]] = {
+                    "id": device["id"],
+                    "model": device["model"],
+                    "type": device["type"],
+                    "connection": device["connection"],
+                    "address": device["address"],
+                    "lastSeen": datetime.now().isoformat(timespec="seconds"),
+                }
+        try:
+            yaml = YAML()
+            with open(path, "w") as file:
+                yaml.dump({"devices": devices}, file)
+        except Exception:
+            e = sys.exc_info()[1]
+            log.warning(e)
+
     def findDevices(self):
         """Method to find all available devices and return an array of connection properties.
         USB connections are prioritised over Ethernet and WiFi connections to minimise jitter."""
@@ -451,256 +806,357 @@ class Manager(QObject):
         self.clearConfiguration()
         self.refreshing = True
 
-        # Add LabJack USB devices, then TCP devices (USB preferred due to reduced latency).
-        self.addLJDevices("USB")
-        self.addLJDevices("TCP")
-
-        # Add Galaxy camera devices.
-        self.addGalaxyDevices()
-
-        # Add VJTech TriScan devices.
-        self.addTriScanDevices()
+        # Probe every transport concurrently, so refresh time is bounded by the slowest probe rather than the sum.
+        probes = {
+            "USB": (self.probeLJDevices, "USB"),
+            "TCP": (self.probeLJDevices, "TCP"),
+            "Galaxy": (self.probeGalaxyDevices,),
+        }
+        try:
+            for comport in list_ports.comports():
+                probes["TriScan " + comport.device] = (self.probeTriScanDevices, comport.device)
+        except Exception:
+            e = sys.exc_info()[1]
+            log.warning(e)
+        # TCP results are held back until the USB probe finishes, so USB is preferred for devices found on both.
+        # Devices still stream into the device table, but their configuration changes are published as one notification.
+        with self.notifier.transaction():
+            self.runProbes(probes, {"TCP": "USB"}, self.addDevice)
+        self.saveInventory()
 
         # Boolean to indicate that the device list has finished refreshing.
         self.refreshing = False
         self.finishedRefreshingDevices.emit()
 
-    def addGalaxyDevices(self):
-        # Add Galaxy camera devices.
+    def runProbes(self, probes, after, callback):
+        """Method to run discovery probes concurrently with per-probe deadlines, calling back with each device found."""
+        start = time.monotonic()
+        executor = ThreadPoolExecutor(max_workers=len(probes))
+        pending, deadlines, results, abandoned = {}, {}, {}, []
+        for probe in probes:
+            function, arguments = probes[probe][0], probes[probe][1:]
+            pending[probe] = executor.submit(function, *arguments)
+            deadlines[probe] = start + self.discoveryTimeouts[probe.split(" ")[0]]
+
+        while len(pending) > 0 or len(results) > 0:
+            if len(pending) > 0:
+                timeout = max(0, min(deadlines[probe] for probe in pending) - time.monotonic())
+                wait(list(pending.values()), timeout=timeout, return_when=FIRST_COMPLETED)
+            for probe in list(pending):
+                if pending[probe].done():
+                    results[probe] = self.probeResult(probe, pending.pop(probe))
+                elif time.monotonic() >= deadlines[probe]:
+                    future = pending.pop(probe)
+                    future.add_done_callback(partial(self.closeLateProbe, probe))
+                    abandoned.append(future)
+                    results[probe] = []
+                    log.warning("Device discovery on {probe} timed out after {timeout} s.".format(probe=probe, timeout=self.discoveryTimeouts[probe.split(" ")[0]]))
+
+            # Report devices as soon as their probe, and any probe they must follow, has finished.
+            for probe in probes:
+                if probe in results and after.get(probe) not in pending:
+                    for deviceInformation in results.pop(probe):
+                        callback(deviceInformation)
+        
+        # Cancel probes that never started and give those that timed out a bounded time to release the devices they opened.
+        executor.shutdown(wait=False, cancel_futures=True)
+        if len(abandoned) > 0:
+            finished, running = wait(abandoned, timeout=self.discoveryTimeouts["Abandon"])
+            if len(running) > 0:
+                log.warning("{count} timed out discovery probes are still running and will be left to finish.".format(count=len(running)))
+        log.info("Device discovery finished in {time:.2f} s.".format(time=time.monotonic()-start))
+
+    def closeLateProbe(self, probe, future):
+        """Method to discard the devices found by a probe that finished after it timed out. Runs in the worker thread of the probe."""
+        if future.cancelled() == True:
+            return
         try:
-            # Get a list of already existing devices.
-            existingDevices = self.deviceTableModel._data
-            ID_Existing = []
-            for device in existingDevices:
-                ID_Existing.append(device["id"])
-
-            # Instantiate a Galaxy device manager and update the device list.
-            device_manager = gx.DeviceManager()
-            numDevices, device_list = device_manager.update_device_list()
-
-            # Add devices if not already in device list.
-            for device in device_list:
-                if device["sn"] not in ID_Existing:
-                    deviceInformation = {}
-                    deviceInformation["connect"] = False
-                    deviceInformation["name"] = device["user_id"]
-                    deviceInformation["id"] = device["sn"]
-                    deviceInformation["model"] = device["model_name"]
-                    deviceInformation["type"] = "Camera"
-                    if device["device_class"] == 3:
-                        mode = "USB"
-                        deviceInformation["connection"] = 1
-                        deviceInformation["address"] = "N/A"
-                    elif device["device_class"] == 2:
-                        mode = "GigE"
-                        deviceInformation["connection"] = 3
-                        deviceInformation["address"] = device["ip"]
-                    deviceInformation["status"] = True
-                    self.deviceTableModel.appendRow(deviceInformation)
-
-                    # Make a deep copy to avoid pointers in the YAML output.
-                    cameraSettings = copy.deepcopy(self.defaultCameraSettings)
-                    previewSettings = copy.deepcopy(self.defaultPreviewSettings)
-                    newDevice = {
-                        "id": deviceInformation["id"],
-                        "model": deviceInformation["model"],
-                        "type": deviceInformation["type"],
-                        "connection": deviceInformation["connection"],
-                        "address": deviceInformation["address"],
-                        "settings": cameraSettings,
-                        "preview": previewSettings,
-                    }
-
-                    # If no previous devices are configured, add the "devices" key to the configuration.
-                    name = deviceInformation["name"]
-                    if "devices" not in self.configuration:
-                        self.configuration["devices"] = {name: newDevice} 
-                    else:
-                        self.configuration["devices"][name] = newDevice 
-                
-                    # Create device thread and add device to UI.
-                    log.info("Adding device to UI.")
-                    self.createDeviceThread(name=name, deviceType=deviceInformation["type"], id=deviceInformation["id"], connection=deviceInformation["connection"], connect=False)
-                    self.configurationChanged.emit(self.configuration)
-
-                    # Log message.
-                    if mode == "USB":
-                        message = "Found a USB3 camera device with ID number {number}.".format(number=deviceInformation["id"])
-                    elif mode == "TCP":
-                        message = "Found a GigE camera device with ID number {number}.".format(number=deviceInformation["id"])
-                    log.info(message)
+            found = future.result()
+            log.info("Device discovery on {probe} finished after it timed out, so {count} devices found were discarded.".format(probe=probe, count=len(found)))
         except Exception:
-            e = sys.exc_info()[1]
-            log.warning(e)
+            # The probe failed, so there is nothing to discard.
+            pass
 
-    def addLJDevices(self, mode):
-        # Add LabJack devices.
+    def probeResult(self, probe, future):
+        """Method to get the devices found by a finished probe, logging any error it raised."""
         try:
-            # Get a list of already existing devices.
-            existingDevices = self.deviceTableModel._data
-            ID_Existing = []
-            for device in existingDevices:
-                ID_Existing.append(device["id"])
-            
-            # Searching for devices.
-            if mode == "USB":
-                log.info("Searching for additional USB devices.")
-                info = ljm.listAll(7, 1)
-            elif mode == "TCP": 
-                log.info("Searching for additional TCP devices.")
-                info = ljm.listAll(7, 2)
-            numDevices = info[0]
-            connectionType = info[2]
-            ID = info[3]
-            IP = info[4]
-
-            # Add devices if not already in device list.
-            for i in range(numDevices):
-                if ID[i] not in ID_Existing:
-                    deviceInformation = {}
-                    deviceInformation["connect"] = False
-                    if mode == "USB":
-                        handle = ljm.open(7, 1, ID[i])
-                    elif mode == "TCP":
-                        handle = ljm.open(7, 2, ID[i])
-                    deviceInformation["name"] = ljm.eReadNameString(handle, "DEVICE_NAME_DEFAULT")
-                    ljm.close(handle)
-                    deviceInformation["id"] = ID[i]
-                    deviceInformation["model"] = "LabJack T7"
-                    deviceInformation["type"] = "Hub"
-                    deviceInformation["connection"] = connectionType[i]
-                    if mode == "USB":
-                        deviceInformation["address"] = "N/A"
-                    elif mode == "TCP":
-                        deviceInformation["address"] = ljm.numberToIP(IP[i])
-                    deviceInformation["status"] = True
-                    self.deviceTableModel.appendRow(deviceInformation)
-                    self.configurationChanged.emit(self.configuration)
-                    
-                    # Make a deep copy to avoid references in the YAML output.
-                    acquisitionTable = copy.deepcopy(self.defaultAcquisitionTable)
-                    controlTable = copy.deepcopy(self.defaultControlTable)
-                    controlTable[0]["name"] = deviceInformation["name"] + " C1"
-                    controlTable[1]["name"] = deviceInformation["name"] + " C2"
-                    newDevice = {
-                        "id": deviceInformation["id"],
-                        "model": deviceInformation["model"],
-                        "type": deviceInformation["type"],
-                        "connection": deviceInformation["connection"],
-                        "address": deviceInformation["address"],
-                        "acquisition": acquisitionTable,
-                        "control": controlTable
-                    }
-
-                    # If no previous devices are configured, add the "devices" key to the configuration.
-                    name = deviceInformation["name"]
-                    if "devices" not in self.configuration:
-                        self.configuration["devices"] = {name: newDevice} 
-                    else:
-                        self.configuration["devices"][name] = newDevice 
-
-                    # Instantiate acquisition and control table models.
-                    log.info("Instantiating data models for device.")
-                    self.acquisitionTableModels[name] = AcquisitionTableModel(self.configuration["devices"][name]["acquisition"])
-                    self.controlTableModels[name] = ControlTableModel(name, self.configuration["devices"][name]["control"])
-                    self.feedbackChannelLists[name] = self.setFeedbackChannelList(name)
-                    log.info("Data models instantiated for device.")
-                
-                    # Create device thread and add device to UI.
-                    log.info("Adding device to UI.")
-                    self.createDeviceThread(name=name, deviceType=deviceInformation["type"], id=deviceInformation["id"], connection=deviceInformation["connection"], connect=False)
-                    self.configurationChanged.emit(self.configuration)
-            
-                    # Log message.
-                    if mode == "USB":
-                        message = "Found a USB LabJack T7 device with ID number {number}.".format(number=deviceInformation["id"])
-                    elif mode == "TCP":
-                        message = "Found a TCP LabJack T7 device with ID number {number}.".format(number=deviceInformation["id"])
-                    log.info(message)
+            return future.result()
         except ljm.LJMError:
             ljme = sys.exc_info()[1]
             log.warning(ljme) 
         except Exception:
             e = sys.exc_info()[1]
             log.warning(e)
+        return []
+
+    def addDevice(self, deviceInformation):
+        """Method to add a discovered device to the device list, configuration and UI."""
+        existingDevices = self.deviceTableModel._data
+        for device in existingDevices:
+            if device["name"] == deviceInformation["name"] or (device["id"] == deviceInformation["id"] and device["id"] != "N/A"):
+                return
+        try:
+            if deviceInformation["type"] == "Hub":
+                self.addLJDevice(deviceInformation)
+            elif deviceInformation["type"] == "Camera":
+                self.addGalaxyDevice(deviceInformation)
+            elif deviceInformation["type"] == "Press":
+                self.addTriScanDevice(deviceInformation)
+        except Exception:
+            e = sys.exc_info()[1]
+            log.warning(e)
+
+    def probeGalaxyDevices(self):
+        """Method to list Galaxy camera devices. Runs in a discovery worker thread."""
+        # Instantiate a Galaxy device manager and update the device list.
+        found = []
+        device_manager = gx.DeviceManager()
+        numDevices, device_list = device_manager.update_device_list()
+        for device in device_list:
+            deviceInformation = {}
+            deviceInformation["connect"] = False
+            deviceInformation["name"] = device["user_id"]
+            deviceInformation["id"] = device["sn"]
+            deviceInformation["model"] = device["model_name"]
+            deviceInformation["type"] = "Camera"
+            if device["device_class"] == 3:
+                deviceInformation["connection"] = 1
+                deviceInformation["address"] = "N/A"
+            elif device["device_class"] == 2:
+                deviceInformation["connection"] = 3
+                deviceInformation["address"] = device["ip"]
+            deviceInformation["status"] = True
+            found.append(deviceInformation)
+        return found
+
+    def addGalaxyDevice(self, deviceInformation):
+        # Add Galaxy camera device.
+        self.deviceTableModel.appendRow(deviceInformation)
+
+        # Make a deep copy to avoid pointers in the YAML output.
+        cameraSettings = copy.deepcopy(self.defaultCameraSettings)
+        previewSettings = copy.deepcopy(self.defaultPreviewSettings)
+        newDevice = {
+            "id": deviceInformation["id"],
+            "model": deviceInformation["model"],
+            "type": deviceInformation["type"],
+            "connection": deviceInformation["connection"],
+            "address": deviceInformation["address"],
+            "settings": cameraSettings,
+            "preview": previewSettings,
+        }
+
+        # If no previous devices are configured, add the "devices" key to the configuration.
+        name = deviceInformation["name"]
+        if "devices" not in self.configuration:
+            self.configuration["devices"] = {name: newDevice} 
+        else:
+            self.configuration["devices"][name] = newDevice 
+    
+        # Create device thread and add device to UI.
+        log.info("Adding device to UI.")
+        self.createDeviceThread(name=name, deviceType=deviceInformation["type"], id=deviceInformation["id"], connection=deviceInformation["connection"], connect=False)
+        self.notifier.notify("devices/" + name)
+
+        # Log message.
+        if deviceInformation["connection"] == 1:
+            message = "Found a USB3 camera device with ID number {number}.".format(number=deviceInformation["id"])
+        else:
+            message = "Found a GigE camera device with ID number {number}.".format(number=deviceInformation["id"])
+        log.info(message)
+
+    def probeLJDevices(self, mode):
+        """Method to list LabJack T7 devices on a connection mode. Runs in a discovery worker thread."""
+        # Searching for devices.
+        found = []
+        if mode == "USB":
+            log.info("Searching for additional USB devices.")
+            info = ljm.listAll(7, 1)
+        elif mode == "TCP": 
+            log.info("Searching for additional TCP devices.")
+            info = ljm.listAll(7, 2)
+        numDevices = info[0]
+        connectionType = info[2]
+        ID = info[3]
+        IP = info[4]
+
+        for i in range(numDevices):
+            deviceInformation = {}
+            deviceInformation["connect"] = False
+            if mode == "USB":
+                handle = ljm.open(7, 1, ID[i])
+            elif mode == "TCP":
+                handle = ljm.open(7, 2, ID[i])
+            # Close the device even if reading its name fails, so a probe that has timed out does not leave it open.
+            try:
+                deviceInformation["name"] = ljm.eReadNameString(handle, "DEVICE_NAME_DEFAULT")
+            finally:
+                ljm.close(handle)
+            deviceInformation["id"] = ID[i]
+            deviceInformation["model"] = "LabJack T7"
+            deviceInformation["type"] = "Hub"
+            deviceInformation["connection"] = connectionType[i]
+            if mode == "USB":
+                deviceInformation["address"] = "N/A"
+            elif mode == "TCP":
+                deviceInformation["address"] = ljm.numberToIP(IP[i])
+            deviceInformation["status"] = True
+            found.append(deviceInformation)
+        return found
+
+    def addLJDevice(self, deviceInformation):
+        # Add LabJack device.
+        self.deviceTableModel.appendRow(deviceInformation)
+        
+        # Make a deep copy to avoid references in the YAML output.
+        acquisitionTable = copy.deepcopy(self.defaultAcquisitionTable)
+        controlTable = copy.deepcopy(self.defaultControlTable)
+        controlTable[0]["name"] = deviceInformation["name"] + " C1"
+        controlTable[1]["name"] = deviceInformation["name"] + " C2"
+        newDevice = {
+            "id": deviceInformation["id"],
+            "model": deviceInformation["model"],
+            "type": deviceInformation["type"],
+            "connection": deviceInformation["connection"],
+            "address": deviceInformation["address"],
+            "acquisition": acquisitionTable,
+            "control": controlTable
+        }
 
-    def addTriScanDevices(self):
-        # Add VJTech TriScan devices.
+        # If no previous devices are configured, add the "devices" key to the configuration.
+        name = deviceInformation["name"]
+        if "devices" not in self.configuration:
+            self.configuration["devices"] = {name: newDevice} 
+        else:
+            self.configuration["devices"][name] = newDevice 
+
+        # Instantiate acquisition and control table models.
+        log.info("Instantiating data models for device.")
+        self.acquisitionTableModels[name] = AcquisitionTableModel(self.configuration["devices"][name]["acquisition"])
+        self.controlTableModels[name] = ControlTableModel(name, self.configuration["devices"][name]["control"])
+        self.feedbackChannelLists[name] = self.setFeedbackChannelList(name)
+        log.info("Data models instantiated for device.")
+    
+        # Create device thread and add device to UI.
+        log.info("Adding device to UI.")
+        self.createDeviceThread(name=name, deviceType=deviceInformation["type"], id=deviceInformation["id"], connection=deviceInformation["connection"], connect=False)
+        self.notifier.notify("devices/" + name)
+
+        # Log message.
+        if deviceInformation["address"] == "N/A":
+            message = "Found a USB LabJack T7 device with ID number {number}.".format(number=deviceInformation["id"])
+        else:
+            message = "Found a TCP LabJack T7 device with ID number {number}.".format(number=deviceInformation["id"])
+        log.info(message)
+
+    def probeTriScanDevices(self, port):
+        """Method to check a serial port for a VJTech TriScan device. Runs in a discovery worker thread."""
+        # Ask for identification using the TriScan driver, whose framed reads time out rather than sleeping.
+        address = 21
+        log.info("Trying to find VJTech TriScan device on port " + port + ".")
+        triscan = TriScan(port, address)
         try:
-            # Get a list of already existing devices.
-            existingDevices = self.deviceTableModel._data
-            ID_Existing = []
-            for device in existingDevices:
-                ID_Existing.append(device["id"])
-            
-            # Searching for devices.
-            address = 21
-            for comport in list_ports.comports():
-                # Configure the serial connection.
-                ser = serial.Serial(
-                    port=comport.device,
-                    baudrate=57600,
-                    parity=serial.PARITY_NONE,
-                    stopbits=serial.STOPBITS_ONE,
-                    bytesize=serial.EIGHTBITS
-                )
-                log.info("Trying to find VJTech TriScan device on port " + comport.device + ".")
-                ser.write(bytes("I" + str(address) + "TSF\r", "utf-8"))
-                time.sleep(0.1)
-                ret = ''
-
-                # Wait for return message.
-                while ser.inWaiting() > 0:
-                    ret += ser.read(1).decode("utf-8")
-
-                # If expected return message is receieved, add device to device list.
-                if "i21t" in ret:
-                # if "I21TSF" in ret:
-                    deviceInformation = {}
-                    deviceInformation["connect"] = False
-                    deviceInformation["name"] = "VJT"
-                    deviceInformation["id"] = "N/A"
-                    deviceInformation["model"] = "TriScan"
-                    deviceInformation["type"] = "Press"
-                    deviceInformation["connection"] = 5
-                    deviceInformation["status"] = True
-                    deviceInformation["address"] = "21"
-                    self.deviceTableModel.appendRow(deviceInformation)
-                    self.configurationChanged.emit(self.configuration)
-            
-                    # Make a deep copy to avoid references in the YAML output.
-                    controlTable = copy.deepcopy(self.defaultControlTable)
-                    controlTable[0]["name"] = deviceInformation["name"] + " C1"
-                    controlTable[1]["name"] = deviceInformation["name"] + " C2"
-                    newDevice = {
-                        "id": deviceInformation["id"],
-                        "model": deviceInformation["model"],
-                        "type": deviceInformation["type"],
-                        "connection": deviceInformation["connection"],
-                        "address": deviceInformation["address"],
-                        "control": [{"channel": "TS", "name": "VJT", "enable": True, "type": "Digital", "control": "Linear", "feedback": "N/A", "settings": copy.deepcopy(self.defaultControlSettings)}],
-                    }
-
-                    # If no previous devices are configured, add the "devices" key to the configuration.
-                    name = deviceInformation["name"]
-                    if "devices" not in self.configuration:
-                        self.configuration["devices"] = {name: newDevice} 
-                    else:
-                        self.configuration["devices"][name] = newDevice 
+            identified = triscan.identify()
+        except TriScanError:
+            identified = False
+        finally:
+            triscan.close()
+
+        # If expected return message is receieved, return the device.
+        if identified == True:
+            deviceInformation = {}
+            deviceInformation["connect"] = False
+            deviceInformation["name"] = "VJT"
+            deviceInformation["id"] = "N/A"
+            deviceInformation["model"] = "TriScan"
+            deviceInformation["type"] = "Press"
+            deviceInformation["connection"] = 5
+            deviceInformation["status"] = True
+            deviceInformation["address"] = str(address)
+            deviceInformation["port"] = port
+            return [deviceInformation]
+        return []
+
+    def addTriScanDevice(self, deviceInformation):
+        # Add VJTech TriScan device.
+        port = deviceInformation.pop("port")
+        self.deviceTableModel.appendRow(deviceInformation)
+
+        # Make a deep copy to avoid references in the YAML output.
+        controlTable = copy.deepcopy(self.defaultControlTable)
+        controlTable[0]["name"] = deviceInformation["name"] + " C1"
+        controlTable[1]["name"] = deviceInformation["name"] + " C2"
+        newDevice = {
+            "id": deviceInformation["id"],
+            "model": deviceInformation["model"],
+            "type": deviceInformation["type"],
+            "connection": deviceInformation["connection"],
+            "address": deviceInformation["address"],
+            "port": port,
+            "commands": {},
+            "control": [{"channel": "TS", "name": "VJT", "enable": True, "type": "Digital", "control": "Linear", "feedback": "N/A", "settings": copy.deepcopy(self.defaultControlSettings)}],
+        }
+
+        # If no previous devices are configured, add the "devices" key to the configuration.
+        name = deviceInformation["name"]
+        if "devices" not in self.configuration:
+            self.configuration["devices"] = {name: newDevice} 
+        else:
+            self.configuration["devices"][name] = newDevice 
 
-                    # Create device thread and add device to UI.
-                    log.info("Adding device to UI.")
-                    self.createDeviceThread(name=name, deviceType=deviceInformation["type"], id=deviceInformation["id"], connection=deviceInformation["connection"], connect=False)
-                    self.configurationChanged.emit(self.configuration)
+        # Create device thread and add device to UI.
+        log.info("Adding device to UI.")
+        self.createDeviceThread(name=name, deviceType=deviceInformation["type"], id=deviceInformation["id"], connection=deviceInformation["connection"], connect=False, handle=TriScan(port, deviceInformation["address"]))
+        self.devices[name].set_poll_commands(newDevice["commands"])
+        self.notifier.notify("devices/" + name)
 
-                    # Log message.
-                    log.info("VJTech TriScan device found on port " + comport.device + " at address " + str(address) + ".")
+        # Log message.
+        log.info("VJTech TriScan device found on port " + port + " at address " + deviceInformation["address"] + ".")
 
-                    # Break because we only want to add one TriScan device threfore no need to search further ports.
-                    break
+    @Slot(str)
+    def addReplayDevice(self, filepath):
+        """Method to add a replay of a recorded data file as a device."""
+        if filepath == "":
+            log.info("Replay cancelled.")
+            return
+        existingNames = [device["name"] for device in self.deviceTableModel._data]
+        name = "Replay"
+        count = 1
+        while name in existingNames:
+            count += 1
+            name = "Replay " + str(count)
+        try:
+            replay = Replay(name, "N/A", 0, filepath)
         except Exception:
             e = sys.exc_info()[1]
             log.warning(e)
+            return
+        deviceInformation = {"connect": True, "name": name, "id": "N/A", "model": "Recording", "type": "Replay", "connection": 0, "status": True, "address": filepath}
+        self.deviceTableModel.appendRow(deviceInformation)
+
+        # Make deep copies to avoid references in the YAML output, previewing the first recorded camera if there is one.
+        replaySettings = copy.deepcopy(self.defaultReplaySettings)
+        if len(replay.cameras) > 0:
+            replaySettings["camera"] = replay.cameras[0]
+        newDevice = {
+            "id": deviceInformation["id"],
+            "model": deviceInformation["model"],
+            "type": deviceInformation["type"],
+            "connection": deviceInformation["connection"],
+            "address": deviceInformation["address"],
+            "replay": replaySettings,
+            "preview": copy.deepcopy(self.defaultPreviewSettings),
+        }
+        if "devices" not in self.configuration:
+            self.configuration["devices"] = {name: newDevice}
+        else:
+            self.configuration["devices"][name] = newDevice
+
+        # Create device thread and add device to UI, handing over the opened recording so its header is not parsed again.
+        self.createDeviceThread(name=name, deviceType="Replay", id=deviceInformation["id"], connection=deviceInformation["connection"], connect=True, handle=replay.reader)
+        self.toggleDeviceConnection(name, True)
+        self.notifier.notify("devices/" + name)
+        log.info("Replay of " + filepath + " added as device named " + name + ".")
 
     def addControlSettings(self, name):
         #  Configure control settings.
@@ -716,6 +1172,8 @@ class Manager(QObject):
 
         # Stop acquisition.
         self.timing.stop()
+        self.stopStreams()
+        self.captureCoordinator.stop()
         
         # Clear all previous data.
         log.info("Configuring devices.")
@@ -724,15 +1182,85 @@ class Manager(QObject):
     def run(self):
         # Set acquisition settings.
         self.assembly.clear_all_data()
-        self.initialiseDeviceSettings()
+        # Continue an unfinished recording only when the user chose to resume it, otherwise start a new file.
+        journal = self.resumeJournal
+        self.resumeJournal = None
+        self.initialiseDeviceSettings(journal)
 
         # Set feedback channels.
         self.setDeviceFeedbackChannels()
+
+        # Start hubs streaming together on a shared trigger if configured.
+        hubs = self.synchronisedHubs()
+        if len(hubs) > 1:
+            self.startSynchronisedAcquisition(hubs)
+
+        # Stream networked hubs through the device buffer so network latency spikes do not lose samples.
+        self.startBufferedAcquisition()
+
+        # Trigger cameras together on a shared capture schedule if configured.
+        self.startCoordinatedCapture()
         
         # Start acquisition.
         self.timing.start(self.configuration["global"]["controlRate"])
         log.info("Started acquisition and control.")
 
+    def synchronisedHubs(self):
+        """Return the enabled hubs to acquire on a shared trigger, with the hub that drives the trigger first."""
+        if self.configuration["global"].get("synchronise", False) != True:
+            return []
+        hubs = [device["name"] for device in self.deviceTableModel.enabledDevices() if device["type"] == "Hub"]
+        master = self.configuration["global"].get("synchronisationMaster")
+        if master in hubs:
+            hubs.remove(master)
+            hubs.insert(0, master)
+        return hubs
+
+    def startSynchronisedAcquisition(self, hubs):
+        """Arm a triggered stream on each hub, then fire the trigger from the first hub, which alone drives the trigger output."""
+        controlRate = self.configuration["global"]["controlRate"]
+        for name in hubs:
+            self.devices[name].start_stream(controlRate, master=(name == hubs[0]))
+        self.assembly.set_synchronised_devices(hubs)
+        self.devices[hubs[0]].fire_trigger()
+        log.info("Synchronised acquisition started on " + ", ".join(hubs) + ".")
+
+    def startBufferedAcquisition(self):
+        """Start a buffered stream on each enabled Ethernet or WiFi hub that is not already streaming."""
+        if self.configuration["global"].get("bufferNetworked", True) != True:
+            return
+        controlRate = self.configuration["global"]["controlRate"]
+        for device in self.deviceTableModel.enabledDevices():
+            name = device["name"]
+            if device["type"] == "Hub" and self.devices[name].streaming == False and self.devices[name].is_networked() == True:
+                self.devices[name].start_stream(controlRate, triggered=False)
+
+    def startCoordinatedCapture(self):
+        """Arm the enabled cameras for triggered capture, pulsing the trigger from a hub for hardware triggering."""
+        source = self.configuration["global"].get("cameraTrigger", "Off")
+        cameras = [self.devices[device["name"]] for device in self.deviceTableModel.enabledDevices() if device["type"] == "Camera"]
+        if source == "Off" or len(cameras) == 0:
+            return
+        trigger = None
+        if source == "Hardware":
+            hubs = [device["name"] for device in self.deviceTableModel.enabledDevices() if device["type"] == "Hub"]
+            name = self.configuration["global"].get("cameraTriggerHub")
+            if name not in hubs:
+                if len(hubs) == 0:
+                    log.warning("Hardware camera triggering needs an enabled hub, using the software trigger.")
+                    source = "Software"
+                else:
+                    name = hubs[0]
+            if source == "Hardware":
+                trigger = self.devices[name]
+        self.captureCoordinator.start(cameras, source, self.configuration["global"].get("captureRate", 10.0), self.configuration["global"]["controlRate"], trigger, self.firstCaptureIndex)
+
+    def stopStreams(self):
+        """Stop any hub streams started for synchronised or buffered acquisition."""
+        for name, device in self.devices.items():
+            if device.type == "Hub" and device.streaming == True:
+                device.stop_stream()
+
     @Slot()
     def refresh_devices(self):
         log.info("Refreshing devices.")
@@ -755,6 +1283,25 @@ class Manager(QObject):
             "controlRate": 100.00,
             "skipSamples": 1,
             "averageSamples": 1,
+            "synchronise": False,
+            "bufferNetworked": True,
+            "imageFormat": "jpeg",
+            "imageQuality": 90,
+            "imageWriters": 2,
+            "imageQueue": 32,
+            "rawQueue": 16,
+            "rawChunkBytes": 1073741824,
+            "compression": "none",
+            "compressionLevel": 3,
+            "rotateSize": 0,
+            "rotateDuration": 0,
+            "rotateBoundary": 0,
+            "journalInterval": 0,
+            "PIDLogInterval": 0,
+            "cameraTrigger": "Off",
+            "captureRate": 10.00,
+            "timeWidth": 8,
+            "timePrecision": 3,
             "path": home_dir,
             "filename": "junk"
             }
@@ -762,6 +1309,7 @@ class Manager(QObject):
             "x": 0,
             "y": 0
         }
+        self.notifier.set_configuration(self.configuration)
         self.configurationChanged.emit(self.configuration)
 
     @Slot(str)
@@ -773,6 +1321,7 @@ class Manager(QObject):
             
             # # Clear all underlying models and tables.
             self.configuration = {}
+            self.notifier.set_configuration(self.configuration)
             self.acquisitionTableModels = {}
             self.acquisitionTables = {}
             self.controlTableModels = {}
@@ -785,6 +1334,7 @@ class Manager(QObject):
                     with open(loadConfigurationPath, "r") as file:
                         yaml = YAML()
                         self.configuration = yaml.load(file)
+                        self.notifier.set_configuration(self.configuration)
                         log.info("Configuration file parsed.")
                         self.configurationPath = loadConfigurationPath
                         self.configurationChanged.emit(self.configuration)
@@ -826,6 +1376,8 @@ class Manager(QObject):
             with open(saveConfigurationPath, "w") as file:
                 yaml.dump(configuration, file)
             self.settings.setValue("configurationPath", saveConfigurationPath)
+            self.configurationPath = saveConfigurationPath
+            self.saveInventory()
             log.info("Saved configuration saved at " + saveConfigurationPath)
         else:
             log.info("Save configuration cancelled.")
@@ -856,8 +1408,7 @@ class Manager(QObject):
 
     @Slot(bool)
     def updateDarkMode(self, newDarkMode):
-        self.configuration["global"]["darkMode"] = newDarkMode
-        self.configurationChanged.emit(self.configuration) 
+        self.notifier.set("global/darkMode", newDarkMode)
         log.info("New darkMode = " + str(newDarkMode))
 
     def resetColourSelector(self):
@@ -934,6 +1485,19 @@ class Manager(QObject):
                 genericChannelsData.append(
                 {"plot": False, "name": "n" , "device": device["name"], "colour": self.setColourDefault(),
                 "value": "0", "unit": "-"})
+            elif self.devices[name].type == "Press":
+                settings = self.configuration["devices"][name]["control"][0]["settings"]
+                units = {"position": settings["primaryUnit"], "load": settings["feedbackUnit"], "status": "-"}
+                for channel in pollChannels:
+                    genericChannelsData.append(
+                    {"plot": False, "name": channel.capitalize(), "device": device["name"], "colour": self.setColourDefault(),
+                    "value": "0.00", "unit": units[channel]})
+            elif self.devices[name].type == "Replay":
+                # Recorded channels keep their original device, so plots set up for the live devices carry over.
+                for channel in self.devices[name].channels:
+                    genericChannelsData.append(
+                    {"plot": False, "name": channel["name"], "device": channel["device"], "colour": self.setColourDefault(),
+                    "value": "0.00", "unit": channel["unit"]})
         return genericChannelsData
 
     @Slot()
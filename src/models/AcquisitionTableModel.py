@@ -1,4 +1,5 @@
 from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex, Signal
+from textformatter import defaultWidth, defaultPrecision
 import logging 
 
 log = logging.getLogger(__name__)
@@ -18,6 +19,8 @@ class AcquisitionTableModel(QAbstractTableModel):
                 "slope",
                 "offset",
                 "autozero",
+                "width",
+                "precision",
             ]    
 
         log.info("Acquisition table model instantiated.")
@@ -33,7 +36,7 @@ class AcquisitionTableModel(QAbstractTableModel):
     def columnCount(self, parent=QModelIndex()):
         if parent.isValid():
             return 0
-        return len(self._data[0])-1
+        return len(self._column_name)
 
     def data(self, index, role):
         if role == Qt.TextAlignmentRole:
@@ -53,6 +56,10 @@ class AcquisitionTableModel(QAbstractTableModel):
                     return float(item["offset"])
                 elif index.column() == 5:
                     return item["autozero"]
+                elif index.column() == 6:
+                    return int(item.get("width", defaultWidth))
+                elif index.column() == 7:
+                    return int(item.get("precision", defaultPrecision))
         elif role == Qt.CheckStateRole:
             if index.isValid():
                 if index.column()==0:
@@ -85,6 +92,10 @@ class AcquisitionTableModel(QAbstractTableModel):
                 item["offset"] = value
             elif index.column() == 5:
                 item["autozero"] = value
+            elif index.column() == 6:
+                item["width"] = value
+            elif index.column() == 7:
+                item["precision"] = value
             self.dataChanged.emit(index, index, [])
             return True
         else:
@@ -101,6 +112,11 @@ class AcquisitionTableModel(QAbstractTableModel):
         if index.isValid():
             return Qt.ItemIsEnabled | Qt.ItemIsEditable
 
+    def refresh(self):
+        """Method to repaint the whole table after the underlying data is changed elsewhere."""
+        if len(self._data) > 0:
+            self.dataChanged.emit(self.createIndex(0, 0), self.createIndex(len(self._data) - 1, len(self._column_name) - 1), [])
+
     def acquisitionSettings(self):
         """Return lists containing the acquisition settings."""
         enabledChannels = []
@@ -119,6 +135,16 @@ class AcquisitionTableModel(QAbstractTableModel):
                 enabledAutozero.append(channel["autozero"])
         return enabledChannels, enabledNames, enabledUnits, enabledSlopes, enabledOffsets, enabledAutozero
 
+    def outputFormats(self):
+        """Return lists containing the output column width and precision of the enabled channels."""
+        enabledWidths = []
+        enabledPrecisions = []
+        for channel in self._data:
+            if channel["connect"] == True:
+                enabledWidths.append(channel.get("width", defaultWidth))
+                enabledPrecisions.append(channel.get("precision", defaultPrecision))
+        return enabledWidths, enabledPrecisions
+
     def enabledChannels(self):
         """Return a list containing the enabled channels."""
         enabledChannels = []
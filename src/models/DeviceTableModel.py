@@ -105,6 +105,14 @@ class DeviceTableModel(QAbstractTableModel):
 
         return True
 
+    def setConnect(self, name, value):
+        """Method to set whether a device is connected without signalling the change, for a connection that was refused."""
+        for row, device in enumerate(self._data):
+            if device["name"] == name:
+                device["connect"] = value
+                self.dataChanged.emit(self.createIndex(row, 0), self.createIndex(row, 0), [])
+                self.numberDevicesEnabled.emit(len(self.enabledDevices()))
+
     def enabledDevices(self):
         """Method to return a list of dicts of target device IDs with status currently enabled."""
         enabledDevices = []
@@ -0,0 +1,98 @@
+from PySide6.QtCore import QObject, Signal, Slot
+from contextlib import contextmanager
+import logging, sys
+
+log = logging.getLogger(__name__)
+
+class ConfigurationNotifier(QObject):
+    pathsChanged = Signal(list)
+
+    def __init__(self, configuration):
+        """ConfigurationNotifier init."""
+        super().__init__()
+        self.configuration = configuration
+        self.subscribers = []
+        self.depth = 0
+        self.pending = []
+        self.pathsChanged.connect(self.dispatch)
+
+    def set_configuration(self, configuration):
+        """Method to set the configuration dict that paths are resolved against."""
+        self.configuration = configuration
+
+    def split(self, path):
+        """Method to split a path such as devices/T7/acquisition/0/offset into keys."""
+        return [key for key in path.split("/") if key != ""]
+
+    def resolve(self, container, key):
+        """Method to convert a path key to an index if the container is a list."""
+        if isinstance(container, list):
+            return int(key)
+        return key
+
+    def get(self, path):
+        """Method to get the value at a path in the configuration."""
+        value = self.configuration
+        for key in self.split(path):
+            value = value[self.resolve(value, key)]
+        return value
+
+    def set(self, path, value):
+        """Method to set the value at a path in the configuration and notify subscribers."""
+        keys = self.split(path)
+        container = self.configuration
+        for key in keys[:-1]:
+            container = container[self.resolve(container, key)]
+        container[self.resolve(container, keys[-1])] = value
+        self.notify(path)
+
+    def notify(self, path):
+        """Method to record a changed path, which is published immediately unless in a transaction."""
+        path = "/".join(self.split(path))
+        if path not in self.pending:
+            self.pending.append(path)
+        if self.depth == 0:
+            self.flush()
+
+    @contextmanager
+    def transaction(self):
+        """Context manager to batch all changes made within it into a single notification."""
+        self.depth += 1
+        try:
+            yield self
+        finally:
+            self.depth -= 1
+            if self.depth == 0:
+                self.flush()
+
+    def flush(self):
+        """Method to publish pending changed paths."""
+        if len(self.pending) > 0:
+            paths = self.pending
+            self.pending = []
+            self.pathsChanged.emit(paths)
+
+    def subscribe(self, path, callback):
+        """Method to subscribe a callback to changes at, above or below a path."""
+        self.subscribers.append((self.split(path), callback))
+
+    def unsubscribe(self, callback):
+        """Method to remove all subscriptions for a callback."""
+        self.subscribers = [(keys, subscriber) for keys, subscriber in self.subscribers if subscriber != callback]
+
+    def matches(self, subscribed, changed):
+        """Method to check if a changed path is at, above or below a subscribed path."""
+        n = min(len(subscribed), len(changed))
+        return subscribed[:n] == changed[:n]
+
+    @Slot(list)
+    def dispatch(self, paths):
+        """Method to call each matching subscriber once with the list of changed paths."""
+        for keys, callback in list(self.subscribers):
+            matched = [path for path in paths if self.matches(keys, self.split(path))]
+            if len(matched) > 0:
+                try:
+                    callback(matched)
+                except Exception:
+                    e = sys.exc_info()[1]
+                    log.warning(e)
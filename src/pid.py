@@ -0,0 +1,113 @@
+import numpy as np
+
+# Per-axis contributions of the last controller update, for logging.
+pidTermsType = np.dtype([("dt", float), ("setpoint", float), ("error", float), ("proportional", float), ("integral", float), ("derivative", float), ("output", float)])
+
+class PIDArray:
+    """PID controllers for several axes evaluated together in one vectorised step.
+
+    Each update takes the time at which the feedback samples were taken, so the integral and
+    derivative terms use the sample interval rather than the time the update happened to run.
+    The terms follow simple_pid: derivative on measurement, optional proportional on measurement,
+    and the integral clamped to the output limits to prevent windup. Setpoints can be ramped at a
+    limited rate towards their target."""
+
+    def __init__(self, count):
+        self.count = count
+        self.Kp = np.zeros(count)
+        self.Ki = np.zeros(count)
+        self.Kd = np.zeros(count)
+        self.target = np.zeros(count)
+        self.setpoint = np.zeros(count)
+        self.rampRate = np.full(count, np.inf)
+        self.lower = np.full(count, -np.inf)
+        self.upper = np.full(count, np.inf)
+        self.proportionalOnMeasurement = np.zeros(count, dtype=bool)
+        self.auto = np.zeros(count, dtype=bool)
+        self.proportional = np.zeros(count)
+        self.integral = np.zeros(count)
+        self.derivative = np.zeros(count)
+        self.output = np.zeros(count)
+        self.lastInput = np.full(count, np.nan)
+        self.lastTime = np.full(count, np.nan)
+        self.terms = np.zeros(count, dtype=pidTermsType)
+
+    def mask(self, axes):
+        """Method to convert an axis index or boolean mask into a boolean mask."""
+        if np.ndim(axes) == 0:
+            return np.arange(self.count) == axes
+        return np.asarray(axes, dtype=bool)
+
+    def set_tunings(self, axis, Kp, Ki, Kd):
+        """Method to set the gains for an axis."""
+        self.Kp[axis], self.Ki[axis], self.Kd[axis] = Kp, Ki, Kd
+
+    def set_output_limits(self, axis, lower, upper):
+        """Method to set the output limits for an axis."""
+        self.lower[axis], self.upper[axis] = lower, upper
+        self.integral[axis] = np.clip(self.integral[axis], lower, upper)
+
+    def set_setpoint(self, axis, setpoint, ramp=False):
+        """Method to set the setpoint for an axis, ramping towards it at the ramp rate if requested."""
+        self.target[axis] = setpoint
+        if ramp == False or self.auto[axis] == False:
+            self.setpoint[axis] = setpoint
+
+    def set_ramp_rate(self, axis, rate):
+        """Method to set the maximum setpoint rate of change for an axis in units per second."""
+        self.rampRate[axis] = np.inf if rate == None or rate <= 0 else rate
+
+    def reset(self, axes):
+        """Method to clear the terms and history of the selected axes."""
+        mask = self.mask(axes)
+        self.proportional[mask] = 0
+        self.integral[mask] = 0
+        self.derivative[mask] = 0
+        self.output[mask] = 0
+        self.lastInput[mask] = np.nan
+        self.lastTime[mask] = np.nan
+
+    def set_auto_mode(self, axes, enabled, last_output=0.0):
+        """Method to switch the selected axes between manual and automatic, seeding the integral on switching to automatic."""
+        mask = self.mask(axes)
+        if enabled == True:
+            starting = mask & ~self.auto
+            self.reset(starting)
+            self.integral[starting] = np.clip(last_output, self.lower[starting], self.upper[starting])
+        self.auto[mask] = enabled
+
+    def __call__(self, feedback, timestamp, axes):
+        """Method to update the selected axes with their feedback values sampled at timestamp seconds and return their outputs."""
+        mask = self.mask(axes) & self.auto
+        feedback = np.broadcast_to(np.asarray(feedback, dtype=float), (self.count,))[mask]
+
+        # Sample interval, with a negligible first interval as in simple_pid.
+        dt = timestamp - self.lastTime[mask]
+        dt = np.where(np.isnan(dt) | (dt <= 0), 1e-16, dt)
+
+        # Ramp setpoints towards their targets.
+        step = self.rampRate[mask]*dt
+        setpoint = self.setpoint[mask] + np.clip(self.target[mask] - self.setpoint[mask], -step, step)
+
+        # Error terms.
+        error = setpoint - feedback
+        lastInput = self.lastInput[mask]
+        dInput = np.where(np.isnan(lastInput), 0.0, feedback - lastInput)
+        proportional = np.where(self.proportionalOnMeasurement[mask], self.proportional[mask] - self.Kp[mask]*dInput, self.Kp[mask]*error)
+        integral = np.clip(self.integral[mask] + self.Ki[mask]*error*dt, self.lower[mask], self.upper[mask])
+        derivative = -self.Kd[mask]*dInput/dt
+        output = np.clip(proportional + integral + derivative, self.lower[mask], self.upper[mask])
+
+        # Keep track of state.
+        self.setpoint[mask] = setpoint
+        self.proportional[mask] = proportional
+        self.integral[mask] = integral
+        self.derivative[mask] = derivative
+        self.output[mask] = output
+        self.lastInput[mask] = feedback
+        self.lastTime[mask] = timestamp
+        terms = self.terms[mask]
+        terms["dt"], terms["setpoint"], terms["error"] = dt, setpoint, error
+        terms["proportional"], terms["integral"], terms["derivative"], terms["output"] = proportional, integral, derivative, output
+        self.terms[mask] = terms
+        return self.output[self.mask(axes)]
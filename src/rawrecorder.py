@@ -0,0 +1,288 @@
+from PySide6.QtCore import QObject, Signal
+import json
+import logging
+import numpy as np
+import os
+import queue
+import sys
+import threading
+import time
+
+log = logging.getLogger(__name__)
+
+# Per frame record kept beside each chunk. Slots are marked written once their frame has been copied in.
+rawFrameType = np.dtype([("number", "<i8"), ("frameId", "<i8"), ("timestamp", "<i8"), ("written", "u1")])
+
+class RawRecorder:
+    """Records raw sensor frames into preallocated, memory-mapped .npy chunks.
+
+    Each chunk holds a fixed number of frames, so recording a frame is a single copy into the
+    page cache with no encoding. The image number, frame id and timestamp of each frame go into a
+    small memory-mapped record file beside its chunk, and a JSON sidecar describing the chunks and
+    the Bayer pattern is rewritten as each chunk starts, so a recording cut short can still be
+    debayered offline. The last chunk is trimmed to the frames recorded on closing. With append set,
+    recording continues in new chunks after those of an existing recording, trimming its last chunk."""
+
+    def __init__(self, basepath, shape, dtype, pattern="None", chunkFrames=500, append=False, chunkBytes=1073741824):
+        """RawRecorder init."""
+        self.basepath = basepath
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        self.pattern = pattern
+        # Large sensors get fewer frames per chunk, so preallocating a chunk never reserves more than chunkBytes.
+        self.chunkFrames = max(1, min(int(chunkFrames), int(chunkBytes)//max(1, int(np.prod(self.shape))*self.dtype.itemsize)))
+        self.name = ""
+        self.chunks = []
+        self.chunk = None
+        self.records = None
+        self.position = 0
+        self.frames = 0
+        if append == True and os.path.exists(self.sidecar_path()):
+            self.continue_recording()
+
+    def continue_recording(self):
+        """Method to take over the chunks of an existing recording, trimming its last chunk to the frames marked written."""
+        with open(self.sidecar_path()) as file:
+            sidecar = json.load(file)
+        self.chunks = sidecar["chunks"]
+        if len(self.chunks) > 0:
+            index = len(self.chunks)-1
+            count = int(np.count_nonzero(np.load(self.records_path(index), mmap_mode="r")["written"]))
+            trim_chunk(self.chunk_path(index), count)
+            trim_chunk(self.records_path(index), count)
+            self.chunks[-1]["frames"] = count
+        self.frames = sum(chunk["frames"] for chunk in self.chunks)
+        log.info("Continuing raw recording {path} after {frames} frames.".format(path=self.sidecar_path(), frames=self.frames))
+
+    def chunk_path(self, index):
+        """Method to get the path of a chunk file."""
+        return "{base}_raw_{index:04d}.npy".format(base=self.basepath, index=index)
+
+    def records_path(self, index):
+        """Method to get the path of the frame records of a chunk."""
+        return "{base}_raw_{index:04d}_frames.npy".format(base=self.basepath, index=index)
+
+    def sidecar_path(self):
+        """Method to get the path of the JSON sidecar."""
+        return self.basepath + "_raw.json"
+
+    def next_chunk(self):
+        """Method to flush the current chunk, preallocate the next one and list it in the sidecar."""
+        self.flush()
+        index = len(self.chunks)
+        self.chunk = np.lib.format.open_memmap(self.chunk_path(index), mode="w+", dtype=self.dtype, shape=(self.chunkFrames,) + self.shape)
+        self.records = np.lib.format.open_memmap(self.records_path(index), mode="w+", dtype=rawFrameType, shape=(self.chunkFrames,))
+        self.chunks.append({"file": os.path.basename(self.chunk_path(index)), "records": os.path.basename(self.records_path(index)), "frames": 0})
+        self.position = 0
+        self.write_sidecar()
+        log.info("Preallocated raw frame chunk " + self.chunk_path(index) + ".")
+
+    def write(self, name, frame, number, frameId=-1, timestamp=-1):
+        """Method to copy a frame into the next free slot and record its image number, frame id and timestamp."""
+        if frame.shape != self.shape or frame.dtype != self.dtype:
+            raise ValueError("Raw frame of shape {shape} and type {dtype} does not match the recording.".format(shape=frame.shape, dtype=frame.dtype))
+        self.name = name
+        if self.chunk is None or self.position == self.chunkFrames:
+            if self.chunk is not None:
+                self.chunks[-1]["frames"] = self.position
+            self.next_chunk()
+        np.copyto(self.chunk[self.position], frame)
+        self.records[self.position] = (number, frameId, timestamp, 1)
+        self.position += 1
+        self.frames += 1
+
+    def flush(self):
+        """Method to flush the current chunk and its frame records to disk."""
+        if self.chunk is not None:
+            self.chunk.flush()
+            self.records.flush()
+
+    def write_sidecar(self):
+        """Method to replace the sidecar with one describing the chunks started so far."""
+        sidecar = {
+            "name": self.name,
+            "pattern": self.pattern,
+            "shape": list(self.shape),
+            "dtype": self.dtype.str,
+            "chunks": self.chunks,
+        }
+        temporary = self.sidecar_path() + ".tmp"
+        with open(temporary, "w") as file:
+            json.dump(sidecar, file)
+        os.replace(temporary, self.sidecar_path())
+
+    def close(self):
+        """Method to flush the last chunk, trim it to the frames recorded and write the final sidecar."""
+        if self.chunk is None:
+            return
+        self.flush()
+        self.chunks[-1]["frames"] = self.position
+        self.chunk = None
+        self.records = None
+        trim_chunk(self.chunk_path(len(self.chunks)-1), self.position)
+        trim_chunk(self.records_path(len(self.chunks)-1), self.position)
+        self.write_sidecar()
+        log.info("Raw recording of {frames} frames closed with sidecar {path}.".format(frames=self.frames, path=self.sidecar_path()))
+
+class RawWriter(QObject):
+    """Thread that copies raw frames into a recording for each camera from a bounded queue.
+
+    As with the image writer, frames are dropped rather than queued once the queue is full, so chunk
+    preallocation and page cache writeback never stall the thread that submits them. Each camera's
+    recording is created on the writer thread from its first frame."""
+    statisticsChanged = Signal(dict)
+
+    def __init__(self, size=16, chunkBytes=1073741824, reportInterval=10):
+        """RawWriter init."""
+        super().__init__()
+        self.worker = None
+        self.queue = None
+        self.recorders = {}
+        self.lock = threading.Lock()
+        self.reportInterval = reportInterval
+        self.configure(size, chunkBytes)
+
+    def configure(self, size=16, chunkBytes=1073741824):
+        """Method to restart the writer with the given queue size and largest chunk in bytes."""
+        self.stop()
+        self.chunkBytes = int(chunkBytes)
+        self.queue = queue.Queue(maxsize=int(size))
+        self.reset_statistics()
+        self.worker = threading.Thread(target=self.work, name="RawWriter", daemon=True)
+        self.worker.start()
+        log.info("Raw writer started with a queue of {size} frames.".format(size=size))
+
+    def reset_statistics(self):
+        """Method to reset the frame counters."""
+        with self.lock:
+            self.submitted = 0
+            self.written = 0
+            self.dropped = 0
+            self.failed = 0
+            self.bytes = 0
+            self.start = time.monotonic()
+            self.lastReport = self.start
+
+    def submit(self, name, basepath, frame, metadata, append=False):
+        """Method to queue a raw frame for recording, returning False if the queue is full and the frame is dropped."""
+        try:
+            self.queue.put_nowait((name, basepath, frame, metadata, append))
+            with self.lock:
+                self.submitted += 1
+            return True
+        except queue.Full:
+            with self.lock:
+                self.dropped += 1
+            log.warning("Raw writer queue full, frame dropped.")
+            return False
+
+    def record(self, name, basepath, frame, metadata, append):
+        """Method to copy a frame into the recording for its camera, creating the recording on its first frame."""
+        if name not in self.recorders:
+            self.recorders[name] = RawRecorder(basepath, frame.shape, frame.dtype, metadata["pattern"], append=append, chunkBytes=self.chunkBytes)
+        self.recorders[name].write(name, frame, metadata["number"], metadata["frameId"], metadata["timestamp"])
+
+    def close_recorders(self):
+        """Method to close every recording and write their sidecars."""
+        for recorder in self.recorders.values():
+            try:
+                recorder.close()
+            except Exception:
+                e = sys.exc_info()[1]
+                log.warning(e)
+        self.recorders = {}
+
+    def work(self):
+        """Worker loop that records frames, closing the recordings on a close request, until it receives None."""
+        while True:
+            item = self.queue.get()
+            if item == None:
+                self.close_recorders()
+                self.queue.task_done()
+                return
+            if item == "close":
+                self.close_recorders()
+                self.queue.task_done()
+                continue
+            try:
+                self.record(*item)
+                with self.lock:
+                    self.written += 1
+                    self.bytes += item[2].nbytes
+            except Exception:
+                e = sys.exc_info()[1]
+                with self.lock:
+                    self.failed += 1
+                log.warning(e)
+            finally:
+                self.queue.task_done()
+            self.report(interval=self.reportInterval)
+
+    def statistics(self):
+        """Method to get the frame counters and measured throughput."""
+        with self.lock:
+            elapsed = max(time.monotonic() - self.start, 1e-9)
+            return {
+                "queued": self.queue.qsize(),
+                "submitted": self.submitted,
+                "written": self.written,
+                "dropped": self.dropped,
+                "failed": self.failed,
+                "framesPerSecond": self.written/elapsed,
+                "megabytesPerSecond": self.bytes/elapsed/1e6,
+            }
+
+    def report(self, interval=0):
+        """Method to log and emit the statistics if at least interval seconds have passed since the last report."""
+        now = time.monotonic()
+        with self.lock:
+            if now - self.lastReport < interval:
+                return
+            self.lastReport = now
+        statistics = self.statistics()
+        log.info("Raw writer: {written} written, {queued} queued, {dropped} dropped, {framesPerSecond:.1f} frames/s, {megabytesPerSecond:.1f} MB/s.".format(**statistics))
+        self.statisticsChanged.emit(statistics)
+
+    def close(self):
+        """Method to wait until every queued frame has been recorded and then close the recordings."""
+        if self.queue != None:
+            self.queue.put("close")
+            self.queue.join()
+
+    def stop(self):
+        """Method to record the queued frames, close the recordings and stop the worker."""
+        if self.worker != None:
+            self.queue.put(None)
+            self.worker.join()
+        self.worker = None
+
+def trim_chunk(path, frames):
+    """Function to cut a preallocated chunk file down to its first frames."""
+    array = np.load(path, mmap_mode="r")
+    if array.shape[0] > frames:
+        temporary = path[:-len(".npy")] + "_trim.npy"
+        np.save(temporary, array[:frames])
+        del array
+        os.replace(temporary, path)
+
+def read_raw(sidecarPath):
+    """Function to open a raw recording, returning its sidecar with the frame records added and a list of (number, frame) pairs backed by memory maps.
+
+    Only the frames marked written in the records are returned, so a recording that was never closed reads up to its last complete frame."""
+    with open(sidecarPath) as file:
+        sidecar = json.load(file)
+    directory = os.path.dirname(os.path.abspath(sidecarPath))
+    frames = []
+    records = []
+    for chunk in sidecar["chunks"]:
+        array = np.load(os.path.join(directory, chunk["file"]), mmap_mode="r")
+        chunkRecords = np.load(os.path.join(directory, chunk["records"]), mmap_mode="r")
+        count = int(np.count_nonzero(chunkRecords["written"]))
+        records.append(np.array(chunkRecords[:count]))
+        for position in range(count):
+            frames.append(array[position])
+    records = np.concatenate(records) if len(records) > 0 else np.zeros(0, dtype=rawFrameType)
+    sidecar["numbers"] = records["number"].tolist()
+    sidecar["frameIds"] = records["frameId"].tolist()
+    sidecar["timestamps"] = records["timestamp"].tolist()
+    return sidecar, list(zip(sidecar["numbers"], frames))
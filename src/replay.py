@@ -0,0 +1,208 @@
+"""Replay a recorded CamLab data file through the acquisition pipeline.
+
+Usage: python replay.py <file> [--speed N] [--block ROWS]
+
+Run from the command line, the recording is replayed headless through the assembly and output formatting as
+fast as possible, or at N times real time, and the throughput of the whole post-acquisition pipeline is logged.
+"""
+from PySide6.QtCore import QObject, Signal, Slot
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import numpy as np
+from time import monotonic, sleep
+from lazy import lazy_import
+from compressedfile import compressedExtensions
+from datafile import DataFile
+from imagewriter import imageExtensions
+
+Image = lazy_import("PIL.Image")
+
+log = logging.getLogger(__name__)
+
+class Replay(QObject):
+    """Device that plays a recorded data file back through the acquisition pipeline in place of live hardware.
+
+    On each control tick it emits the rows whose recorded time has come due at the replay speed, in the same
+    block format as a hub, so the assembly, plots and output treat the recording as live data. A speed of zero
+    replays as fast as possible, blockRows rows per tick. The recording is read a chunk at a time as its rows
+    come due, so a long recording is never held in memory whole. The saved images of one recorded camera can be shown
+    in a preview as their image numbers come up in the recording."""
+    emitData = Signal(str, np.ndarray)
+    previewImage = Signal(np.ndarray)
+    replayFinished = Signal(str)
+
+    def __init__(self, name, id, connection, recording=None):
+        """Replay init."""
+        super().__init__()
+        self.type = "Replay"
+        self.name = name
+        self.id = id
+        self.connection = connection
+        self.speed = 1.0
+        self.blockRows = 1000
+        self.camera = None
+        self.chunkSize = 1048576
+        self.data = np.empty((0, 1))
+        self.channels = []
+        self.cameras = []
+        self.eventColumns = []
+        self.finished = True
+        if recording != None:
+            self.open(recording)
+
+    def open(self, recording):
+        """Method to open a recording, given by its path or as an already opened DataFile, and read the channels in its header."""
+        self.reader = recording if isinstance(recording, DataFile) else DataFile(recording)
+        self.filepath = self.reader.filepath
+        self.channels = self.reader.channels[1:]
+        self.cameras = [channel["device"] for channel in self.channels if channel["channel"] == "IMG#"]
+        self.eventColumns = [index for index, channel in enumerate(self.channels) if channel["channel"] == "IMG#"]
+        log.info("Recording {path} opened for replay with {columns} channels.".format(path=self.filepath, columns=len(self.channels)))
+
+    def set_replay_settings(self, speed=1.0, blockRows=1000, camera=None):
+        """Method to set the replay speed as a multiple of real time, zero for as fast as possible, and the camera to preview."""
+        self.speed = float(speed)
+        self.blockRows = max(1, int(blockRows))
+        self.camera = camera if camera in self.cameras else None
+        log.info("Replay of {name} set to {speed}.".format(name=self.name, speed="maximum speed" if self.speed <= 0 else "{speed:g}x real time".format(speed=self.speed)))
+
+    def image_prefix(self):
+        """Method to get the path prefix of the images saved with the recording."""
+        stem = self.filepath
+        for extension in compressedExtensions.values():
+            if stem.endswith(extension):
+                stem = stem[:-len(extension)]
+        stem = os.path.splitext(stem)[0]
+        # Output files are numbered segments of the recording, and images are named from the recording stem.
+        head, _, segment = stem.rpartition("_")
+        if segment.isdigit() == True:
+            stem = head
+        return stem + "_" + str(self.camera) + "_"
+
+    def initialise(self):
+        """Method to rewind to the start of the recording, leaving the rows to be read as they come due."""
+        self.offset = self.reader.dataOffset
+        self.data = np.empty((0, len(self.channels) + 1))
+        self.rows = 0
+        self.firstTime = 0.0
+        self.lastTime = 0.0
+        self.startTime = None
+        self.imageNumber = None
+        self.imageColumn = None
+        if self.camera != None:
+            self.imageColumn = 1 + [channel["device"] if channel["channel"] == "IMG#" else None for channel in self.channels].index(self.camera)
+            self.imagePrefix = self.image_prefix()
+        self.finished = self.offset >= self.reader.size
+        log.info("Replay of {name} rewound to the start of {path}.".format(name=self.name, path=self.filepath))
+
+    def fill(self, due=None):
+        """Method to read chunks of the recording until the rows read run past a recorded time, or number blockRows if no time is given."""
+        while self.offset < self.reader.size:
+            if len(self.data) > 0 and (self.data[-1,0] > due if due != None else len(self.data) >= self.blockRows):
+                break
+            rows, self.offset = self.reader.read_rows(self.offset, self.chunkSize)
+            self.data = np.vstack((self.data, rows))
+
+    def next_block(self, now):
+        """Method to get the rows due at a host time as a device data block, prefixed with the device and host timestamps."""
+        if self.startTime == None:
+            self.startTime = now
+            self.fill()
+            if len(self.data) > 0:
+                self.firstTime = self.data[0,0]
+        if self.speed > 0:
+            due = self.firstTime + (now - self.startTime)*self.speed
+            self.fill(due)
+            end = int(np.searchsorted(self.data[:,0], due, side="right"))
+        else:
+            self.fill()
+            end = self.blockRows
+        rows = self.data[:end]
+        self.data = self.data[end:]
+        self.rows += len(rows)
+        if len(rows) > 0:
+            self.lastTime = rows[-1,0]
+        # The recorded time is the device clock, and the host clock runs from the start of the replay at the same rate.
+        times = rows[:,0]
+        return np.column_stack((times, self.startTime + times - self.firstTime, rows[:,1:]))
+
+    def preview(self, block):
+        """Method to show the saved image for the last image number in a block."""
+        numbers = block[:, self.imageColumn + 1]
+        numbers = numbers[np.isfinite(numbers)]
+        if len(numbers) == 0 or numbers[-1] == self.imageNumber:
+            return
+        number = numbers[-1]
+        self.imageNumber = number
+        for extension in imageExtensions.values():
+            filepath = self.imagePrefix + str(int(number)) + extension
+            if os.path.exists(filepath):
+                try:
+                    image = np.load(filepath) if extension == ".npy" else np.asarray(Image.open(filepath))
+                    self.previewImage.emit(image)
+                except Exception:
+                    e = sys.exc_info()[1]
+                    log.warning(e)
+                return
+
+    @Slot()
+    def process(self):
+        """Method to emit the rows of the recording that are due on this tick."""
+        if self.finished == True:
+            return
+        now = monotonic()
+        block = self.next_block(now)
+        if len(block) > 0:
+            self.emitData.emit(self.name, block)
+            if self.imageColumn != None:
+                self.preview(block)
+        if len(self.data) == 0 and self.offset >= self.reader.size:
+            self.finished = True
+            elapsed = max(now - self.startTime, 1e-9)
+            log.info("Replay of {name} finished: {rows} rows in {elapsed:.3f} s, {rate:.0f} rows/s at {factor:.1f}x real time.".format(name=self.name, rows=self.rows, elapsed=elapsed, rate=self.rows/elapsed, factor=(self.lastTime - self.firstTime)/elapsed))
+            self.replayFinished.emit(self.name)
+
+def benchmark(filepath, speed=0.0, blockRows=1000, controlRate=None):
+    """Function to replay a recording headless through the assembly into a temporary output file, logging the pipeline throughput."""
+    from assembly import Assembly
+    replay = Replay("Replay", "N/A", 0, filepath)
+    replay.set_replay_settings(speed, blockRows)
+    replay.initialise()
+    times, _ = replay.reader.read_rows(replay.reader.dataOffset, replay.chunkSize, [0])
+    if len(times) < 2:
+        raise ValueError("{path} has too few rows to replay.".format(path=filepath))
+    if controlRate == None:
+        controlRate = 1/np.median(np.diff(times[:,0]))
+    assembly = Assembly()
+    # A replay has a single clock, so there is nothing to report about clock alignment.
+    assembly.reportInterval = np.inf
+    assembly.create_data_arrays([{"name": replay.name, "type": "Replay"}])
+    assembly.set_event_columns(replay.name, replay.eventColumns)
+    assembly.define_settings(controlRate, 1, 1)
+    directory = tempfile.mkdtemp()
+    assembly.set_filename(directory, "replay", "benchmark", "0", ".txt")
+    assembly.write_header(replay.reader.read_bytes(0, replay.reader.dataOffset).decode())
+    replay.emitData.connect(assembly.update_new_data)
+    start = monotonic()
+    while replay.finished == False:
+        replay.process()
+        assembly.update_output_data()
+        if speed > 0:
+            sleep(1/controlRate)
+    elapsed = monotonic() - start
+    assembly.close_file()
+    size = os.path.getsize(assembly.filepath)
+    log.info("Pipeline replayed {rows} rows of {columns} columns in {elapsed:.3f} s: {rate:.0f} rows/s, {count} rows written ({size:.1f} MB) to {path}.".format(rows=replay.rows, columns=len(replay.channels) + 1, elapsed=elapsed, rate=replay.rows/elapsed, count=assembly.count, size=size/1e6, path=assembly.filepath))
+    return replay.rows/elapsed
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    parser = argparse.ArgumentParser(description="Replay a CamLab recording through the acquisition pipeline and log its throughput.")
+    parser.add_argument("file", help="CamLab data file (.txt, .txt.gz or .txt.zst)")
+    parser.add_argument("--speed", type=float, default=0.0, help="multiple of real time, zero for as fast as possible")
+    parser.add_argument("--block", type=int, default=1000, help="rows per tick at maximum speed")
+    args = parser.parse_args()
+    benchmark(args.file, args.speed, args.block)
@@ -0,0 +1,173 @@
+"""Format blocks of output data as tab separated text with per-column width and precision.
+
+Usage: python textformatter.py [--rows N] [--columns N]
+"""
+import argparse
+import io
+import logging
+import time
+import numpy as np
+
+log = logging.getLogger(__name__)
+
+# Default column format, matching the fmt='%8.3f' the output files have always used.
+defaultWidth = 8
+defaultPrecision = 3
+
+class TextFormatter:
+    """Formats blocks of data as text, producing the same bytes as np.savetxt with one %W.Pf format per column.
+
+    Rather than formatting each value through Python, every value is rounded to a fixed point integer
+    and its characters are built with whole-array integer arithmetic, one character position at a time,
+    straight into a buffer of fixed width rows. Values whose rounding is ambiguous in binary, values too
+    large for the fixed point integers, NaN and infinity are few and are formatted by the % operator
+    instead, as are whole rows holding a value too wide for its column, so the output is always
+    identical to printf."""
+
+    def __init__(self, widths=None, precisions=None, columns=None):
+        """TextFormatter init."""
+        self.set_formats(widths, precisions, columns)
+
+    def set_formats(self, widths=None, precisions=None, columns=None):
+        """Method to set the width and precision of each column, using the default format for any not given."""
+        if columns == None:
+            columns = max(len(widths or []), len(precisions or []))
+        widths = list(widths or []) + [defaultWidth]*columns
+        precisions = list(precisions or []) + [defaultPrecision]*columns
+        self.widths = np.array([int(width) for width in widths[:columns]], dtype=np.int64)
+        self.precisions = np.clip(np.array([int(precision) for precision in precisions[:columns]], dtype=np.int64), 0, 15)
+        self.scales = 10.0**self.precisions
+        self.fallbackFormats = ["%{width}.{precision}f".format(width=width, precision=precision) for width, precision in zip(self.widths, self.precisions)]
+
+    def columns(self):
+        """Method to get the number of columns formatted."""
+        return len(self.widths)
+
+    def runs(self):
+        """Method to split the columns into runs of neighbours with the same format, as (first, last, width, precision, offset) tuples."""
+        runs = []
+        offset = 0
+        first = 0
+        for column in range(1, self.columns() + 1):
+            if column == self.columns() or self.widths[column] != self.widths[first] or self.precisions[column] != self.precisions[first]:
+                width, precision = int(self.widths[first]), int(self.precisions[first])
+                runs.append((first, column, width, precision, offset))
+                offset += (column - first)*(width + 1)
+                first = column
+        return runs, offset
+
+    def format(self, data):
+        """Method to format a two dimensional block of data as bytes, one tab separated line per row."""
+        data = np.atleast_2d(np.asarray(data, dtype=float))
+        rows, columns = np.shape(data)
+        if rows == 0:
+            return b""
+        if columns != self.columns():
+            self.set_formats(self.widths.tolist(), self.precisions.tolist(), columns)
+        scaled = np.abs(data)*self.scales
+        rounded = np.rint(scaled)
+        # Fall back to the % operator where the fixed point integer cannot reproduce printf exactly.
+        with np.errstate(invalid="ignore"):
+            tie = np.abs(np.abs(scaled - rounded) - 0.5) <= scaled*1e-15
+            fallback = ~np.isfinite(scaled) | (scaled >= 2.0**52) | tie
+        rounded[fallback] = 0
+        largest = rounded.max()
+        # Narrower integers make every step of the digit arithmetic cheaper.
+        values = rounded.astype(np.int32 if largest < 2**31 else np.int64)
+        negative = np.signbit(data) & ~fallback
+
+        # Count the digits before the decimal point, at least one, without dividing.
+        digits = np.ones(np.shape(values), dtype=np.int8)
+        for count in range(1, 19):
+            # Fixed point values are below 2**52, so capping the exponent keeps the thresholds within int64.
+            thresholds = 10**np.minimum(self.precisions + count, 18)
+            if largest < thresholds.min():
+                break
+            digits += values >= thresholds
+        lengths = digits + negative + ((self.precisions > 0) + self.precisions).astype(np.int8)
+
+        # Rows with a value wider than its column are not fixed width, so they are formatted by the % operator.
+        irregular = (lengths > self.widths).any(axis=1)
+        fallbackText = {}
+        for row, column in zip(*np.nonzero(fallback)):
+            text = self.fallbackFormats[column] % data[row, column]
+            if len(text) > self.widths[column]:
+                irregular[row] = True
+            fallbackText[(row, column)] = text
+
+        # Build the fixed width rows character by character, from the last character of each value to the first,
+        # across runs of neighbouring columns with the same format so that every step is one strided array write.
+        runs, rowBytes = self.runs()
+        characters = np.full((rows, rowBytes), ord(" "), dtype=np.uint8)
+        for first, last, width, precision, offset in runs:
+            cells = characters[:,offset:offset + (last - first)*(width + 1)].reshape(rows, last - first, width + 1)
+            cells[:,:,width] = ord("\t")
+            if width < precision + (precision > 0) + 1:
+                # No value fits, so every row is irregular.
+                continue
+            remaining = values[:,first:last]
+            runDigits = digits[:,first:last]
+            # The minus sign goes in the position after the last digit.
+            signs = np.where(negative[:,first:last], runDigits, -1).astype(np.int8)
+            position = width - 1
+            for _ in range(precision):
+                quotient = remaining//10
+                cells[:,:,position] = (remaining - quotient*10).astype(np.uint8) + ord("0")
+                remaining = quotient
+                position -= 1
+            if precision > 0:
+                cells[:,:,position] = ord(".")
+                position -= 1
+            for count in range(int(runDigits.max()) + 1):
+                if position < 0:
+                    break
+                quotient = remaining//10
+                digit = (remaining - quotient*10).astype(np.uint8) + ord("0")
+                cells[:,:,position] = np.where(count < runDigits, digit, np.where(signs == count, np.uint8(ord("-")), np.uint8(ord(" "))))
+                remaining = quotient
+                position -= 1
+            for (row, column), text in fallbackText.items():
+                if first <= column < last and len(text) <= width:
+                    cells[row, column - first, :width] = np.frombuffer(text.encode(), dtype=np.uint8)
+        characters[:,-1] = ord("\n")
+
+        if irregular.any() == False:
+            return characters.tobytes()
+        rowFormat = "\t".join(self.fallbackFormats) + "\n"
+        pieces = []
+        start = 0
+        for row in np.nonzero(irregular)[0]:
+            pieces.append(characters[start:row].tobytes())
+            pieces.append((rowFormat % tuple(data[row])).encode())
+            start = row + 1
+        pieces.append(characters[start:].tobytes())
+        return b"".join(pieces)
+
+    def write(self, file, data):
+        """Method to format a block of data and write it to a binary file."""
+        file.write(self.format(data))
+
+def benchmark(rows=20000, columns=50):
+    """Function to compare the rows per second of np.savetxt and TextFormatter on random data."""
+    data = np.random.default_rng(0).normal(scale=100, size=(rows, columns))
+    formatter = TextFormatter(columns=columns)
+    results = {}
+    begin = time.perf_counter()
+    buffer = io.BytesIO()
+    np.savetxt(buffer, data, fmt='%8.3f', delimiter='\t', newline='\n')
+    results["np.savetxt"] = time.perf_counter() - begin
+    begin = time.perf_counter()
+    text = formatter.format(data)
+    results["TextFormatter"] = time.perf_counter() - begin
+    assert text == buffer.getvalue()
+    for name, duration in results.items():
+        log.info("{name:>16}: {rate:10.0f} rows/s".format(name=name, rate=rows/duration))
+    return results
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    parser = argparse.ArgumentParser(description="Benchmark the output text formatter against np.savetxt.")
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--columns", type=int, default=50)
+    args = parser.parse_args()
+    benchmark(args.rows, args.columns)
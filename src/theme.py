@@ -0,0 +1,97 @@
+import os, sys
+import hashlib
+import logging
+from pathlib import Path
+from PySide6.QtCore import QDir
+from PySide6.QtGui import QColor, QGuiApplication, QPalette
+import local_qt_material as qt_material
+
+log = logging.getLogger(__name__)
+
+class ThemeManager:
+    """Compiles each qt-material theme once and caches the stylesheet in memory and on disk."""
+
+    def __init__(self):
+        """ThemeManager init."""
+        self.css = os.path.abspath(os.path.join(Path(__file__).parent, "CamLab.css"))
+        self.directory = os.path.join(qt_material.RESOURCES_PATH, "camlab")
+        self.themes = {}
+        self.active = None
+        self.fonts = False
+
+    def theme_name(self, darkMode):
+        """Method to get the qt-material theme file for the darkMode boolean."""
+        if darkMode == True:
+            return "dark_blue.xml"
+        else:
+            return "light_blue.xml"
+
+    def hash(self, name, density):
+        """Method to hash the template, theme and CamLab stylesheet so that edits invalidate the disk cache."""
+        digest = hashlib.sha1()
+        theme = os.path.join(os.path.dirname(qt_material.__file__), "themes", name)
+        for path in [qt_material.TEMPLATE_FILE, theme, self.css]:
+            with open(path, "rb") as file:
+                digest.update(file.read())
+        digest.update(str(density).encode())
+        return digest.hexdigest()[:16]
+
+    def compile(self, darkMode, density):
+        """Method to compile a theme, loading it from the disk cache if the hash matches."""
+        name = self.theme_name(darkMode)
+        key = self.hash(name, density)
+        parent = "camlab/" + key
+        index = os.path.join(self.directory, key)
+        path_to_qss = os.path.join(index, "stylesheet.qss")
+        stylesheet = None
+        if os.path.isfile(path_to_qss) and os.path.isdir(os.path.join(index, "primary")):
+            with open(path_to_qss) as file:
+                stylesheet = file.read()
+            theme = qt_material.get_theme(name)
+            log.info("Loaded cached stylesheet for " + name + ".")
+        if stylesheet == None:
+            # Render the qt-material template and icons into a directory unique to this theme.
+            stylesheet = qt_material.build_stylesheet(name, extra={"density_scale": str(density)}, parent=parent)
+            theme = qt_material.get_theme(name)
+            with open(self.css) as file:
+                stylesheet = stylesheet + file.read().format(**os.environ)
+            try:
+                with open(path_to_qss, "w") as file:
+                    file.write(stylesheet)
+            except Exception:
+                e = sys.exc_info()[1]
+                log.warning(e)
+            log.info("Compiled stylesheet for " + name + ".")
+        environ = {}
+        for variable in os.environ:
+            if variable in theme or variable.startswith("QTMATERIAL_"):
+                environ[variable] = os.environ[variable]
+        self.themes[(darkMode, density)] = {"key": key, "index": index, "stylesheet": stylesheet, "environ": environ, "primaryColor": theme["primaryColor"]}
+        return self.themes[(darkMode, density)]
+
+    def activate(self, entry):
+        """Method to point the environment, icon search path and palette at a compiled theme."""
+        if self.fonts == False:
+            qt_material.add_fonts()
+            self.fonts = True
+        if self.active == entry["key"]:
+            return
+        os.environ.update(entry["environ"])
+        QDir.setSearchPaths("icon", [entry["index"]])
+        palette = QGuiApplication.palette()
+        color = QColor(*[int(entry["primaryColor"][i:i + 2], 16) for i in range(1, 6, 2)] + [92])
+        palette.setColor(QPalette.PlaceholderText, color)
+        QGuiApplication.setPalette(palette)
+        self.active = entry["key"]
+
+    def apply(self, widget, darkMode, density=0):
+        """Method to apply a theme to a widget, skipping the repolish if it already has it."""
+        entry = self.themes.get((darkMode, density))
+        if entry == None:
+            entry = self.compile(darkMode, density)
+        self.activate(entry)
+        if widget.property("theme") != entry["key"]:
+            widget.setStyleSheet(entry["stylesheet"])
+            widget.setProperty("theme", entry["key"])
+
+themeManager = ThemeManager()
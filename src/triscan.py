@@ -0,0 +1,82 @@
+import serial
+import re
+import logging
+
+log = logging.getLogger(__name__)
+
+class TriScanError(Exception):
+    """Raised when a TriScan does not reply, or replies with an unexpected frame."""
+
+class TriScan:
+    """Driver for a VJTech TriScan press over a single persistent serial connection.
+
+    Commands are framed as I<address><command><CR> and replies as i<address><payload><CR>. Several
+    commands can be written at once and their replies read back in order, so a control tick
+    costs one round trip however many values are polled."""
+    terminator = b"\r"
+
+    def __init__(self, port, address=21, baudrate=57600, timeout=0.1):
+        self.port = port
+        self.address = int(address)
+        self.baudrate = baudrate
+        self.timeout = timeout
+        self.serial = None
+        self.prefix = ("i" + str(self.address)).encode("ascii")
+
+    def open(self):
+        """Method to open the serial port if it is not already open."""
+        if self.serial == None or self.serial.is_open == False:
+            self.serial = serial.Serial(
+                port=self.port,
+                baudrate=self.baudrate,
+                parity=serial.PARITY_NONE,
+                stopbits=serial.STOPBITS_ONE,
+                bytesize=serial.EIGHTBITS,
+                timeout=self.timeout,
+                write_timeout=self.timeout
+            )
+            self.serial.reset_input_buffer()
+            log.info("Opened TriScan serial port {port}.".format(port=self.port))
+
+    def close(self):
+        """Method to close the serial port."""
+        if self.serial != None and self.serial.is_open == True:
+            self.serial.close()
+            log.info("Closed TriScan serial port {port}.".format(port=self.port))
+        self.serial = None
+
+    def frame(self, command):
+        """Method to frame a command for this press address."""
+        return ("I" + str(self.address) + command).encode("ascii") + self.terminator
+
+    def query(self, *commands):
+        """Method to write all commands in a single write and return the payload of each reply in order."""
+        if len(commands) == 0:
+            return []
+        self.open()
+        self.serial.write(b"".join(self.frame(command) for command in commands))
+        replies = []
+        for command in commands:
+            reply = self.serial.read_until(self.terminator)
+            if not reply.endswith(self.terminator):
+                # Discard any partial frame so the next query starts in step.
+                self.serial.reset_input_buffer()
+                raise TriScanError("Timed out waiting for the reply to {command} from the TriScan on {port}.".format(command=command, port=self.port))
+            start = reply.find(self.prefix)
+            if start == -1:
+                self.serial.reset_input_buffer()
+                raise TriScanError("Unexpected reply {reply} to {command} from the TriScan on {port}.".format(reply=reply, command=command, port=self.port))
+            replies.append(reply[start+len(self.prefix):].strip().decode("ascii", errors="ignore"))
+        return replies
+
+    def identify(self):
+        """Method to check whether a TriScan is listening at this address."""
+        return self.query("TSF")[0].startswith("t")
+
+    @staticmethod
+    def number(payload):
+        """Method to parse the first number in a reply payload."""
+        match = re.search(r"[-+]?\d*\.?\d+(?:[eE][-+]?\d+)?", payload)
+        if match == None:
+            raise TriScanError("No value in TriScan reply {payload}.".format(payload=payload))
+        return float(match.group())
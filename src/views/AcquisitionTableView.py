@@ -1,5 +1,5 @@
 from PySide6.QtWidgets import QTableView, QHeaderView, QAbstractItemView
-from delegates import CheckBoxDelegate, FloatValidatorDelegate, StringDelegate
+from delegates import CheckBoxDelegate, FloatValidatorDelegate, IntegerValidatorDelegate, StringDelegate
 
 class AcquisitionTableView(QTableView):
 
@@ -19,10 +19,14 @@ class AcquisitionTableView(QTableView):
         self.stringDelegate = StringDelegate()
         self.floatValidatorDelegate = FloatValidatorDelegate()
         self.checkBoxDelegate = CheckBoxDelegate()
+        self.widthDelegate = IntegerValidatorDelegate(1, 32)
+        self.precisionDelegate = IntegerValidatorDelegate(0, 15)
 
         self.setItemDelegateForColumn(0, self.channelCheckBoxDelegate)
         self.setItemDelegateForColumn(1, self.stringDelegate)
         self.setItemDelegateForColumn(2, self.stringDelegate)
         self.setItemDelegateForColumn(3, self.floatValidatorDelegate)
         self.setItemDelegateForColumn(4, self.floatValidatorDelegate)
-        self.setItemDelegateForColumn(5, self.checkBoxDelegate)
\ No newline at end of file
+        self.setItemDelegateForColumn(5, self.checkBoxDelegate)
+        self.setItemDelegateForColumn(6, self.widthDelegate)
+        self.setItemDelegateForColumn(7, self.precisionDelegate)
\ No newline at end of file
@@ -29,7 +29,7 @@ class CameraSettings(QWidget):
         self.imageModeLabel = QLabel("Image Mode")
 
         self.imageModeComboBox = QComboBox()
-        self.imageModeComboBox.addItems(["RGB", "Mono"])
+        self.imageModeComboBox.addItems(["RGB", "Mono", "Raw"])
         self.imageModeComboBox.setFixedWidth(130)
         self.imageModeComboBox.setCurrentIndex(1)
 
@@ -10,18 +10,21 @@ log = logging.getLogger(__name__)
 class CameraTab(QWidget):
     previewWindowClosed = Signal(QWidget)
     getImage = Signal()
+    previewResized = Signal(int, int)
 
     def __init__(self, name):
         """CameraTab init."""
         super().__init__()
         self.setWhatsThis("camera")
         self.name = name
+        self.pixelDepth = 16
 
-        # Image item.
+        # Image item. The view is inverted in y rather than flipping each frame.
         self.preview = pg.GraphicsLayoutWidget()
         self.preview.setBackground(None)
         self.viewBox = self.preview.addViewBox()
         self.viewBox.setAspectLocked(True)
+        self.viewBox.invertY(True)
         self.imageItem = pg.ImageItem(axisOrder="row-major")
         self.viewBox.addItem(self.imageItem)
 
@@ -36,11 +39,21 @@ class CameraTab(QWidget):
     @Slot(np.ndarray)
     def set_image(self, image):
         """Set image in ImageItem."""
-        image = np.flipud(image)
-        self.imageItem.setImage(image=image)
+        # Integer frames are displayed over the range of the pixel bit depth, which avoids the autoLevels scan.
+        if image.dtype == np.uint8:
+            self.imageItem.setImage(image=image, autoLevels=False, levels=(0, 255))
+        elif image.dtype == np.uint16:
+            self.imageItem.setImage(image=image, autoLevels=False, levels=(0, 2**self.pixelDepth - 1))
+        else:
+            self.imageItem.setImage(image=image)
         self.preview.setBackground(None)
         self.getImage.emit()
 
+    @Slot(int)
+    def set_pixel_depth(self, bits):
+        """Method to set the number of significant bits in each pixel of 16 bit frames."""
+        self.pixelDepth = min(max(int(bits), 1), 16)
+
     def set_window(self):
         """Method to set widget as window."""
         x = int(self.cameraConfiguration["preview"]["x"])
@@ -67,6 +80,7 @@ class CameraTab(QWidget):
 
     def resizeEvent(self, event):
         """Override of Qt resizeEvent method."""
+        self.previewResized.emit(int(self.preview.width()), int(self.preview.height()))
         if self.cameraConfiguration["preview"]["mode"] == "window":
             self.cameraConfiguration["preview"]["width"] = int(self.width())
             self.cameraConfiguration["preview"]["height"] = int(self.height())
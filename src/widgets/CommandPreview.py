@@ -2,10 +2,12 @@ from PySide6.QtWidgets import QVBoxLayout, QGroupBox
 from PySide6.QtCore import Slot
 import numpy as np
 import local_pyqtgraph.pyqtgraph as pg
-from scipy import signal
+from lazy import lazy_import
 import re
 import os
 
+signal = lazy_import("scipy.signal")
+
 class CommandPreview(QGroupBox):
 
     def __init__(self, *args, **kwargs):
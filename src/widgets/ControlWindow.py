@@ -1,8 +1,7 @@
-import os
 from PySide6.QtWidgets import QWidget, QVBoxLayout, QTabWidget
 from local_qt_material import QtStyleTools
+from theme import themeManager
 import logging
-from pathlib import Path
 
 log = logging.getLogger(__name__)
 
@@ -44,17 +43,7 @@ class ControlWindow(QWidget, QtStyleTools):
 
     def set_dark_mode(self):
         """Method to set dark mode."""
-        if self.darkMode == True:
-            self.apply_stylesheet(self, theme='dark_blue.xml')
-        else:
-            self.apply_stylesheet(self, theme='light_blue.xml')
-        stylesheet = self.styleSheet()
-        
-        # Get css directory.
-        bundle_dir = Path(__file__).parents[1]
-        path_to_css = os.path.abspath(os.path.join(bundle_dir,"CamLab.css"))
-        with open(path_to_css) as file:
-            self.setStyleSheet(stylesheet + file.read().format(**os.environ))
+        themeManager.apply(self, self.darkMode)
 
     def resizeEvent(self, event):
         """Override of Qt resizeEvent method."""
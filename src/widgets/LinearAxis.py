@@ -30,6 +30,7 @@ class LinearAxis(QWidget):
     KPChanged = Signal(float)
     KIChanged = Signal(float)
     KDChanged = Signal(float)
+    rampRateChanged = Signal(float)
     proportionalOnMeasurementChanged = Signal(bool)
     positiveJogEnabled = Signal()
     negativeJogEnabled = Signal() 
@@ -53,6 +54,7 @@ class LinearAxis(QWidget):
         self.device = self.ID[0:3]
         self.channel = self.ID[-2:]
         self.control = int(self.ID[-1])-1
+        self.controlPanel = None
         self.setWhatsThis("control")
 
         # Variables.
@@ -108,6 +110,7 @@ class LinearAxis(QWidget):
         self.PID.KPLineEditChanged.connect(self.emitKPChanged)
         self.PID.KILineEditChanged.connect(self.emitKIChanged)
         self.PID.KDLineEditChanged.connect(self.emitKDChanged)
+        self.PID.rampRateLineEditChanged.connect(self.emitRampRateChanged)
         self.PID.proportionalOnMeasurement.stateChanged.connect(self.emitProportionalOnMeasurement)
 
         self.jog.speedLineEdit.returnPressed.connect(self.emitSecondarySetPointChanged)
@@ -322,6 +325,11 @@ class LinearAxis(QWidget):
     def emitKDChanged(self, value):
         self.KDChanged.emit(value)
         self.controlConfiguration["settings"]["KD"] = round(self.PID.getKD(), 2)
+
+    @Slot()
+    def emitRampRateChanged(self, value):
+        self.rampRateChanged.emit(value)
+        self.controlConfiguration["settings"]["rampRate"] = round(self.PID.getRampRate(), 2)
         
     @Slot()
     def emitPrimaryLeftLimitChanged(self, value):
@@ -440,6 +448,23 @@ class LinearAxis(QWidget):
         # Update the configuration.
         self.controlConfiguration["settings"]["feedbackProcessVariable"] = round(self.feedbackDemand.get_process_variable(), 2)
 
+    def setControlPanel(self, snapshot):
+        """Method to apply a control panel snapshot for this channel in one batch."""
+        # Skip the widget updates if nothing has changed since the last snapshot.
+        if self.controlPanel is not None and self.controlPanel == snapshot:
+            return
+        self.controlPanel = snapshot.copy()
+        if snapshot["jog"] == True:
+            self.setPositionSetPoint(float(snapshot["positionProcessVariable"]))
+        self.setPositionProcessVariable(float(snapshot["positionProcessVariable"]))
+        if snapshot["feedback"] == True:
+            self.setFeedbackProcessVariable(float(snapshot["feedbackProcessVariable"]))
+            if snapshot["PID"] == True:
+                self.jog.setSpeed(float(snapshot["speed"]))
+                self.setPositionSetPoint(float(snapshot["positionProcessVariable"]))
+            else:
+                self.setFeedbackSetPoint(float(snapshot["feedbackProcessVariable"]))
+
     @Slot()
     def setPIDControlButtonEnable(self, value):
         self.globalControls.PIDControlButton.setEnabled(value)
@@ -496,6 +521,8 @@ class LinearAxis(QWidget):
                 self.PID.setKI(settings["KI"])
             elif setting == "KD":
                 self.PID.setKD(settings["KD"])
+            elif setting == "rampRate":
+                self.PID.setRampRate(settings["rampRate"])
             elif setting == "proportionalOnMeasurement":
                 self.PID.setProportionalOnMeasurement(settings["proportionalOnMeasurement"])
             elif setting == "enablePIDControl":
@@ -533,6 +560,7 @@ class LinearAxis(QWidget):
         self.PID.setKP(self.controlConfiguration["settings"]["KP"])
         self.PID.setKI(self.controlConfiguration["settings"]["KI"])
         self.PID.setKD(self.controlConfiguration["settings"]["KD"])
+        self.PID.setRampRate(self.controlConfiguration["settings"].get("rampRate", 0.00))
         self.PID.setProportionalOnMeasurement(self.controlConfiguration["settings"]["proportionalOnMeasurement"])
         self.settings.setMaxRPM(self.controlConfiguration["settings"]["maxRPM"])
         self.settings.setCPR(self.controlConfiguration["settings"]["CPR"])
@@ -18,6 +18,17 @@ class ConfigurationUtilities:
             self.add_camera_configuration_tab(name)
         elif deviceType == "Press":
             self.add_press_configuration_tab(name)
+        elif deviceType == "Replay":
+            self.add_replay_preview_tab(name)
+
+    def add_replay_preview_tab(self, name):
+        # Add a preview of the images saved with the recording, if a recorded camera was selected.
+        if self.manager.configuration["devices"][name]["replay"]["camera"] == "N/A":
+            return
+        self.add_camera_tab(name)
+        self.manager.devices[name].previewImage.connect(self.previews[name].set_image)
+
+        log.info("Replay preview tab added for {device}.".format(device=name))
 
     def add_press_configuration_tab(self, name):
         # Instantiate widget.
@@ -36,16 +47,12 @@ class ConfigurationUtilities:
                 self.configurationTab.deviceConfigurationGroupBox.deviceConfigurationTabWidget.setTabVisible(index, False)
         
         # Connections.
-        self.manager.deviceTableModel.deviceConnectStatusUpdated.connect(self.toggle_press_control_tab)
         self.manager.deviceTableModel.deviceConnectStatusUpdated.connect(self.update_press_feedback_device_ComboBox)
 
-        # Initialise settings.
+        # Initialise settings. The press is only polled, so it has no control tab.
         self.deviceConfigurationWidget[name].set_configuration(self.manager.configuration)
         sleep(1.0)
 
-        # Add the control tab.
-        self.add_control_tab(name, 0)
-
         log.info("Device configuration tab added for {device}.".format(device=name))
 
     @Slot()
@@ -89,6 +96,7 @@ class ConfigurationUtilities:
 
         # Connections.
         self.previews[name].getImage.connect(self.manager.devices[name].capture_image)
+        self.previews[name].previewResized.connect(self.manager.devices[name].set_preview_size)
 
         self.deviceConfigurationWidget[name].setImageMode.connect(self.manager.devices[name].set_image_mode)
         self.deviceConfigurationWidget[name].setAutoWhiteBalanceMode.connect(self.manager.devices[name].set_auto_white_balance_mode)
@@ -104,6 +112,7 @@ class ConfigurationUtilities:
         self.deviceConfigurationWidget[name].calibrateButton.clicked.connect(self.manager.devices[name].calibrate)
 
         self.manager.devices[name].previewImage.connect(self.previews[name].set_image)
+        self.manager.devices[name].updatePixelDepth.connect(self.previews[name].set_pixel_depth)
 
         # self.manager.devices[name].updateImageMode.connect(self.deviceConfigurationWidget[name].update_image_mode)
         self.manager.devices[name].updateExposureTime.connect(self.deviceConfigurationWidget[name].update_exposure_time)
@@ -1,8 +1,9 @@
 from PySide6.QtWidgets import QWidget
-from PySide6.QtCore import Slot
+from PySide6.QtCore import Slot, Qt
 from widgets.LinearAxis import LinearAxis
 from widgets.PlotWindow import PlotWindow
 import copy
+import numpy as np
 import logging
 
 log = logging.getLogger(__name__)
@@ -32,15 +33,18 @@ class ControlUtilities:
             self.checkTimer.timeout.connect(self.manager.devices[name].check_connections)
             self.running.connect(self.manager.devices[name].set_running)
             self.manager.devices[name].updateRunningIndicator.connect(controlWidget.setRunningIndicator)
-            if name != "VJT":
-                self.manager.controlTableModels[name].controlChannelNameChanged.connect(controlWidget.setTitle)
+            self.manager.controlTableModels[name].controlChannelNameChanged.connect(controlWidget.setTitle)
             self.statusTab.runSequence.clicked.connect(self.manager.devices[name].run_sequence)
+            # One control panel snapshot per device per UI frame, shared by both channels.
+            self.updateTimer.timeout.connect(self.manager.devices[name].publishControlPanel, Qt.UniqueConnection)
+            self.manager.devices[name].updateControlPanel.connect(self.update_control_panel, Qt.UniqueConnection)
             if channel == 0:
                 controlWidget.enable.connect(self.manager.devices[name].set_enable_C1)
                 controlWidget.PIDControl.connect(self.manager.devices[name].set_PID_control_C1)
                 controlWidget.KPChanged.connect(self.manager.devices[name].set_KP_C1)
                 controlWidget.KIChanged.connect(self.manager.devices[name].set_KI_C1)
                 controlWidget.KDChanged.connect(self.manager.devices[name].set_KD_C1)
+                controlWidget.rampRateChanged.connect(self.manager.devices[name].set_ramp_rate_C1)
                 controlWidget.proportionalOnMeasurementChanged.connect(self.manager.devices[name].set_pom_C1)
                 controlWidget.secondarySetPointChanged.connect(self.manager.devices[name].set_speed_C1)
                 controlWidget.positiveJogEnabled.connect(self.manager.devices[name].jog_positive_on_C1)
@@ -55,20 +59,18 @@ class ControlUtilities:
                 controlWidget.primaryRightLimitChanged.connect(self.manager.devices[name].update_position_right_limit_C1)
                 controlWidget.feedbackLeftLimitChanged.connect(self.manager.devices[name].update_feedback_left_limit_C1)
                 controlWidget.feedbackRightLimitChanged.connect(self.manager.devices[name].update_feedback_right_limit_C1)
-                self.updateTimer.timeout.connect(self.manager.devices[name].updateControlPanelC1)
                 self.manager.devices[name].updateLimitIndicatorC1.connect(controlWidget.setLimitIndicator)
                 self.manager.devices[name].updateConnectionIndicatorC1.connect(controlWidget.setConnectedIndicator)
-                self.manager.devices[name].updateSpeedC1.connect(controlWidget.jog.setSpeed)
                 self.manager.devices[name].updatePositionSetPointC1.connect(controlWidget.setPositionSetPoint)
                 self.manager.devices[name].updateFeedbackSetPointC1.connect(controlWidget.setFeedbackSetPoint)
                 self.manager.devices[name].updatePositionProcessVariableC1.connect(controlWidget.setPositionProcessVariable)
-                self.manager.devices[name].updateFeedbackProcessVariableC1.connect(controlWidget.setFeedbackProcessVariable)
             elif channel == 1:
                 controlWidget.enable.connect(self.manager.devices[name].set_enable_C2)
                 controlWidget.PIDControl.connect(self.manager.devices[name].set_PID_control_C2)
                 controlWidget.KPChanged.connect(self.manager.devices[name].set_KP_C2)
                 controlWidget.KIChanged.connect(self.manager.devices[name].set_KI_C2)
                 controlWidget.KDChanged.connect(self.manager.devices[name].set_KD_C2)
+                controlWidget.rampRateChanged.connect(self.manager.devices[name].set_ramp_rate_C2)
                 controlWidget.proportionalOnMeasurementChanged.connect(self.manager.devices[name].set_pom_C2)
                 controlWidget.secondarySetPointChanged.connect(self.manager.devices[name].set_speed_C2)
                 controlWidget.positiveJogEnabled.connect(self.manager.devices[name].jog_positive_on_C2)
@@ -83,14 +85,11 @@ class ControlUtilities:
                 controlWidget.primaryRightLimitChanged.connect(self.manager.devices[name].update_position_right_limit_C2)
                 controlWidget.feedbackLeftLimitChanged.connect(self.manager.devices[name].update_feedback_left_limit_C2)
                 controlWidget.feedbackRightLimitChanged.connect(self.manager.devices[name].update_feedback_right_limit_C2)
-                self.updateTimer.timeout.connect(self.manager.devices[name].updateControlPanelC2)
                 self.manager.devices[name].updateLimitIndicatorC2.connect(controlWidget.setLimitIndicator)
                 self.manager.devices[name].updateConnectionIndicatorC2.connect(controlWidget.setConnectedIndicator)
-                self.manager.devices[name].updateSpeedC2.connect(controlWidget.jog.setSpeed)
                 self.manager.devices[name].updatePositionSetPointC2.connect(controlWidget.setPositionSetPoint)
                 self.manager.devices[name].updateFeedbackSetPointC2.connect(controlWidget.setFeedbackSetPoint)
                 self.manager.devices[name].updatePositionProcessVariableC2.connect(controlWidget.setPositionProcessVariable)
-                self.manager.devices[name].updateFeedbackProcessVariableC2.connect(controlWidget.setFeedbackProcessVariable)
 
             # Set the configuration and initial position.
             controlWidget.set_configuration(configuration=self.manager.configuration)
@@ -132,12 +131,13 @@ class ControlUtilities:
 
         log.info("Device control tab added for {id}.".format(id=controlID))
 
-    @Slot(str, bool)
-    def toggle_press_control_tab(self, name, state):
-        if name == "VJT":
-            controlID = name + " C1"
-            index = self.tabs.indexOf(self.controls[controlID])
-            self.tabs.setTabVisible(index, state)
+    @Slot(str, np.ndarray)
+    def update_control_panel(self, name, snapshot):
+        """Apply a device control panel snapshot to its control widgets."""
+        for channel in range(2):
+            controlID = name + " C" + str(channel+1)
+            if controlID in self.controls and hasattr(self.controls[controlID], "setControlPanel"):
+                self.controls[controlID].setControlPanel(snapshot[channel])
 
     @Slot(str, int, str)
     def change_control_feedback_channel(self, device, channel, selectedFeedbackChannel):
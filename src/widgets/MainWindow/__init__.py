@@ -1,5 +1,4 @@
-import os, sys
-from PySide6.QtWidgets import QMainWindow, QApplication, QWidget, QVBoxLayout, QGridLayout, QDialog
+from PySide6.QtWidgets import QMainWindow, QApplication, QWidget, QVBoxLayout, QGridLayout, QDialog, QMessageBox
 from PySide6.QtGui import QScreen
 from PySide6.QtCore import Signal, Slot, QThread, QTimer
 from local_qt_material import QtStyleTools
@@ -9,6 +8,7 @@ from widgets.MainWindow._ControlUtilities import ControlUtilities
 from widgets.MainWindow._ConfigurationUtilities import ConfigurationUtilities
 from widgets.MainWindow._CameraUtilities import CameraUtilities
 from manager import Manager
+from theme import themeManager
 from widgets.ToolBar import ToolBar
 from widgets.TabInterface import TabInterface
 from widgets.ConfigurationTab import ConfigurationTab
@@ -18,7 +18,6 @@ from widgets.StatusGroupBox import StatusGroupBox
 from dialogs import BusyDialog
 import logging
 from time import sleep
-from pathlib import Path
 
 log = logging.getLogger(__name__)
 
@@ -112,6 +111,8 @@ class MainWindow(TabUtilities, PlotUtilities, ControlUtilities, ConfigurationUti
         self.toolbar.loadConfiguration.connect(self.manager.loadConfiguration)
         self.toolbar.saveConfiguration.connect(self.manager.saveConfiguration)
         self.toolbar.clearConfigButton.triggered.connect(self.manager.clearConfiguration)
+        self.toolbar.openReplay.connect(self.manager.addReplayDevice)
+        self.toolbar.resumeButton.triggered.connect(self.resume_acquisition)
         self.toolbar.newFileButton.triggered.connect(self.manager.assembly.new_file)
         self.toolbar.autozeroButton.triggered.connect(self.manager.assembly.autozero)
         self.toolbar.clearPlotsButton.triggered.connect(self.manager.assembly.clear_plot_data)
@@ -131,6 +132,8 @@ class MainWindow(TabUtilities, PlotUtilities, ControlUtilities, ConfigurationUti
 
         # Manager connections.
         self.manager.configurationChanged.connect(self.set_configuration)
+        self.manager.notifier.subscribe("global/darkMode", self.dark_mode_changed)
+        self.manager.notifier.subscribe("devices", self.device_configuration_changed)
         self.manager.clear_device_configuration_tabs.connect(self.clear_device_configuration_tabs)
         self.manager.close_plots.connect(self.close_plots)
         self.manager.clear_tabs.connect(self.clear_tabs)
@@ -141,6 +144,7 @@ class MainWindow(TabUtilities, PlotUtilities, ControlUtilities, ConfigurationUti
         self.manager.deviceTableModel.numberDevicesEnabled.connect(self.update_mode_enable)
 
         self.manager.timing.actualRate.connect(self.statusGroupBox.update)
+        self.manager.bufferLevelChanged.connect(self.statusGroupBox.updateBuffer)
         self.manager.plotWindowChannelsUpdated.connect(self.update_plots)
         self.manager.existingPlotsFound.connect(self.create_existing_plots)
         self.manager.outputText.connect(self.statusGroupBox.setOutputText)
@@ -165,6 +169,22 @@ class MainWindow(TabUtilities, PlotUtilities, ControlUtilities, ConfigurationUti
         elif number == 0:
             self.toolbar.disableModeButton()
 
+    @Slot()
+    def resume_acquisition(self):
+        """Method to offer the unfinished recording found for the output filename and run, continuing it, if the user accepts."""
+        journal = self.manager.findUnfinishedSession()
+        if journal == None:
+            QMessageBox.information(self, "Resume recording", "No unfinished recording was found for the output filename.")
+            return
+        if self.toolbar.modeButton.isEnabled() == False:
+            QMessageBox.information(self, "Resume recording", "Enable the devices of the recording before resuming it.")
+            return
+        opened = journal.get("segmentOpened", "").replace("T", " ")
+        answer = QMessageBox.question(self, "Resume recording", "Continue the unfinished recording {path}, opened {opened}?\n\nThe time elapsed since it stopped will be added to its time base.".format(path=journal["segmentPath"], opened=opened))
+        if answer == QMessageBox.Yes:
+            self.manager.setResumeSession(journal)
+            self.toolbar.changeMode()
+
     @Slot()
     def refresh_devices(self):
         """Method to refresh device list."""
@@ -210,31 +230,34 @@ class MainWindow(TabUtilities, PlotUtilities, ControlUtilities, ConfigurationUti
     @Slot()
     def update_dark_mode(self):
         """Method to update the darkMode state."""
-        # Toggle darkMode boolean in the configuration.
-        self.manager.configuration["global"]["darkMode"] = not self.darkMode
+        # Toggle darkMode boolean in the configuration, which notifies subscribers to update the UI.
+        self.manager.notifier.set("global/darkMode", not self.darkMode)
+        log.info("Dark mode changed.")
 
-        # Update the local darkMode variable.
+    def dark_mode_changed(self, paths):
+        """Method to update the theme, icons and plots after the darkMode setting changes."""
         self.darkMode = self.manager.configuration["global"]["darkMode"]
+        self.set_theme()
+        self.toolbar.updateIcons(self.darkMode)
+        if self.plots and "plots" in self.manager.configuration: 
+            self.update_plots()
 
-        # Update the UI
-        self.set_configuration(self.manager.configuration)
-        log.info("Dark mode changed.")
+    def device_configuration_changed(self, paths):
+        """Method to refresh only the acquisition tables of devices whose acquisition settings changed, or that were added or replaced as a whole."""
+        names = []
+        for path in paths:
+            keys = path.split("/")
+            if len(keys) == 2 or (len(keys) > 2 and keys[2] == "acquisition"):
+                if keys[1] not in names:
+                    names.append(keys[1])
+        for name in names:
+            if name in self.manager.acquisitionTableModels:
+                self.manager.acquisitionTableModels[name].refresh()
 
     def set_theme(self):
-        """Method to set the theme and apply the qt-material stylesheet."""
+        """Method to set the theme and apply the cached qt-material stylesheet."""
         self.darkMode = self.configuration["global"]["darkMode"]
-        # Set the darkmode. 
-        if self.darkMode == True:
-            self.apply_stylesheet(self, theme='dark_blue.xml')
-        else:
-            self.apply_stylesheet(self, theme='light_blue.xml')
-        stylesheet = self.styleSheet()
-        
-        # Get css directory.
-        bundle_dir = Path(__file__).parents[2]
-        path_to_css = os.path.abspath(os.path.join(bundle_dir,"CamLab.css"))
-        with open(path_to_css) as file:
-            self.setStyleSheet(stylesheet + file.read().format(**os.environ))
+        themeManager.apply(self, self.darkMode)
 
     @Slot(dict)
     def set_configuration(self, newConfiguration):
@@ -6,6 +6,7 @@ class PIDGroupBox(QGroupBox):
     KPLineEditChanged = Signal(float)
     KILineEditChanged = Signal(float)
     KDLineEditChanged = Signal(float)
+    rampRateLineEditChanged = Signal(float)
     
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -14,6 +15,7 @@ class PIDGroupBox(QGroupBox):
         self.KP = 1.00
         self.KI = 1.00
         self.KD = 1.00
+        self.rampRate = 0.00
 
         # Validator.
         self.doubleValidator = QDoubleValidator(decimals=2)
@@ -34,6 +36,12 @@ class PIDGroupBox(QGroupBox):
         self.KDLineEdit.setValidator(self.doubleValidator)
         self.KDLineEdit.setText("1.00")
         self.KDLineEdit.setFixedWidth(80)
+        self.rampRateLabel = QLabel("Ramp (/s)")
+        self.rampRateLineEdit = QLineEdit()
+        self.rampRateLineEdit.setValidator(self.doubleValidator)
+        self.rampRateLineEdit.setText("0.00")
+        self.rampRateLineEdit.setFixedWidth(80)
+        self.rampRateLineEdit.setToolTip("Maximum feedback setpoint rate of change, 0 for no ramp.")
         self.optionsLabel = QLabel("Options")
         self.proportionalOnMeasurement = QCheckBox("Proportional on measurement")
 
@@ -45,18 +53,21 @@ class PIDGroupBox(QGroupBox):
         self.Layout.addWidget(self.KPLineEdit, 1, 0)
         self.Layout.addWidget(self.KILineEdit, 1, 1)
         self.Layout.addWidget(self.KDLineEdit, 1, 2)
-        self.Layout.addWidget(self.optionsLabel, 2, 0)
-        self.Layout.addWidget(self.proportionalOnMeasurement, 3, 0, 1, 3)
+        self.Layout.addWidget(self.rampRateLabel, 2, 0)
+        self.Layout.addWidget(self.rampRateLineEdit, 3, 0)
+        self.Layout.addWidget(self.optionsLabel, 4, 0)
+        self.Layout.addWidget(self.proportionalOnMeasurement, 5, 0, 1, 3)
         self.setLayout(self.Layout) 
         
         # Geometry.
-        self.setFixedHeight(200)
+        self.setFixedHeight(260)
         self.setFixedWidth(310)
 
         # Connections.
         self.KPLineEdit.returnPressed.connect(self.setKP)
         self.KILineEdit.returnPressed.connect(self.setKI)
         self.KDLineEdit.returnPressed.connect(self.setKD)
+        self.rampRateLineEdit.returnPressed.connect(self.setRampRate)
 
     def setKP(self, value=None):
         if value == None:
@@ -88,6 +99,16 @@ class PIDGroupBox(QGroupBox):
     def getKD(self):
         return self.KD
 
+    def setRampRate(self, value=None):
+        if value == None:
+            value = float(self.rampRateLineEdit.text())
+        self.rampRate = value
+        self.rampRateLineEdit.setText("{value:.2f}".format(value=value))
+        self.rampRateLineEditChanged.emit(value)
+
+    def getRampRate(self):
+        return self.rampRate
+
     def setProportionalOnMeasurement(self, value):
         self.proportionalOnMeasurement.setChecked(value)
 
@@ -6,10 +6,10 @@ from local_qt_material import QtStyleTools
 from models import ChannelsTableModel
 from views import ChannelsTableView
 from dialogs import ColourPickerDialog
+from theme import themeManager
 import logging
 import local_pyqtgraph.pyqtgraph as pg
 import numpy as np
-from pathlib import Path
 
 log = logging.getLogger(__name__)
 
@@ -296,7 +296,8 @@ class PlotWindow(QWidget, QtStyleTools):
             self.swapCheckBox.setChecked(bool(self.configuration["plots"][self.plotNumber]["swap"]))
             self.setChannelsModel(self.configuration["plots"][self.plotNumber]["channels"])
             self.numChannels = len(self.channelsModel._data)
-            self.plotData = np.zeros((1, self.numChannels))        
+            self.plotData = np.zeros((1, self.numChannels))
+            self.finite = np.ones(self.numChannels, dtype=bool)
             self.setLock()
             self.setAutoMode()
             self.setManualCommonAxisMode()
@@ -667,12 +668,20 @@ class PlotWindow(QWidget, QtStyleTools):
         for i in range(self.numChannels):
             self.lines.append(self.plot.plot())
 
-    @Slot(np.ndarray)
-    def update_output_data(self, plotData):
-        # Update plotData and save as attribute.
+    @Slot(np.ndarray, np.ndarray)
+    def update_output_data(self, plotData, finite):
+        # Update plotData and the per-channel finiteness flags and save as attributes.
         self.plotData = plotData
+        self.finite = finite
         self.updatePlot()
 
+    def getConnect(self, i, log):
+        # Channels known to be finite can skip the finite check and connect all points, unless a log axis can map values to NaN.
+        if log == False and np.shape(self.finite)[0] == np.shape(self.plotData)[1]:
+            if self.finite[i] == True and self.finite[self.commonChannel] == True:
+                return "all", True
+        return "finite", False
+
     def setCommonChannel(self, index):
         # Set common channel.
         self.commonChannel = index
@@ -703,8 +712,9 @@ class PlotWindow(QWidget, QtStyleTools):
             if self.channelsModel._data[i]["plot"] == False:
                 self.lines[i].setData([],[])
             elif swap == False:
+                connect, skipFiniteCheck = self.getConnect(i, logCommonAxis or logSelectedAxis)
                 self.lines[i].setAlpha(alphaValue/100, False)
-                self.lines[i].setData(self.plotData[:,self.commonChannel], self.plotData[:,i], pen=pen, connect="finite")
+                self.lines[i].setData(self.plotData[:,self.commonChannel], self.plotData[:,i], pen=pen, connect=connect, skipFiniteCheck=skipFiniteCheck)
                 if logCommonAxis == True:
                     self.plot.setLogMode(x=True)
                 elif logCommonAxis == False:
@@ -714,8 +724,9 @@ class PlotWindow(QWidget, QtStyleTools):
                 elif logSelectedAxis == False:
                     self.plot.setLogMode(y=False)
             elif swap == True:
+                connect, skipFiniteCheck = self.getConnect(i, logCommonAxis or logSelectedAxis)
                 self.lines[i].setAlpha(alphaValue/100, False)
-                self.lines[i].setData(self.plotData[:,i], self.plotData[:,self.commonChannel], pen=pen, connect="finite")
+                self.lines[i].setData(self.plotData[:,i], self.plotData[:,self.commonChannel], pen=pen, connect=connect, skipFiniteCheck=skipFiniteCheck)
                 if logCommonAxis == True:
                     self.plot.setLogMode(y=True)
                 elif logCommonAxis == False:
@@ -794,17 +805,7 @@ class PlotWindow(QWidget, QtStyleTools):
 
     def setDarkMode(self):
         # Set dark mode.
-        if self.darkMode == True:
-            self.apply_stylesheet(self, theme='dark_blue.xml')
-        else:
-            self.apply_stylesheet(self, theme='light_blue.xml')
-        stylesheet = self.styleSheet()
-        
-        # Get css directory.
-        bundle_dir = Path(__file__).parents[1]
-        path_to_css = os.path.abspath(os.path.join(bundle_dir,"CamLab.css"))
-        with open(path_to_css) as file:
-            self.setStyleSheet(stylesheet + file.read().format(**os.environ))
+        themeManager.apply(self, self.darkMode)
 
         self.plot.setBackground(os.environ['QTMATERIAL_SECONDARYLIGHTCOLOR'])
         self.plot.getAxis('left').setTextPen(os.environ['QTMATERIAL_SECONDARYTEXTCOLOR'])
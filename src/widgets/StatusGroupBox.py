@@ -13,6 +13,7 @@ class StatusGroupBox(QGroupBox):
         self.setTitle("Status")
         self.setVisible(False)
         self.count = 0
+        self.bufferLevels = {}
 
         # Acquire initial time and calculate a nullref.
         self.setInitialTimeDate()
@@ -57,6 +58,13 @@ class StatusGroupBox(QGroupBox):
         self.rate.setFont(QFont("Arial", 25))
         self.rate.setText("-")
 
+        self.bufferLabel = QLabel()
+        self.bufferLabel.setText("Device buffer (%):")
+
+        self.buffer = QLabel()
+        self.buffer.setFont(QFont("Arial", 15))
+        self.buffer.setText("-")
+
         # Assemble layout.
         self.layout.addWidget(self.dateLabel, 0, 0)
         self.layout.addWidget(self.timeLabel, 0, 1)
@@ -68,6 +76,8 @@ class StatusGroupBox(QGroupBox):
         self.layout.addWidget(self.elapsed, 1, 2)
         self.layout.addWidget(self.rateLabel, 0, 3)
         self.layout.addWidget(self.rate, 1, 3)
+        self.layout.addWidget(self.bufferLabel, 2, 3)
+        self.layout.addWidget(self.buffer, 3, 3)
         self.setLayout(self.layout)
 
         # # Set output text.
@@ -123,6 +133,19 @@ class StatusGroupBox(QGroupBox):
         # Reset rate text.
         self.rate.setText("-")
 
+    @Slot(str, float)
+    def updateBuffer(self, name, level):
+        # Show the fullest device stream buffer.
+        if level > 0:
+            self.bufferLevels[name] = level
+        else:
+            self.bufferLevels.pop(name, None)
+        if len(self.bufferLevels) > 0:
+            name = max(self.bufferLevels, key=self.bufferLevels.get)
+            self.buffer.setText("{level:.0f} [{name}]".format(level=self.bufferLevels[name], name=name))
+        else:
+            self.buffer.setText("-")
+
     @Slot()
     def setInitialTimeDate(self):
         # Method to set initial time and date.
@@ -10,6 +10,7 @@ class ToolBar(QToolBar):
     run = Signal() 
     loadConfiguration = Signal(str)
     saveConfiguration = Signal(str)
+    openReplay = Signal(str)
     
     def __init__(self):
         super().__init__()
@@ -60,6 +61,18 @@ class ToolBar(QToolBar):
         self.clearConfigButton.setVisible(True)
         self.addAction(self.clearConfigButton)
 
+        # Open replay QAction.
+        self.replayButton = QAction()
+        self.replayButton.setToolTip("Click to replay a recorded data file.")
+        self.replayButton.setVisible(True)
+        self.addAction(self.replayButton)
+
+        # Resume recording QAction.
+        self.resumeButton = QAction()
+        self.resumeButton.setToolTip("Click to run, continuing an unfinished recording.")
+        self.resumeButton.setVisible(True)
+        self.addAction(self.resumeButton)
+
         # New file QAction.
         self.newFileButton = QAction()
         self.newFileButton.setToolTip("Click to start a new output file.")
@@ -92,6 +105,7 @@ class ToolBar(QToolBar):
         self.modeButton.triggered.connect(self.changeMode)
         self.loadConfigButton.triggered.connect(self.emitLoadConfiguration)
         self.saveConfigButton.triggered.connect(self.emitSaveConfiguration)
+        self.replayButton.triggered.connect(self.emitOpenReplay)
 
     @Slot()
     def enableModeButton(self):
@@ -113,6 +127,8 @@ class ToolBar(QToolBar):
         self.loadConfigButton.setVisible(not self.loadConfigButton.isVisible())
         self.saveConfigButton.setVisible(not self.saveConfigButton.isVisible())
         self.clearConfigButton.setVisible(not self.clearConfigButton.isVisible())
+        self.replayButton.setVisible(not self.replayButton.isVisible())
+        self.resumeButton.setVisible(not self.resumeButton.isVisible())
         self.newFileButton.setVisible(not self.newFileButton.isVisible())
         self.autozeroButton.setVisible(not self.autozeroButton.isVisible())
         self.clearPlotsButton.setVisible(not self.clearPlotsButton.isVisible())
@@ -132,6 +148,8 @@ class ToolBar(QToolBar):
         self.loadConfigButton.setIcon(QIcon("icon:/secondaryText/file_upload.svg"))
         self.saveConfigButton.setIcon(QIcon("icon:/secondaryText/file_download.svg"))
         self.clearConfigButton.setIcon(QIcon("icon:/secondaryText/clear.svg"))
+        self.replayButton.setIcon(QIcon("icon:/secondaryText/file_open.svg"))
+        self.resumeButton.setIcon(QIcon("icon:/secondaryText/read_more.svg"))
         self.newFileButton.setIcon(QIcon("icon:/secondaryText/restore_page.svg"))
         self.autozeroButton.setIcon(QIcon("icon:/secondaryText/exposure_zero.svg"))
         self.clearPlotsButton.setIcon(QIcon("icon:/secondaryText/clear_all.svg"))
@@ -148,6 +166,11 @@ class ToolBar(QToolBar):
         filename, _ = QFileDialog.getSaveFileName(self,"Save CamLab configuration file", "","Yaml files (*.yaml)")
         self.saveConfiguration.emit(filename)
 
+    def emitOpenReplay(self):
+        # Method to select a recorded data file to replay and emit it as a signal.
+        filename, _ = QFileDialog.getOpenFileName(self,"Open CamLab data file to replay", "","CamLab data files (*.txt *.gz *.zst)")
+        self.openReplay.emit(filename)
+
     def emitDarkModeChanged(self):
         # Method to emit a signal indicating that the dark mode boolean has been toggled.
         self.darkModeChanged.emit(not self.darkMode)
\ No newline at end of file